@@ -1,10 +1,18 @@
 import random
 import math
+import bisect
+import mmap
+import struct
+import time
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait
 import tkinter as tk
 from tkinter import messagebox
 from copy import deepcopy
-from typing import List, Tuple
+from typing import List, Tuple, Optional, Union
 import argparse
+import json
 
 # Definición de constantes para representar los elementos del juego
 BLANCO = 0               # Casilla vacía
@@ -25,29 +33,336 @@ MOVE_DOWN = 'down'
 MOVE_LEFT = 'left'
 MOVE_RIGHT = 'right'
 
+# Desplazamiento (fila, columna) asociado a cada movimiento del agente
+DELTAS_MOVIMIENTO = {
+    MOVE_UP: (-1, 0),
+    MOVE_DOWN: (1, 0),
+    MOVE_LEFT: (0, -1),
+    MOVE_RIGHT: (0, 1),
+}
+
+# Un movimiento es una dirección del agente (Max) o una tupla (hoyo_index, new_row, new_col) de los hoyos (Min)
+Movimiento = Union[str, Tuple[int, int, int]]
+
+NUM_TIPOS_CASILLA = 11   # Cantidad de códigos de casilla (BLANCO ... BRISA_HEDOR_ORO)
+SEMILLA_ZOBRIST = 20241  # Semilla fija: las claves son iguales en todos los procesos y ejecuciones
+
+
+class ClavesZobrist:
+    """
+    Claves aleatorias de 64 bits para el hashing Zobrist de un tablero de un tamaño dado.
+    Se comparten entre todos los tableros del mismo tamaño (deepcopy no las duplica).
+    """
+
+    def __init__(self, tamano: int):
+        generador = random.Random(SEMILLA_ZOBRIST * 1000 + tamano)
+        # casillas[row][col][tile]: clave del código de casilla 'tile' en (row, col)
+        self.casillas = [[[generador.getrandbits(64) for _ in range(NUM_TIPOS_CASILLA)]
+                          for _ in range(tamano)] for _ in range(tamano)]
+        # casillas_planas[fila * tamano + columna][tile]: las mismas claves indexadas por casilla plana
+        self.casillas_planas = [claves for fila in self.casillas for claves in fila]
+        # previa[row][col]: clave de la posición anterior del agente (restringe sus movimientos)
+        self.previa = [[generador.getrandbits(64) for _ in range(tamano)] for _ in range(tamano)]
+        # Clave que se combina cuando mueven los hoyos (Min)
+        self.turno_min = generador.getrandbits(64)
+
+    def __deepcopy__(self, memo) -> 'ClavesZobrist':
+        return self
+
+    def __reduce__(self):
+        # Al enviar un tablero a otro proceso se regeneran las claves en lugar de copiarlas
+        return (obtener_claves_zobrist, (len(self.casillas),))
+
+
+_CLAVES_ZOBRIST = {}
+
+
+def obtener_claves_zobrist(tamano: int) -> ClavesZobrist:
+    """
+    Devuelve las claves Zobrist compartidas para un tamaño de tablero.
+    """
+    if tamano not in _CLAVES_ZOBRIST:
+        _CLAVES_ZOBRIST[tamano] = ClavesZobrist(tamano)
+    return _CLAVES_ZOBRIST[tamano]
+
+
+class GeometriaTablero:
+    """
+    Vecindades precalculadas de un tablero de un tamaño dado, compartidas por todos los tableros
+    de ese tamaño. Las casillas se identifican por su índice plano fila * tamano + columna.
+    - coordenadas[indice]: (fila, columna) de la casilla.
+    - vecinos[indice]: índices de los vecinos ortogonales (arriba, abajo, izquierda, derecha).
+    - vecinos_coordenadas[indice]: los mismos vecinos como (fila, columna), en el mismo orden.
+    - vecinos8[indice]: índices de los vecinos incluyendo las diagonales.
+    """
+
+    def __init__(self, tamano: int):
+        self.tamano = tamano
+        self.coordenadas = tuple(divmod(indice, tamano) for indice in range(tamano * tamano))
+        self.vecinos_coordenadas = tuple(
+            tuple((x, y) for x, y in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1))
+                  if 0 <= x < tamano and 0 <= y < tamano)
+            for i, j in self.coordenadas)
+        self.vecinos = tuple(tuple(x * tamano + y for x, y in vecinos) for vecinos in self.vecinos_coordenadas)
+        self.vecinos8 = tuple(
+            tuple((i + di) * tamano + (j + dj) for di in (-1, 0, 1) for dj in (-1, 0, 1)
+                  if (di or dj) and 0 <= i + di < tamano and 0 <= j + dj < tamano)
+            for i, j in self.coordenadas)
+
+    def __deepcopy__(self, memo) -> 'GeometriaTablero':
+        return self
+
+    def __reduce__(self):
+        return (obtener_geometria, (self.tamano,))
+
+
+_GEOMETRIAS = {}
+
+
+def obtener_geometria(tamano: int) -> GeometriaTablero:
+    """
+    Devuelve la geometría compartida para un tamaño de tablero.
+    """
+    if tamano not in _GEOMETRIAS:
+        _GEOMETRIAS[tamano] = GeometriaTablero(tamano)
+    return _GEOMETRIAS[tamano]
+
+
+# Pesos de penalización de la utilidad por cada casilla vecina del agente (valores POSITIVOS).
+# El orden importa: la penalización se suma en este orden para reproducir exactamente los mismos floats.
+PESOS_PENALIZACION = {
+    HEDOR: 0.2,            # Penalización por hedor
+    BRISA: 0.2,            # Penalización por brisa
+    BRISA_HEDOR: 0.5,      # Penalización por combinación de brisa y hedor
+    BRISA_ORO: 2,          # Penalización menor si hay oro
+    HEDOR_ORO: 2,          # Penalización menor si hay oro
+    BRISA_HEDOR_ORO: 0.05, # Penalización menor si hay oro
+}
+CASILLAS_ORO = (ORO, HEDOR_ORO, BRISA_ORO, BRISA_HEDOR_ORO)  # Códigos de casilla con oro
+MARCA_ORO = tuple(int(tile in CASILLAS_ORO) for tile in range(NUM_TIPOS_CASILLA))  # 1 si el código lleva oro
+
+# Cada casilla tiene como mucho 4 vecinos: el número de vecinos de cada tipo penalizado
+# cabe en un dígito en base 5 y los seis contadores de una casilla en un solo entero
+BASE_CONTEOS = 5
+
+
+class TablasEvaluacion:
+    """
+    Tablas precalculadas para evaluar la utilidad con unas pocas consultas:
+    - vecinos[indice]: vecinos ortogonales de cada casilla (los de GeometriaTablero).
+    - digito[tile]: lo que aporta una casilla 'tile' al código de conteos de sus vecinos.
+    - penalizacion[codigo]: penalización total para un código de conteos de vecinos.
+    - inversa_distancia[agente][oro]: 1 / (distancia euclídea + 1e-2).
+    Se comparten entre todos los tableros del mismo tamaño, como las claves Zobrist.
+    """
+
+    def __init__(self, tamano: int):
+        self.tamano = tamano
+        self.vecinos = obtener_geometria(tamano).vecinos
+
+        self.digito = [0] * NUM_TIPOS_CASILLA
+        for posicion, tile in enumerate(PESOS_PENALIZACION):
+            self.digito[tile] = BASE_CONTEOS ** posicion
+
+        self.penalizacion = _tabla_penalizacion(self.digito)
+        # Mayor penalización posible y la mayor sin casillas con oro alrededor (cotas de la utilidad)
+        self.penalizacion_maxima = max(self.penalizacion)
+        self.penalizacion_maxima_sin_oro = 4 * max(peso for tile, peso in PESOS_PENALIZACION.items()
+                                                   if tile not in CASILLAS_ORO)
+
+        self.inversa_distancia = [[1 / (math.sqrt((oro // tamano - agente // tamano) ** 2 +
+                                                  (oro % tamano - agente % tamano) ** 2) + 1e-2)
+                                   for oro in range(tamano * tamano)] for agente in range(tamano * tamano)]
+        self.inversa_sin_oro = 1 / (0 + 1e-2)  # Cuando el oro ya ha sido recolectado
+
+    def __deepcopy__(self, memo) -> 'TablasEvaluacion':
+        return self
+
+    def __reduce__(self):
+        return (obtener_tablas_evaluacion, (self.tamano,))
+
+
+_TABLAS_EVALUACION = {}
+_PENALIZACION = []  # No depende del tamaño: se calcula una sola vez
+
+
+def _tabla_penalizacion(digito: List[int]) -> List[float]:
+    """
+    Penalización total para cada código de conteos, con la misma suma y en el mismo orden
+    que utilidad_referencia.
+    """
+    if not _PENALIZACION:
+        for codigo in range(BASE_CONTEOS ** len(PESOS_PENALIZACION)):
+            penalizacion_total = 0.0
+            for tile, peso in PESOS_PENALIZACION.items():
+                penalizacion_total += peso * (codigo // digito[tile] % BASE_CONTEOS)
+            _PENALIZACION.append(penalizacion_total)
+    return _PENALIZACION
+
+
+def obtener_tablas_evaluacion(tamano: int) -> TablasEvaluacion:
+    """
+    Devuelve las tablas de evaluación compartidas para un tamaño de tablero.
+    """
+    if tamano not in _TABLAS_EVALUACION:
+        _TABLAS_EVALUACION[tamano] = TablasEvaluacion(tamano)
+    return _TABLAS_EVALUACION[tamano]
+
+
+class GeneradorColocaciones:
+    """
+    Genera las posiciones de los Wumpus, el oro y los hoyos sin reintentos ni list.remove:
+    un único Fisher-Yates parcial sobre la reserva de casillas libres (todas menos la del agente).
+    La reserva está dividida en dos zonas, [permitidas | restringidas], y se guarda el índice de
+    cada casilla dentro de ella, así que sacar una casilla o restringirla cuesta O(1).
+    - Los Wumpus se eligen entre todas las casillas libres.
+    - El oro y los hoyos solo entre las permitidas: las adyacentes al agente empiezan restringidas.
+    - Con separar_de_wumpus, los vecinos de los Wumpus también se restringen antes de colocar los hoyos.
+    Las reservas iniciales se precalculan una vez por tamaño y posición del agente.
+    """
+
+    def __init__(self, tamano: int, agente: Tuple[int, int]):
+        geometria = obtener_geometria(tamano)
+        self.tamano = tamano
+        self.agente = agente
+        self.vecinos = geometria.vecinos
+        indice_agente = agente[0] * tamano + agente[1]
+        adyacentes = geometria.vecinos[indice_agente]
+        permitidas = [casilla for casilla in range(tamano * tamano)
+                      if casilla != indice_agente and casilla not in adyacentes]
+        self.num_permitidas = len(permitidas)
+        self.reserva = permitidas + list(adyacentes)
+        # posicion[casilla]: índice de la casilla en la reserva (-1 si no está en ella)
+        self.posicion = [-1] * (tamano * tamano)
+        for i, casilla in enumerate(self.reserva):
+            self.posicion[casilla] = i
+
+    def __deepcopy__(self, memo) -> 'GeneradorColocaciones':
+        return self
+
+    def __reduce__(self):
+        return (obtener_generador_colocaciones, (self.tamano, self.agente))
+
+    def colocar(self, num_hoyos: int = 2, num_wumpus: int = 1, generador=random,
+                separar_de_wumpus: bool = False) -> Tuple[List[int], int, List[int]]:
+        """
+        Devuelve (wumpus, oro, hoyos) como índices planos, con el generador aleatorio dado
+        (el módulo random o una instancia de random.Random).
+        Lanza ValueError si no hay casillas suficientes para cumplir las restricciones.
+        """
+        reserva = self.reserva[:]
+        posicion = self.posicion[:]
+        libres = len(reserva)
+        permitidas = self.num_permitidas
+        elegir = generador.randrange
+
+        if libres < num_wumpus:
+            raise ValueError("No hay suficientes posiciones disponibles para colocar los Wumpus.")
+
+        def extraer(i: int) -> int:
+            # Saca la casilla reserva[i] rellenando su hueco con la última de su zona
+            nonlocal libres, permitidas
+            casilla = reserva[i]
+            if i < permitidas:
+                permitidas -= 1
+                ultima = reserva[permitidas]
+                reserva[i] = ultima
+                posicion[ultima] = i
+                i = permitidas
+            libres -= 1
+            ultima = reserva[libres]
+            reserva[i] = ultima
+            posicion[ultima] = i
+            posicion[casilla] = -1
+            return casilla
+
+        wumpus = [extraer(elegir(libres)) for _ in range(num_wumpus)]
+
+        if not permitidas:
+            raise ValueError("No hay posiciones disponibles para colocar el oro que no estén adyacentes al agente.")
+        oro = extraer(elegir(permitidas))
+
+        if separar_de_wumpus:
+            vecinos = self.vecinos
+            for casilla_wumpus in wumpus:
+                for vecino in vecinos[casilla_wumpus]:
+                    i = posicion[vecino]
+                    if 0 <= i < permitidas:
+                        # Pasar el vecino a la zona restringida
+                        permitidas -= 1
+                        ultima = reserva[permitidas]
+                        reserva[i] = ultima
+                        posicion[ultima] = i
+                        reserva[permitidas] = vecino
+                        posicion[vecino] = permitidas
+
+        if permitidas < num_hoyos:
+            raise ValueError("No hay suficientes posiciones disponibles para colocar los hoyos sin estar adyacentes al agente.")
+        hoyos = [extraer(elegir(permitidas)) for _ in range(num_hoyos)]
+        return wumpus, oro, hoyos
+
+
+_GENERADORES_COLOCACIONES = {}
+
+
+def obtener_generador_colocaciones(tamano: int, agente: Tuple[int, int]) -> GeneradorColocaciones:
+    """
+    Devuelve el generador de colocaciones compartido para un tamaño de tablero y una posición del agente.
+    """
+    clave = (tamano, agente)
+    if clave not in _GENERADORES_COLOCACIONES:
+        _GENERADORES_COLOCACIONES[clave] = GeneradorColocaciones(tamano, agente)
+    return _GENERADORES_COLOCACIONES[clave]
+
 
 class Tablerowumpus:
     """
     Clase que representa el tablero del juego del Wumpus.
+    El tamaño lo da la matriz inicial (cuadrada); el número de hoyos y de Wumpus es configurable.
+    Las casillas se guardan en un único bytearray plano (un byte por casilla, índice
+    fila * tamano + columna); getMatrix()/setMatrix() y la propiedad matrix siguen
+    trabajando con la matriz de listas.
     """
 
-    def __init__(self, matrix: List[List[int]]):
-        self.tamano = 6  # Tamaño del tablero (6x6)
+    __slots__ = ('tamano', 'num_hoyos', 'num_wumpus', 'celdas', 'pos_agente', 'previous_pos', 'geometria',
+                 'zobrist', 'hash', 'evaluacion', 'conteos', 'marcas_oro', 'pos_wumpus', 'posiciones_wumpus',
+                 'pos_oro', 'pos_hoyos', 'game_over', 'game_result', 'rng')
+
+    def __init__(self, matrix: List[List[int]], num_hoyos: int = 2, num_wumpus: int = 1,
+                 semilla: Optional[int] = None, rng: Optional[random.Random] = None):
+        self.tamano = len(matrix)  # Tamaño del tablero (6x6 en el juego original)
+        self.num_hoyos = num_hoyos
+        self.num_wumpus = num_wumpus
+        # Generador aleatorio propio de la partida, para la colocación inicial y los movimientos al azar
+        # de los hoyos: con la misma semilla la partida se repite exactamente (None = semilla del sistema)
+        self.rng = rng if rng is not None else random.Random(semilla)
+
+        # Validar que la matriz sea cuadrada y tenga el tamaño mínimo
+        if self.tamano < 2 or not self.es_matriz_valida(matrix):
+            raise ValueError(f"La matriz proporcionada debe ser cuadrada de al menos 2x2 (recibida de {self.tamano} filas).")
+
+        # Copiar la matriz inicial en el almacenamiento plano
+        self.celdas = bytearray(tile for fila in matrix for tile in fila)
+        self.pos_agente = (self.tamano - 1, 0)  # Posición inicial del agente en la esquina inferior izquierda
+        self.previous_pos = None  # Nueva línea para rastrear la posición anterior
+        self.geometria = obtener_geometria(self.tamano)  # Vecindades precalculadas, compartidas
 
-        # Validar que la matriz tenga el tamaño correcto
-        if not self.es_matriz_valida(matrix):
-            raise ValueError(f"La matriz proporcionada debe ser de tamaño {self.tamano}x{self.tamano}.")
+        # Hash Zobrist del estado, mantenido de forma incremental por placeTile y mover_agente
+        self.zobrist = obtener_claves_zobrist(self.tamano)
+        self.hash = self.calcular_hash()
 
-        # Crear una copia profunda de la matriz inicial
-        self.matrix = deepcopy(matrix)
-        self.pos_agente = (5, 0)  # Posición inicial fija del agente en la esquina inferior izquierda
-        self.previous_pos = None  # Nueva línea para rastrear la posición anterior
+        # Conteos de vecinos penalizados por casilla, mantenidos por placeTile para la utilidad
+        self.evaluacion = obtener_tablas_evaluacion(self.tamano)
+        self.conteos = self.calcular_conteos()
+        # Casillas con oro en la matriz, mantenidas por placeTile (restore_tile puede dejar marcas sobrantes)
+        self.marcas_oro = self.contar_marcas_oro()
 
         # Colocar el agente en la matriz
         self.placeTile(self.pos_agente[0], self.pos_agente[1], AGENTE)
 
         # Inicializar atributos para posiciones clave
-        self.pos_wumpus = None
+        self.pos_wumpus = None       # Primer Wumpus (compatibilidad con el juego de un solo Wumpus)
+        self.posiciones_wumpus = []  # Todos los Wumpus (no se mueven)
         self.pos_oro = None
         self.pos_hoyos = []
 
@@ -58,15 +373,58 @@ class Tablerowumpus:
         self.game_over = False
         self.game_result = None  # Puede ser 'win', 'lose_wumpus' o 'lose_hoyo'
 
+    @classmethod
+    def crear(cls, tamano: int = 6, num_hoyos: int = 2, num_wumpus: int = 1,
+              semilla: Optional[int] = None) -> 'Tablerowumpus':
+        """
+        Crea un tablero vacío de tamano x tamano y coloca en él los elementos del juego.
+        """
+        return cls([[BLANCO for _ in range(tamano)] for _ in range(tamano)], num_hoyos, num_wumpus, semilla)
+
     def __eq__(self, other) -> bool:
         """
         Metodo para comparar dos tableros y verificar si son iguales.
         """
-        for i in range(self.tamano):
-            for j in range(self.tamano):
-                if self.matrix[i][j] != other.matrix[i][j]:
-                    return False
-        return True
+        if isinstance(other, Tablerowumpus):
+            return self.celdas == other.celdas
+        return self.getMatrix() == other.getMatrix()
+
+    def __deepcopy__(self, memo) -> 'Tablerowumpus':
+        """
+        Copia rápida: las casillas son un bytearray y las tablas compartidas no se duplican.
+        """
+        nuevo = Tablerowumpus.__new__(Tablerowumpus)
+        nuevo.tamano = self.tamano
+        nuevo.num_hoyos = self.num_hoyos
+        nuevo.num_wumpus = self.num_wumpus
+        nuevo.celdas = self.celdas[:]
+        nuevo.pos_agente = self.pos_agente
+        nuevo.previous_pos = self.previous_pos
+        nuevo.geometria = self.geometria
+        nuevo.zobrist = self.zobrist
+        nuevo.hash = self.hash
+        nuevo.evaluacion = self.evaluacion
+        nuevo.conteos = self.conteos[:]
+        nuevo.marcas_oro = self.marcas_oro
+        nuevo.pos_wumpus = self.pos_wumpus
+        nuevo.posiciones_wumpus = self.posiciones_wumpus  # Los Wumpus no se mueven: se comparte la lista
+        nuevo.pos_oro = self.pos_oro
+        nuevo.pos_hoyos = self.pos_hoyos[:]
+        nuevo.game_over = self.game_over
+        nuevo.game_result = self.game_result
+        nuevo.rng = self.rng  # Las copias de la búsqueda no sortean nada: se comparte el generador
+        return nuevo
+
+    @property
+    def matrix(self) -> List[List[int]]:
+        """
+        Vista de compatibilidad: copia de la matriz como lista de filas.
+        """
+        return self.getMatrix()
+
+    @matrix.setter
+    def matrix(self, matrix: List[List[int]]):
+        self.setMatrix(matrix)
 
     def setMatrix(self, matrix: List[List[int]]):
         """
@@ -74,91 +432,102 @@ class Tablerowumpus:
         """
         if not self.es_matriz_valida(matrix):
             raise ValueError(f"La matriz proporcionada debe ser de tamaño {self.tamano}x{self.tamano}.")
-        self.matrix = deepcopy(matrix)
+        self.celdas = bytearray(tile for fila in matrix for tile in fila)
+        self.hash = self.calcular_hash()
+        self.conteos = self.calcular_conteos()
+        self.marcas_oro = self.contar_marcas_oro()
+
+    def calcular_hash(self) -> int:
+        """
+        Calcula desde cero el hash Zobrist de la matriz y de la posición anterior del agente.
+        """
+        claves = self.zobrist.casillas_planas
+        valor = 0
+        for indice, tile in enumerate(self.celdas):
+            valor ^= claves[indice][tile]
+        if self.previous_pos is not None:
+            valor ^= self.zobrist.previa[self.previous_pos[0]][self.previous_pos[1]]
+        return valor
+
+    def calcular_conteos(self) -> List[int]:
+        """
+        Calcula desde cero, para cada casilla, el código de conteos de sus vecinos penalizados.
+        """
+        digito = self.evaluacion.digito
+        celdas = self.celdas
+        return [sum(digito[celdas[v]] for v in vecinos) for vecinos in self.evaluacion.vecinos]
+
+    def contar_marcas_oro(self) -> int:
+        """
+        Cuenta desde cero las casillas de la matriz con oro (ORO, HEDOR_ORO, BRISA_ORO o BRISA_HEDOR_ORO).
+        """
+        return sum(MARCA_ORO[tile] for tile in self.celdas)
 
     def getMatrix(self) -> List[List[int]]:
         """
-        Retorna una copia profunda de la matriz actual del tablero.
+        Retorna una copia de la matriz actual del tablero (lista de filas).
         """
-        return deepcopy(self.matrix)
+        tamano = self.tamano
+        return [list(self.celdas[i * tamano:(i + 1) * tamano]) for i in range(tamano)]
 
     def placeTile(self, row: int, col: int, tile: int):
         """
         Coloca un elemento específico en una posición del tablero.
         """
         if 0 <= row < self.tamano and 0 <= col < self.tamano:
-            self.matrix[row][col] = tile
+            indice = row * self.tamano + col
+            anterior = self.celdas[indice]
+            claves = self.zobrist.casillas_planas[indice]
+            self.hash ^= claves[anterior] ^ claves[tile]
+            self.celdas[indice] = tile
+            self.marcas_oro += MARCA_ORO[tile] - MARCA_ORO[anterior]
+            # Actualizar los conteos de los vecinos (solo si cambia el tipo penalizado de la casilla)
+            evaluacion = self.evaluacion
+            delta = evaluacion.digito[tile] - evaluacion.digito[anterior]
+            if delta:
+                conteos = self.conteos
+                for vecino in evaluacion.vecinos[indice]:
+                    conteos[vecino] += delta
         else:
             raise IndexError(f"Las coordenadas ({row}, {col}) están fuera de los límites del tablero.")
 
-    def colocar_elementos(self):
+    def colocar_elementos(self, separar_de_wumpus: bool = False):
         """
         Coloca el Wumpus, el oro y los hoyos en el tablero de manera aleatoria,
         asegurándose de que cumplan con las restricciones del juego.
+        Con separar_de_wumpus, los hoyos tampoco quedan adyacentes a ningún Wumpus.
         """
-        # Generar todas las posiciones disponibles en el tablero
-        posiciones_disponibles = [(i, j) for i in range(self.tamano) for j in range(self.tamano)]
-        # Remover la posición del agente de las disponibles
-        if self.pos_agente in posiciones_disponibles:
-            posiciones_disponibles.remove(self.pos_agente)
-
-        # Colocar el Wumpus en una posición aleatoria
-        wumpus_pos = random.choice(posiciones_disponibles)
-        self.placeTile(wumpus_pos[0], wumpus_pos[1], WUMPUS)
-        posiciones_disponibles.remove(wumpus_pos)
-        self.pos_wumpus = wumpus_pos  # Almacenar la posición del Wumpus
-
-        # Colocar el oro, asegurando que no esté adyacente al agente
-        posiciones_no_adyacentes = [pos for pos in posiciones_disponibles if
-                                     not self.es_adyacente(pos, self.pos_agente)]
-        if not posiciones_no_adyacentes:
-            raise ValueError("No hay posiciones disponibles para colocar el oro que no estén adyacentes al agente.")
-        oro_pos = random.choice(posiciones_no_adyacentes)
-        self.placeTile(oro_pos[0], oro_pos[1], ORO)
-        posiciones_disponibles.remove(oro_pos)
-        self.pos_oro = oro_pos  # Almacenar la posición del oro
-
-        # Colocar dos hoyos, asegurando que no estén adyacentes al agente
-        if len(posiciones_disponibles) < 2:
-            raise ValueError("No hay suficientes posiciones disponibles para colocar los hoyos.")
-
-        # Excluir posiciones adyacentes al agente para los hoyos
-        posiciones_para_hoyos = [pos for pos in posiciones_disponibles if not self.es_adyacente(pos, self.pos_agente)]
-        if len(posiciones_para_hoyos) < 2:
-            raise ValueError("No hay suficientes posiciones disponibles para colocar los hoyos sin estar adyacentes al agente.")
+        generador = obtener_generador_colocaciones(self.tamano, self.pos_agente)
+        wumpus, oro, hoyos = generador.colocar(self.num_hoyos, self.num_wumpus, self.rng, separar_de_wumpus)
+        coordenadas = self.geometria.coordenadas
+
+        # Colocar los Wumpus
+        self.posiciones_wumpus = [coordenadas[casilla] for casilla in wumpus]
+        for wumpus_pos in self.posiciones_wumpus:
+            self.placeTile(wumpus_pos[0], wumpus_pos[1], WUMPUS)
+        self.pos_wumpus = self.posiciones_wumpus[0] if self.posiciones_wumpus else None
+
+        # Colocar el oro (nunca adyacente al agente)
+        self.pos_oro = coordenadas[oro]
+        self.placeTile(self.pos_oro[0], self.pos_oro[1], ORO)
+
+        # Colocar los hoyos (nunca adyacentes al agente), en el orden de hoyo_index
+        self.pos_hoyos = [coordenadas[casilla] for casilla in hoyos]
+        for hoyo_pos in self.pos_hoyos:
+            self.placeTile(hoyo_pos[0], hoyo_pos[1], HOYO)
 
-        # Colocar el primer hoyo
-        hoyos_pos1 = random.choice(posiciones_para_hoyos)
-        self.placeTile(hoyos_pos1[0], hoyos_pos1[1], HOYO)
-        posiciones_disponibles.remove(hoyos_pos1)
-        posiciones_para_hoyos.remove(hoyos_pos1)
-
-        # Colocar el segundo hoyo
-        hoyos_pos2 = random.choice(posiciones_para_hoyos)
-        self.placeTile(hoyos_pos2[0], hoyos_pos2[1], HOYO)
-        posiciones_disponibles.remove(hoyos_pos2)
-        self.pos_hoyos = [hoyos_pos1, hoyos_pos2]  # Almacenar las posiciones de los hoyos
-
-        # Colocar casillas de hedor alrededor del Wumpus
-        vecinos_wumpus = self.obtener_vecinos(wumpus_pos)
-        for vec in vecinos_wumpus:
-            if self.matrix[vec[0]][vec[1]] == BLANCO:
-                self.placeTile(vec[0], vec[1], HEDOR)
-            elif self.matrix[vec[0]][vec[1]] == ORO:
-                self.placeTile(vec[0], vec[1], HEDOR_ORO)
+        # Colocar casillas de hedor alrededor de los Wumpus
+        celdas = self.celdas
+        for wumpus_pos in self.posiciones_wumpus:
+            for x, y in self.obtener_vecinos(wumpus_pos):
+                if celdas[x * self.tamano + y] == BLANCO:
+                    self.placeTile(x, y, HEDOR)
+                elif celdas[x * self.tamano + y] == ORO:
+                    self.placeTile(x, y, HEDOR_ORO)
 
         # Colocar casillas de brisa alrededor de los hoyos
         for hoyo_pos in self.pos_hoyos:
-            vecinos_hoyo = self.obtener_vecinos(hoyo_pos)
-            for vec in vecinos_hoyo:
-                if self.matrix[vec[0]][vec[1]] == BLANCO:
-                    self.placeTile(vec[0], vec[1], BRISA)
-                elif self.matrix[vec[0]][vec[1]] == HEDOR:
-                    self.placeTile(vec[0], vec[1], BRISA_HEDOR)
-                elif self.matrix[vec[0]][vec[1]] == ORO:
-                    self.placeTile(vec[0], vec[1], BRISA_ORO)
-                elif self.matrix[vec[0]][vec[1]] == HEDOR_ORO:
-                    self.placeTile(vec[0], vec[1], BRISA_HEDOR_ORO)
+            self.actualizar_brisa_al_agregar_hoyo(*hoyo_pos)
 
     def es_matriz_valida(self, matrix: List[List[int]]) -> bool:
         """
@@ -181,20 +550,30 @@ class Tablerowumpus:
         """
         return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1]) == 1
 
-    def obtener_vecinos(self, pos: Tuple[int, int]) -> List[Tuple[int, int]]:
+    def obtener_vecinos(self, pos: Tuple[int, int]) -> Tuple[Tuple[int, int], ...]:
         """
-        Obtiene una lista de posiciones adyacentes válidas a una posición dada.
+        Obtiene las posiciones adyacentes válidas a una posición dada (tupla precalculada y compartida).
         """
-        i, j = pos
-        vecinos = []
-        posibles = [(i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)]
-        for x, y in posibles:
-            if 0 <= x < self.tamano and 0 <= y < self.tamano:
-                vecinos.append((x, y))
-        return vecinos
+        return self.geometria.vecinos_coordenadas[pos[0] * self.tamano + pos[1]]
 
     def utility(self, currentLevel: int) -> float:
+        """
+        Utilidad del tablero a partir de las tablas precalculadas y de los conteos incrementales.
+        Da exactamente el mismo resultado que utilidad_referencia.
+        """
+        evaluacion = self.evaluacion
+        agente = self.pos_agente[0] * self.tamano + self.pos_agente[1]
+        if self.pos_oro:
+            inversa = evaluacion.inversa_distancia[agente][self.pos_oro[0] * self.tamano + self.pos_oro[1]]
+        else:
+            inversa = evaluacion.inversa_sin_oro
+        return inversa - evaluacion.penalizacion[self.conteos[agente]] - 0.1 * currentLevel
 
+    def utilidad_referencia(self, currentLevel: int) -> float:
+        """
+        Cálculo original de la utilidad, recorriendo los vecinos del agente. Se conserva como
+        referencia para comprobar utility().
+        """
         posAgente = list(self.pos_agente)
         posOro = list(self.pos_oro) if self.pos_oro else [0, 0]  # Manejar pos_oro=None
 
@@ -219,19 +598,12 @@ class Tablerowumpus:
         }
 
         for vec in vecinos_agente:
-            tile = self.matrix[vec[0]][vec[1]]
+            tile = self.celdas[vec[0] * self.tamano + vec[1]]
             if tile in contador_penalizaciones:
                 contador_penalizaciones[tile] += 1
 
-        # Definir pesos de penalización (valores POSITIVOS ahora)
-        pesos_penalizacion = {
-            HEDOR: 0.2,            # Penalización por hedor
-            BRISA: 0.2,            # Penalización por brisa
-            BRISA_HEDOR: 0.5,      # Penalización por combinación de brisa y hedor
-            BRISA_ORO: 2,          # Penalización menor si hay oro
-            HEDOR_ORO: 2,          # Penalización menor si hay oro
-            BRISA_HEDOR_ORO: 0.05, # Penalización menor si hay oro
-        }
+        # Pesos de penalización (valores POSITIVOS)
+        pesos_penalizacion = PESOS_PENALIZACION
 
         # Calcular penalización total
         penalizacion_total = 0.0
@@ -264,7 +636,7 @@ class Tablerowumpus:
             BRISA_HEDOR_ORO: 'BHO'
         }
         print("-" * (self.tamano * 4 + 1))
-        for fila in self.matrix:
+        for fila in self.getMatrix():
             print("|", end="")
             for casilla in fila:
                 symbol = tile_symbols.get(casilla, '??')
@@ -343,11 +715,11 @@ class Tablerowumpus:
         Cada movimiento es una tupla (hoyo_index, new_row, new_col).
         """
         moves = []
-        for hoyo_index, hoyo_pos in enumerate(self.pos_hoyos):
-            vecinos = self.obtener_vecinos(hoyo_pos)
-            for vec in vecinos:
-                if self.canMoveHoyo(hoyo_index, vec[0], vec[1]):
-                    moves.append((hoyo_index, vec[0], vec[1]))
+        vecinos_coordenadas = self.geometria.vecinos_coordenadas
+        for hoyo_index, (row, col) in enumerate(self.pos_hoyos):
+            for x, y in vecinos_coordenadas[row * self.tamano + col]:
+                if self.canMoveHoyo(hoyo_index, x, y):
+                    moves.append((hoyo_index, x, y))
         return moves
 
     def up(self, row: int, col: int):
@@ -394,8 +766,11 @@ class Tablerowumpus:
         """
         Actualiza la posición del agente en el tablero, restaurando la casilla anterior y colocando el agente en la nueva.
         """
-        # Actualizar la posición anterior
+        # Actualizar la posición anterior (y su contribución al hash)
+        if self.previous_pos is not None:
+            self.hash ^= self.zobrist.previa[self.previous_pos[0]][self.previous_pos[1]]
         self.previous_pos = (old_row, old_col)
+        self.hash ^= self.zobrist.previa[old_row][old_col]
 
         # Restaurar la casilla antigua a su estado original
         self.restore_tile(old_row, old_col)
@@ -415,20 +790,21 @@ class Tablerowumpus:
         self.placeTile(row, col, BLANCO)
 
         # Recalcular brisas y hedores en los vecinos
-        vecinos = self.obtener_vecinos((row, col))
-        for vec in vecinos:
-            tile = self.matrix[vec[0]][vec[1]]
+        celdas = self.celdas
+        indice = row * self.tamano + col
+        for vecino in self.geometria.vecinos[indice]:
+            tile = celdas[vecino]
             if tile == HOYO:
                 # Si hay un hoyo adyacente, colocar brisa
-                if self.matrix[row][col] == BLANCO:
+                if celdas[indice] == BLANCO:
                     self.placeTile(row, col, BRISA)
             elif tile == WUMPUS:
                 # Si hay un Wumpus adyacente, colocar hedor
-                if self.matrix[row][col] == BLANCO:
+                if celdas[indice] == BLANCO:
                     self.placeTile(row, col, HEDOR)
             elif tile == ORO:
                 # Si hay oro adyacente, colocar indicación de oro con brisa si aplica
-                if self.matrix[row][col] == BLANCO:
+                if celdas[indice] == BLANCO:
                     self.placeTile(row, col, BRISA_ORO)
 
     def verificar_estado_juego(self, row: int, col: int):
@@ -444,8 +820,8 @@ class Tablerowumpus:
             self.pos_oro = None  # Actualizar pos_oro para indicar que el oro ha sido recolectado
             return
 
-        # Verificar si el agente ha sido devorado por el Wumpus
-        if agente_pos == self.pos_wumpus:
+        # Verificar si el agente ha sido devorado por un Wumpus
+        if agente_pos in self.posiciones_wumpus:
             self.game_over = True
             self.game_result = 'lose_wumpus'
             return
@@ -469,7 +845,7 @@ class Tablerowumpus:
         pero no a casillas ocupadas por ORO, WUMPUS, AGENTE o combinaciones con ORO.
         """
         if 0 <= new_row < self.tamano and 0 <= new_col < self.tamano:
-            tile = self.matrix[new_row][new_col]
+            tile = self.celdas[new_row * self.tamano + new_col]
             # Evitar mover a casillas prohibidas
             forbidden_tiles = {AGENTE, WUMPUS, ORO, BRISA_ORO, HEDOR_ORO, BRISA_HEDOR_ORO}
             if tile not in forbidden_tiles and tile in {BLANCO, BRISA, HEDOR, BRISA_HEDOR}:
@@ -498,33 +874,31 @@ class Tablerowumpus:
         """
         Actualiza las casillas de brisa alrededor de un hoyo que ha sido movido.
         """
-        vecinos = self.obtener_vecinos((row, col))
-        for vec in vecinos:
-            tile = self.matrix[vec[0]][vec[1]]
+        for x, y in self.geometria.vecinos_coordenadas[row * self.tamano + col]:
+            tile = self.celdas[x * self.tamano + y]
             if tile == BRISA:
-                self.placeTile(vec[0], vec[1], BLANCO)
+                self.placeTile(x, y, BLANCO)
             elif tile == BRISA_HEDOR:
-                self.placeTile(vec[0], vec[1], HEDOR)
+                self.placeTile(x, y, HEDOR)
             elif tile == BRISA_ORO:
-                self.placeTile(vec[0], vec[1], ORO)
+                self.placeTile(x, y, ORO)
             elif tile == BRISA_HEDOR_ORO:
-                self.placeTile(vec[0], vec[1], HEDOR_ORO)
+                self.placeTile(x, y, HEDOR_ORO)
 
     def actualizar_brisa_al_agregar_hoyo(self, row: int, col: int):
         """
         Actualiza las casillas de brisa alrededor de un hoyo que ha sido colocado.
         """
-        vecinos = self.obtener_vecinos((row, col))
-        for vec in vecinos:
-            tile = self.matrix[vec[0]][vec[1]]
+        for x, y in self.geometria.vecinos_coordenadas[row * self.tamano + col]:
+            tile = self.celdas[x * self.tamano + y]
             if tile == BLANCO:
-                self.placeTile(vec[0], vec[1], BRISA)
+                self.placeTile(x, y, BRISA)
             elif tile == HEDOR:
-                self.placeTile(vec[0], vec[1], BRISA_HEDOR)
+                self.placeTile(x, y, BRISA_HEDOR)
             elif tile == ORO:
-                self.placeTile(vec[0], vec[1], BRISA_ORO)
+                self.placeTile(x, y, BRISA_ORO)
             elif tile == HEDOR_ORO:
-                self.placeTile(vec[0], vec[1], BRISA_HEDOR_ORO)
+                self.placeTile(x, y, BRISA_HEDOR_ORO)
 
     def moveCanBeMade(self, player: int) -> bool:
         """
@@ -537,18 +911,779 @@ class Tablerowumpus:
             moves = self.getAvailableMovesForMin()
             return len(moves) > 0
 
+    # ================================
+    # Métodos para la búsqueda en sitio (aplicar / deshacer)
+    # ================================
+
+    def aplicar_movimiento_agente(self, move: str) -> tuple:
+        """
+        Aplica un movimiento del agente sobre este mismo tablero y devuelve el registro
+        necesario para deshacerlo con deshacer_movimiento().
+        """
+        row, col = self.pos_agente
+        delta_row, delta_col = DELTAS_MOVIMIENTO[move]
+        new_row, new_col = row + delta_row, col + delta_col
+
+        # Las casillas se guardan enteras: copiar 36 bytes es más barato que registrar las que cambian
+        registro = (bytes(self.celdas), self.pos_agente, self.previous_pos, self.pos_oro,
+                    self.game_over, self.game_result, None, self.hash, self.conteos[:], self.marcas_oro)
+
+        self.mover_agente(row, col, new_row, new_col)
+        self.verificar_estado_juego(new_row, new_col)
+        return registro
+
+    def aplicar_movimiento_hoyo(self, hoyo_index: int, new_row: int, new_col: int) -> tuple:
+        """
+        Mueve un hoyo sobre este mismo tablero y devuelve el registro necesario
+        para deshacerlo con deshacer_movimiento().
+        """
+        old_pos = self.pos_hoyos[hoyo_index]
+        registro = (bytes(self.celdas), self.pos_agente, self.previous_pos, self.pos_oro,
+                    self.game_over, self.game_result, (hoyo_index, old_pos), self.hash, self.conteos[:],
+                    self.marcas_oro)
+
+        self.mover_hoyo(hoyo_index, new_row, new_col)
+        return registro
+
+    def aplicar_movimiento(self, move: Movimiento) -> tuple:
+        """
+        Aplica un movimiento del agente (str) o de un hoyo (tupla) y devuelve su registro de deshacer.
+        """
+        if isinstance(move, str):
+            return self.aplicar_movimiento_agente(move)
+        return self.aplicar_movimiento_hoyo(*move)
+
+    def deshacer_movimiento(self, registro: tuple):
+        """
+        Restaura el tablero al estado anterior a partir del registro devuelto por aplicar_movimiento_*.
+        """
+        (celdas, pos_agente, previous_pos, pos_oro, game_over, game_result, hoyo, self.hash, self.conteos,
+         self.marcas_oro) = registro
+        self.celdas[:] = celdas
+        self.pos_agente = pos_agente
+        self.previous_pos = previous_pos
+        self.pos_oro = pos_oro
+        self.game_over = game_over
+        self.game_result = game_result
+        if hoyo is not None:
+            hoyo_index, old_pos = hoyo
+            self.pos_hoyos[hoyo_index] = old_pos
+
+
+# ================================
+# Tabla de transposición
+# ================================
+
+# Tipos de cota almacenados en la tabla de transposición
+EXACTO = 0
+COTA_INFERIOR = 1
+COTA_SUPERIOR = 2
+
+
+class TablaTransposicion:
+    """
+    Tabla de transposición de tamaño fijo indexada por el hash Zobrist del tablero.
+    Cada entrada guarda (clave, nivel, profundidad, valor, tipo_de_cota, mejor_movimiento).
+    El nivel se guarda porque la utilidad depende de currentLevel: una entrada solo puede
+    cortar la búsqueda en un nodo del mismo nivel.
+    """
+
+    def __init__(self, capacidad: int = 1 << 16):
+        if capacidad <= 0:
+            raise ValueError("La capacidad de la tabla de transposición debe ser positiva.")
+        self.capacidad = capacidad
+        self.entradas = [None] * capacidad
+        self.aciertos = 0        # Consultas que encontraron la clave
+        self.fallos = 0          # Consultas sin entrada para la clave
+        self.sobrescrituras = 0  # Entradas de otra posición reemplazadas al guardar
+        self.ocupadas = 0
+
+    def consultar(self, clave: int) -> Optional[tuple]:
+        """
+        Devuelve la entrada almacenada para la clave, o None si no existe.
+        """
+        entrada = self.entradas[clave % self.capacidad]
+        if entrada is not None and entrada[0] == clave:
+            self.aciertos += 1
+            return entrada
+        self.fallos += 1
+        return None
+
+    def guardar(self, clave: int, nivel: int, profundidad: int, valor: float, tipo: int,
+                mejor_movimiento: Optional[Movimiento]):
+        """
+        Guarda el resultado de un nodo. Ante una colisión se reemplaza siempre la entrada anterior;
+        para la misma posición solo se reemplaza si la nueva búsqueda es al menos igual de profunda.
+        """
+        indice = clave % self.capacidad
+        actual = self.entradas[indice]
+        if actual is None:
+            self.ocupadas += 1
+        elif actual[0] != clave or actual[1] != nivel:
+            self.sobrescrituras += 1
+        elif actual[2] > profundidad:
+            return
+        self.entradas[indice] = (clave, nivel, profundidad, valor, tipo, mejor_movimiento)
+
+    def limpiar(self):
+        """
+        Vacía la tabla y reinicia los contadores.
+        """
+        self.entradas = [None] * self.capacidad
+        self.aciertos = self.fallos = self.sobrescrituras = self.ocupadas = 0
+
+    def estadisticas(self) -> dict:
+        """
+        Devuelve los contadores de uso para dimensionar la tabla.
+        """
+        consultas = self.aciertos + self.fallos
+        return {
+            'capacidad': self.capacidad,
+            'ocupadas': self.ocupadas,
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'sobrescrituras': self.sobrescrituras,
+            'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+        }
+
+
+# ================================
+# Tablas precalculadas en disco (mmap)
+# ================================
+
+VERSION_REGLAS = 1  # Se incrementa al cambiar las reglas de movimiento: invalida las tablas ya generadas
+# Cabecera común: magia, versión del formato, versión de las reglas, tamaño, hoyos, Wumpus y 2 bytes libres
+# (16 bytes, de modo que los datos que siguen quedan alineados a 8)
+FORMATO_CABECERA_MAPEADA = '<4sHHHHHH'
+TAMANO_CABECERA_MAPEADA = struct.calcsize(FORMATO_CABECERA_MAPEADA)
+
+
+def cabecera_tabla_mapeada(magia: bytes, version: int, tamano: int, num_hoyos: int, num_wumpus: int) -> bytes:
+    """
+    Cabecera de un fichero de TablaMapeada, calculado con las reglas actuales (VERSION_REGLAS).
+    """
+    return struct.pack(FORMATO_CABECERA_MAPEADA, magia, version, VERSION_REGLAS, tamano, num_hoyos, num_wumpus, 0)
+
+
+class TablaMapeada:
+    """
+    Fichero binario de valores precalculados (tablas finales, libro de aperturas...) con una cabecera
+    fija y los datos a continuación, leído con mmap y a través de memoryview sin copiarlo ni
+    deserializarlo: los procesos que abren el mismo fichero comparten sus páginas en la caché del
+    sistema. Al enviarla a otro proceso se envía solo su ruta y el proceso la vuelve a abrir.
+    """
+
+    def __init__(self, ruta: str, magia: bytes, version: int):
+        self.ruta = ruta
+        self.magia = magia
+        self.version = version
+        with open(ruta, 'rb') as fichero:
+            self.mapa = mmap.mmap(fichero.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.mapa) < TAMANO_CABECERA_MAPEADA:
+            self.mapa.close()
+            raise ValueError(f"{ruta} es demasiado corto para ser una tabla precalculada.")
+        magia_fichero, version_fichero, reglas, self.tamano, self.num_hoyos, self.num_wumpus, _ = \
+            struct.unpack_from(FORMATO_CABECERA_MAPEADA, self.mapa)
+        if magia_fichero != magia or version_fichero != version:
+            self.mapa.close()
+            raise ValueError(f"{ruta} no es un fichero {magia.decode()} de la versión {version}.")
+        if reglas != VERSION_REGLAS:
+            self.mapa.close()
+            raise ValueError(f"{ruta} se calculó con la versión {reglas} de las reglas (la actual es {VERSION_REGLAS}).")
+        self.datos = memoryview(self.mapa)[TAMANO_CABECERA_MAPEADA:]  # Todo lo que sigue a la cabecera
+        self.vistas = []  # Vistas creadas con vista(), que hay que liberar antes de cerrar el mapa
+
+    def admite(self, tamano: int, num_hoyos: int, num_wumpus: int) -> bool:
+        return (tamano, num_hoyos, num_wumpus) == (self.tamano, self.num_hoyos, self.num_wumpus)
+
+    def vista(self, inicio: int, cantidad: int, formato: str = 'B') -> memoryview:
+        """
+        Vista sin copia de 'cantidad' valores del tipo 'formato' de struct, desde el byte 'inicio' de los datos.
+        """
+        ancho = struct.calcsize(formato)
+        if inicio + cantidad * ancho > len(self.datos):
+            raise ValueError(f"{self.ruta} está truncado: faltan datos a partir del byte {inicio}.")
+        vista = self.datos[inicio:inicio + cantidad * ancho].cast(formato)
+        self.vistas.append(vista)
+        return vista
+
+    def cerrar(self):
+        if self.datos is not None:
+            for vista in self.vistas:
+                vista.release()
+            self.datos.release()
+            self.mapa.close()
+            self.datos = None
+
+    def __reduce__(self):
+        return (TablaMapeada, (self.ruta, self.magia, self.version))
+
+
+# ================================
+# Libro de aperturas
+# ================================
+
+MAGIA_LIBRO = b'WLAB'
+# Tras la cabecera común: profundidad, plies, motor (índice en MOTORES_LIBRO), modelo de los hoyos (índice
+# en MODELOS_HOYOS), 2 bytes libres y número de entradas; siguen las claves ordenadas (uint64), las
+# utilidades (double) y los movimientos (un byte, índice en MOVIMIENTOS_LIBRO)
+FORMATO_LIBRO = '<HHBB2xQ'
+MOVIMIENTOS_LIBRO = (MOVE_UP, MOVE_DOWN, MOVE_LEFT, MOVE_RIGHT)
+MOTORES_LIBRO = ('minimax', 'mcts')
+
+
+class LibroAperturas:
+    """
+    Mejores movimientos del agente precalculados para las primeras jugadas de la partida,
+    indexados por el hash Zobrist del tablero (disposición, posición del agente y posición
+    anterior). El fichero lo genera libro_aperturas.py con el simulador; aquí se carga
+    de forma perezosa, en la primera consulta, y se consulta antes de buscar.
+    - En JSON (extensión .json) las entradas se cargan en un diccionario.
+    - En binario (cualquier otra extensión) el fichero se abre como TablaMapeada y se busca en
+      las claves ordenadas por bisección, sin cargarlo: los procesos del simulador comparten una copia.
+    Un libro solo sirve para tableros con su mismo tamaño, hoyos y Wumpus, y para búsquedas con el
+    mismo motor y modelo de los hoyos que lo generaron (los valores de miniMax no son los de MCTS ni
+    los de expectimax).
+    """
+
+    VERSION = 2
+
+    def __init__(self, ruta: Optional[str] = None, tamano: int = 6, num_hoyos: int = 2, num_wumpus: int = 1,
+                 profundidad: int = 0, plies: int = 0, motor: str = 'minimax', modelo_hoyos: str = 'adversario'):
+        self.ruta = ruta
+        self.tamano = tamano
+        self.num_hoyos = num_hoyos
+        self.num_wumpus = num_wumpus
+        self.profundidad = profundidad  # Profundidad de la búsqueda con la que se calcularon las entradas
+        self.plies = plies              # Jugadas del agente cubiertas desde el inicio de la partida
+        self.motor = motor              # Motor de búsqueda que calculó las entradas (MOTORES_LIBRO)
+        self.modelo_hoyos = modelo_hoyos  # Modelo de los hoyos de esa búsqueda (MODELOS_HOYOS)
+        self.entradas = None if ruta is not None else {}  # hash -> (movimiento, utilidad); None = sin cargar
+        self.tabla = None  # TablaMapeada del libro binario (entradas queda vacío)
+        self.aciertos = 0
+        self.fallos = 0
+
+    def cargar(self):
+        """
+        Lee el fichero del libro (JSON o binario, según su primer byte). Lanza ValueError si no es
+        de una versión conocida.
+        """
+        with open(self.ruta, 'rb') as fichero:
+            binario = fichero.read(len(MAGIA_LIBRO)) == MAGIA_LIBRO
+        if binario:
+            self.tabla = TablaMapeada(self.ruta, MAGIA_LIBRO, self.VERSION)
+            self.tamano, self.num_hoyos, self.num_wumpus = self.tabla.tamano, self.tabla.num_hoyos, self.tabla.num_wumpus
+            self.profundidad, self.plies, motor, modelo_hoyos, cantidad = struct.unpack_from(FORMATO_LIBRO,
+                                                                                             self.tabla.datos)
+            self.motor, self.modelo_hoyos = MOTORES_LIBRO[motor], MODELOS_HOYOS[modelo_hoyos]
+            inicio = struct.calcsize(FORMATO_LIBRO)
+            self.claves = self.tabla.vista(inicio, cantidad, 'Q')
+            self.utilidades = self.tabla.vista(inicio + 8 * cantidad, cantidad, 'd')
+            self.movimientos = self.tabla.vista(inicio + 16 * cantidad, cantidad, 'B')
+            self.entradas = {}
+            return
+        with open(self.ruta, encoding='utf-8') as fichero:
+            datos = json.load(fichero)
+        if datos.get('version') != self.VERSION:
+            raise ValueError(f"Versión del libro de aperturas no soportada: {datos.get('version')}.")
+        self.tamano = datos['tamano']
+        self.num_hoyos = datos['num_hoyos']
+        self.num_wumpus = datos['num_wumpus']
+        self.profundidad = datos['profundidad']
+        self.plies = datos['plies']
+        self.motor = datos['motor']
+        self.modelo_hoyos = datos['modelo_hoyos']
+        self.entradas = {int(clave, 16): (movimiento, valor)
+                         for clave, (movimiento, valor) in datos['entradas'].items()}
+
+    def guardar(self, ruta: Optional[str] = None):
+        """
+        Escribe el libro (en su propia ruta si no se indica otra): en JSON si la extensión es .json
+        y en el formato binario de TablaMapeada en otro caso.
+        """
+        ruta = ruta or self.ruta
+        if not ruta.endswith('.json'):
+            claves = sorted(self.entradas)
+            with open(ruta, 'wb') as fichero:
+                fichero.write(cabecera_tabla_mapeada(MAGIA_LIBRO, self.VERSION, self.tamano, self.num_hoyos,
+                                                     self.num_wumpus))
+                fichero.write(struct.pack(FORMATO_LIBRO, self.profundidad, self.plies,
+                                          MOTORES_LIBRO.index(self.motor), MODELOS_HOYOS.index(self.modelo_hoyos),
+                                          len(claves)))
+                fichero.write(struct.pack(f'<{len(claves)}Q', *claves))
+                fichero.write(struct.pack(f'<{len(claves)}d', *(self.entradas[clave][1] for clave in claves)))
+                fichero.write(bytes(MOVIMIENTOS_LIBRO.index(self.entradas[clave][0]) for clave in claves))
+            return
+        datos = {
+            'version': self.VERSION,
+            'tamano': self.tamano,
+            'num_hoyos': self.num_hoyos,
+            'num_wumpus': self.num_wumpus,
+            'profundidad': self.profundidad,
+            'plies': self.plies,
+            'motor': self.motor,
+            'modelo_hoyos': self.modelo_hoyos,
+            'entradas': {format(clave, 'x'): [movimiento, valor] for clave, (movimiento, valor) in self.entradas.items()},
+        }
+        with open(ruta, 'w', encoding='utf-8') as fichero:
+            json.dump(datos, fichero)
+
+    def agregar(self, clave: int, movimiento: str, valor: float):
+        self.entradas[clave] = (movimiento, valor)
+
+    def _buscar(self, clave: int) -> Optional[Tuple[str, float]]:
+        if self.tabla is None:
+            return self.entradas.get(clave)
+        indice = bisect.bisect_left(self.claves, clave)
+        if indice == len(self.claves) or self.claves[indice] != clave:
+            return None
+        return (MOVIMIENTOS_LIBRO[self.movimientos[indice]], self.utilidades[indice])
+
+    def consultar(self, tablero: Tablerowumpus, profundidad_minima: int = 0, motor: str = 'minimax',
+                  modelo_hoyos: str = 'adversario') -> Optional[Tuple[str, float]]:
+        """
+        Devuelve (movimiento, utilidad) si el tablero está en el libro y sus entradas se calcularon
+        con al menos profundidad_minima, con el motor y el modelo de los hoyos de la búsqueda que lo
+        consulta; None en caso contrario.
+        """
+        if self.entradas is None:
+            self.cargar()
+        if (tablero.tamano, tablero.num_hoyos, tablero.num_wumpus) != (self.tamano, self.num_hoyos, self.num_wumpus) \
+                or self.profundidad < profundidad_minima or (motor, modelo_hoyos) != (self.motor, self.modelo_hoyos):
+            return None
+        entrada = self._buscar(tablero.hash)
+        if entrada is None:
+            self.fallos += 1
+        else:
+            self.aciertos += 1
+        return entrada
+
+    def __len__(self) -> int:
+        if self.entradas is None:
+            self.cargar()
+        return len(self.claves) if self.tabla is not None else len(self.entradas)
+
+    def estadisticas(self) -> dict:
+        consultas = self.aciertos + self.fallos
+        return {
+            'entradas': len(self) if self.entradas is not None else 0,
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+        }
+
+
+_LIBROS_APERTURAS = {}
+
+
+def obtener_libro_aperturas(ruta: str) -> LibroAperturas:
+    """
+    Devuelve el libro de aperturas de un fichero, compartido por todas las partidas del proceso.
+    """
+    if ruta not in _LIBROS_APERTURAS:
+        _LIBROS_APERTURAS[ruta] = LibroAperturas(ruta)
+    return _LIBROS_APERTURAS[ruta]
+
+
+# ================================
+# Tablas finales (análisis retrógrado)
+# ================================
+
+MAGIA_TABLAS_FINALES = b'WTBF'
+VERSION_TABLAS_FINALES = 3
+UTILIDAD_VICTORIA = 1 / (0 + 1e-2)  # Utilidad al recoger el oro sin casillas penalizadas alrededor
+
+
+class TablasFinales:
+    """
+    Valor exacto de cada posición de un tablero pequeño con un Wumpus (victoria o derrota del
+    agente en k jugadas con juego perfecto de ambos bandos, o 0 si nadie puede forzar el final),
+    calculado por análisis retrógrado con tablas_finales.py. El fichero es una TablaMapeada que
+    se lee byte a byte, sin cargarlo en memoria; la primera consulta lo abre.
+    - Tras la cabecera va el índice de bloques por par (Wumpus, oro) (int32, -1 si no está).
+    - Hay un bloque por par (Wumpus, oro) y, dentro de él, un byte con signo por posición:
+      ((turno * casillas + agente) * 5 + hueco_previo) * combinaciones + combinacion_hoyos,
+      con turno 0 para el agente y 1 para los hoyos, hueco_previo el índice de la posición anterior
+      entre los vecinos del agente (4 si no hay) y las combinaciones de hoyos en orden colexicográfico.
+    - Las reglas son las de los perceptos exactos (TableroBits): un hoyo no entra en el agente, el
+      Wumpus, el oro ni otro hoyo. Si ningún hoyo puede moverse, la posición queda sin resolver (0),
+      como en miniMaxEnSitio, que la trata como una hoja valorada con utility(). restore_tile puede dejar en la
+      matriz de Tablerowumpus marcas de oro sobrantes que también bloquean a los hoyos; los tableros con
+      esas marcas no se consultan.
+    """
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        self.mapa = None  # TablaMapeada del fichero; None hasta la primera consulta
+        self.aciertos = 0
+        self.fallos = 0
+
+    def abrir(self):
+        """
+        Abre el fichero. Lanza ValueError si no son tablas finales de la versión y reglas actuales.
+        """
+        tabla = TablaMapeada(self.ruta, MAGIA_TABLAS_FINALES, VERSION_TABLAS_FINALES)
+        self.tamano, self.num_hoyos, self.num_wumpus = tabla.tamano, tabla.num_hoyos, tabla.num_wumpus
+        casillas = self.tamano * self.tamano
+        self.combinaciones = math.comb(casillas, self.num_hoyos)
+        self.tamano_bloque = 2 * casillas * 5 * self.combinaciones
+        self.bloques = tabla.vista(0, casillas * casillas, 'i')
+        num_bloques = sum(1 for bloque in self.bloques if bloque >= 0)
+        self.valores = tabla.vista(4 * casillas * casillas, num_bloques * self.tamano_bloque, 'b')
+        # binomiales[i][x] = C(x, i + 1), para el rango colexicográfico de los hoyos
+        self.binomiales = [[math.comb(x, i + 1) for x in range(casillas)] for i in range(self.num_hoyos)]
+        self.vecinos = obtener_geometria(self.tamano).vecinos
+        self.mapa = tabla
+
+    def cerrar(self):
+        if self.mapa is not None:
+            self.mapa.cerrar()
+            self.mapa = None
+
+    def __deepcopy__(self, memo) -> 'TablasFinales':
+        return self
+
+    def __reduce__(self):
+        return (obtener_tablas_finales, (self.ruta,))
+
+    def admite(self, tablero: Tablerowumpus) -> bool:
+        """
+        Si el tablero tiene el tamaño, los hoyos y los Wumpus de las tablas (abre el fichero si hace falta).
+        """
+        if self.mapa is None:
+            self.abrir()
+        return self.mapa.admite(tablero.tamano, len(tablero.pos_hoyos), len(tablero.posiciones_wumpus))
+
+    def _bloque(self, tablero: Tablerowumpus) -> int:
+        """
+        Bloque del par (Wumpus, oro) de un tablero admitido, o -1 si el par no está en las tablas o la
+        matriz de Tablerowumpus tiene marcas de oro sobrantes. Tras ganar, el oro es la casilla del agente.
+        """
+        tamano = self.tamano
+        if tablero.game_result == 'win':
+            oro = tablero.pos_agente
+        elif isinstance(tablero, Tablerowumpus) and tablero.marcas_oro != 1:
+            return -1
+        else:
+            oro = tablero.pos_oro
+        wumpus = tablero.pos_wumpus
+        return self.bloques[(wumpus[0] * tamano + wumpus[1]) * tamano * tamano + oro[0] * tamano + oro[1]]
+
+    def sondear(self, tablero: Tablerowumpus, player: int) -> Optional[int]:
+        """
+        Jugadas hasta el final con juego perfecto, con el turno de 'player' (1: Agente, 0: Hoyos):
+        +k si gana el agente, -k si pierde, 0 si nadie puede forzarlo. None si el tablero no está
+        en las tablas (otro tamaño o número de hoyos, otro par Wumpus/oro, marcas de oro sobrantes
+        o partida terminada).
+        """
+        if tablero.isGameOver() or not self.admite(tablero):
+            return None
+        bloque = self._bloque(tablero)
+        if bloque < 0:
+            self.fallos += 1
+            return None
+        self.aciertos += 1
+
+        tamano = self.tamano
+        casillas = tamano * tamano
+        agente = tablero.pos_agente[0] * tamano + tablero.pos_agente[1]
+        if tablero.previous_pos is None:
+            hueco_previo = 4
+        else:
+            hueco_previo = self.vecinos[agente].index(tablero.previous_pos[0] * tamano + tablero.previous_pos[1])
+        combinacion = 0
+        for i, hoyo in enumerate(sorted(fila * tamano + col for fila, col in tablero.pos_hoyos)):
+            combinacion += self.binomiales[i][hoyo]
+        turno = 0 if player == 1 else 1
+        return self.valores[bloque * self.tamano_bloque
+                            + ((turno * casillas + agente) * 5 + hueco_previo) * self.combinaciones + combinacion]
+
+    def valorar(self, tablero: Tablerowumpus, player: int, currentLevel: int) -> Optional[float]:
+        """
+        Valor para miniMax de una posición con final forzado: ganar k jugadas más abajo vale lo mismo
+        que recoger el oro sin penalizaciones en ese nivel, y perder lo mismo en negativo (cuanto más
+        tarde, mejor para el agente). Las partidas terminadas de un tablero de las tablas (con el bloque
+        de su par Wumpus/oro, como en sondear) se valoran en esa misma escala con k = 0, en lugar de con
+        utility(), que apenas castiga caer en un hoyo o en el Wumpus: así perder ya es peor que perder
+        más adelante. None si no hay final forzado o el tablero no está en las tablas.
+        """
+        if tablero.isGameOver():
+            if not self.admite(tablero) or self._bloque(tablero) < 0:
+                return None
+            jugadas = 0
+            victoria = tablero.game_result == 'win'
+        else:
+            jugadas = self.sondear(tablero, player)
+            if not jugadas:
+                return None
+            victoria = jugadas > 0
+        if victoria:
+            return UTILIDAD_VICTORIA - 0.1 * (currentLevel + jugadas)
+        return -(UTILIDAD_VICTORIA - 0.1 * (currentLevel - jugadas))
+
+    def estadisticas(self) -> dict:
+        consultas = self.aciertos + self.fallos
+        return {
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+        }
+
+
+_TABLAS_FINALES = {}
+
+
+def obtener_tablas_finales(ruta: str) -> TablasFinales:
+    """
+    Devuelve las tablas finales de un fichero, compartidas por todas las búsquedas del proceso.
+    """
+    if ruta not in _TABLAS_FINALES:
+        _TABLAS_FINALES[ruta] = TablasFinales(ruta)
+    return _TABLAS_FINALES[ruta]
+
+
+# ================================
+# Ordenación de movimientos para la poda alfa-beta
+# ================================
+
+class OrdenadorMovimientos:
+    """
+    Ordena los movimientos de cada nodo para que la poda alfa-beta corte antes:
+    primero las jugadas asesinas (killer moves) del mismo nivel, después las de mayor
+    puntuación histórica (history heuristic) y, a igualdad, una ordenación estática barata
+    (el agente hacia el oro, los hoyos hacia el agente).
+    También cuenta nodos y cortes para medir el factor de ramificación efectivo.
+    """
+
+    ASESINAS_POR_NIVEL = 2
+
+    def __init__(self):
+        self.asesinas = {}   # nivel -> lista de movimientos que produjeron un corte
+        self.historia = {}   # (origen, destino) -> puntuación acumulada
+        self.nodos = 0
+        self.cortes = 0
+        self.cortes_primer_movimiento = 0
+
+    def nueva_busqueda(self):
+        """
+        Prepara una nueva búsqueda: las jugadas asesinas dependen del nivel respecto a la raíz,
+        así que se descartan, y la historia se reduce a la mitad para que pese menos.
+        """
+        self.asesinas = {}
+        self.historia = {clave: puntos // 2 for clave, puntos in self.historia.items() if puntos > 1}
+
+    def _origen_destino(self, state: Tablerowumpus, move: Movimiento) -> tuple:
+        if isinstance(move, str):
+            row, col = state.pos_agente
+            delta_row, delta_col = DELTAS_MOVIMIENTO[move]
+            return ((row, col), (row + delta_row, col + delta_col))
+        hoyo_index, new_row, new_col = move
+        return (state.pos_hoyos[hoyo_index], (new_row, new_col))
+
+    def ordenar(self, state: Tablerowumpus, moves: list, player: int, nivel: int) -> list:
+        """
+        Devuelve los movimientos ordenados del más al menos prometedor.
+        """
+        asesinas = self.asesinas.get(nivel, ())
+        if player == 1:
+            objetivo = state.pos_oro  # El agente se acerca al oro
+        else:
+            objetivo = state.pos_agente  # Los hoyos se acercan al agente
+
+        def prioridad(move):
+            origen, destino = self._origen_destino(state, move)
+            distancia = abs(destino[0] - objetivo[0]) + abs(destino[1] - objetivo[1]) if objetivo else 0
+            return (move not in asesinas, -self.historia.get((origen, destino), 0), distancia)
+
+        return sorted(moves, key=prioridad)
+
+    def registrar_corte(self, state: Tablerowumpus, move: Movimiento, nivel: int, profundidad: int, indice: int):
+        """
+        Registra que 'move' produjo un corte en un nodo del nivel dado (con el tablero ya restaurado).
+        """
+        self.cortes += 1
+        if indice == 0:
+            self.cortes_primer_movimiento += 1
+
+        asesinas = self.asesinas.setdefault(nivel, [])
+        if move not in asesinas:
+            asesinas.insert(0, move)
+            del asesinas[self.ASESINAS_POR_NIVEL:]
+
+        clave = self._origen_destino(state, move)
+        self.historia[clave] = self.historia.get(clave, 0) + profundidad * profundidad
+
+    def estadisticas(self) -> dict:
+        """
+        Devuelve los contadores de nodos y cortes.
+        """
+        return {
+            'nodos': self.nodos,
+            'cortes': self.cortes,
+            'cortes_primer_movimiento': self.cortes_primer_movimiento,
+            'tasa_corte_primer_movimiento': self.cortes_primer_movimiento / self.cortes if self.cortes else 0.0,
+        }
+
+    def factor_ramificacion_efectivo(self, profundidad: int) -> float:
+        """
+        Factor de ramificación efectivo b* tal que b* ** profundidad = nodos visitados.
+        """
+        if profundidad <= 0 or self.nodos <= 1:
+            return 0.0
+        return self.nodos ** (1 / profundidad)
+
+
+# ================================
+# Control del tiempo de búsqueda
+# ================================
+
+class BusquedaInterrumpida(Exception):
+    """
+    Se lanza dentro de la búsqueda cuando se agota el presupuesto de tiempo.
+    """
+
+
+class ControlBusqueda:
+    """
+    Cuenta los nodos visitados y comprueba el tiempo límite y la cancelación de una búsqueda.
+    El reloj solo se consulta cada INTERVALO_RELOJ nodos para no penalizar la búsqueda.
+    Los contadores pueden leerse desde otro hilo para mostrar el progreso.
+    """
+
+    INTERVALO_RELOJ = 64
+
+    def __init__(self, presupuesto_ms: Optional[float] = None, cancelar: Optional[threading.Event] = None):
+        self.inicio = time.perf_counter()
+        self.limite = self.inicio + presupuesto_ms / 1000 if presupuesto_ms is not None else None
+        self.cancelar = cancelar
+        self.nodos = 0
+        self.profundidad_completada = 0  # Última iteración completa de la profundización iterativa
+
+    def verificar(self):
+        """
+        Registra un nodo y lanza BusquedaInterrumpida si se ha superado el tiempo límite
+        o se ha pedido cancelar la búsqueda.
+        """
+        self.nodos += 1
+        if self.nodos % self.INTERVALO_RELOJ == 0:
+            if self.cancelar is not None and self.cancelar.is_set():
+                raise BusquedaInterrumpida()
+            if self.limite is not None and time.perf_counter() >= self.limite:
+                raise BusquedaInterrumpida()
+
+    def restante(self) -> float:
+        """
+        Segundos que quedan hasta el límite (infinito si no hay límite).
+        """
+        if self.limite is None:
+            return math.inf
+        return self.limite - time.perf_counter()
+
+
+# ================================
+# Estadísticas de la búsqueda
+# ================================
+
+class EstadisticasBusqueda:
+    """
+    Recolector opcional de estadísticas que se pasa a miniMax / miniMaxEnSitio: nodos expandidos
+    por nivel, cortes alfa y beta, evaluaciones de hojas, profundidad máxima alcanzada y el tiempo
+    dedicado a copiar el tablero (o hacer/deshacer movimientos en la búsqueda en sitio),
+    a la utilidad y a la generación de movimientos.
+    Las operaciones cronometradas pasan por sus métodos para que la búsqueda sin recolector
+    no pague el coste de medir.
+    """
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.nodos_por_nivel = []    # nodos_por_nivel[nivel] = nodos visitados en ese nivel
+        self.cortes_alfa = 0         # Cortes en nodos Min (hoyos)
+        self.cortes_beta = 0         # Cortes en nodos Max (agente)
+        self.cortes_tabla = 0        # Nodos resueltos por la tabla de transposición
+        self.cortes_azar = 0         # Cortes Star1/Star2 en nodos de azar (expectimax)
+        self.hojas = 0
+        self.profundidad_maxima = 0
+        self.tiempo_copia = 0.0
+        self.tiempo_utilidad = 0.0
+        self.tiempo_movimientos = 0.0
+
+    def registrar_nodo(self, nivel: int):
+        if nivel >= len(self.nodos_por_nivel):
+            self.nodos_por_nivel.extend([0] * (nivel + 1 - len(self.nodos_por_nivel)))
+        self.nodos_por_nivel[nivel] += 1
+        if nivel > self.profundidad_maxima:
+            self.profundidad_maxima = nivel
+
+    def evaluar(self, state: Tablerowumpus, nivel: int) -> float:
+        """
+        Utilidad de una hoja, cronometrada.
+        """
+        inicio = time.perf_counter()
+        valor = state.utility(nivel)
+        self.tiempo_utilidad += time.perf_counter() - inicio
+        self.hojas += 1
+        return valor
+
+    def generar_movimientos(self, state: Tablerowumpus, player: int) -> list:
+        inicio = time.perf_counter()
+        if player == 1:
+            moves = state.getAvailableMovesForMax(*state.pos_agente)
+        else:
+            moves = state.getAvailableMovesForMin()
+        self.tiempo_movimientos += time.perf_counter() - inicio
+        return moves
+
+    def copiar(self, state: Tablerowumpus) -> Tablerowumpus:
+        inicio = time.perf_counter()
+        copia = deepcopy(state)
+        self.tiempo_copia += time.perf_counter() - inicio
+        return copia
+
+    def aplicar(self, state: Tablerowumpus, move: Movimiento) -> tuple:
+        inicio = time.perf_counter()
+        registro = state.aplicar_movimiento(move)
+        self.tiempo_copia += time.perf_counter() - inicio
+        return registro
+
+    def deshacer(self, state: Tablerowumpus, registro: tuple):
+        inicio = time.perf_counter()
+        state.deshacer_movimiento(registro)
+        self.tiempo_copia += time.perf_counter() - inicio
+
+    def como_dict(self) -> dict:
+        return {
+            'nodos': sum(self.nodos_por_nivel),
+            'nodos_por_nivel': list(self.nodos_por_nivel),
+            'hojas': self.hojas,
+            'cortes_alfa': self.cortes_alfa,
+            'cortes_beta': self.cortes_beta,
+            'cortes_tabla': self.cortes_tabla,
+            'cortes_azar': self.cortes_azar,
+            'profundidad_maxima': self.profundidad_maxima,
+            'tiempo_copia_s': self.tiempo_copia,
+            'tiempo_utilidad_s': self.tiempo_utilidad,
+            'tiempo_movimientos_s': self.tiempo_movimientos,
+            'tiempo_total_s': time.perf_counter() - self.inicio,
+        }
+
 
 # ================================
 # Implementación de la función MiniMax con poda alfa-beta
 # ================================
 
-def miniMax(state: Tablerowumpus, currentLevel: int, maxLevel: int, player: int, alpha: float, beta: float) -> Tuple[
-    Tablerowumpus, float]:
+def miniMax(state: Tablerowumpus, currentLevel: int, maxLevel: int, player: int, alpha: float, beta: float,
+            estadisticas: Optional[EstadisticasBusqueda] = None) -> Tuple[Tablerowumpus, float]:
     """
     Implementa el algoritmo MiniMax con poda alfa-beta para decidir el mejor movimiento.
+    Si se pasa un recolector de estadísticas, se registran en él los nodos, cortes y tiempos.
     """
+    if estadisticas is not None:
+        estadisticas.registrar_nodo(currentLevel)
+
     # Verificar si el juego ha terminado o si se alcanzó la profundidad máxima
     if not state.moveCanBeMade(player) or currentLevel == maxLevel or state.isGameOver():
+        if estadisticas is not None:
+            return (state, estadisticas.evaluar(state, currentLevel))
         return (state, state.utility(currentLevel))
 
     # Inicializar variables
@@ -556,11 +1691,14 @@ def miniMax(state: Tablerowumpus, currentLevel: int, maxLevel: int, player: int,
 
     if player == 1:  # Max (Agente)
         maxValue = -math.inf
-        moves = state.getAvailableMovesForMax(*state.pos_agente)
+        if estadisticas is not None:
+            moves = estadisticas.generar_movimientos(state, player)
+        else:
+            moves = state.getAvailableMovesForMax(*state.pos_agente)
 
         for move in moves:
             # Crear una copia del estado actual
-            new_state = deepcopy(state)
+            new_state = deepcopy(state) if estadisticas is None else estadisticas.copiar(state)
             row, col = new_state.pos_agente
             # Realizar el movimiento correspondiente
             if move == MOVE_UP:
@@ -573,7 +1711,7 @@ def miniMax(state: Tablerowumpus, currentLevel: int, maxLevel: int, player: int,
                 new_state.right(row, col)
 
             # Llamada recursiva al siguiente nivel
-            _, value = miniMax(new_state, currentLevel + 1, maxLevel, 0, alpha, beta)
+            _, value = miniMax(new_state, currentLevel + 1, maxLevel, 0, alpha, beta, estadisticas)
 
             # Actualizar el valor máximo y el mejor estado
             if value > maxValue:
@@ -583,20 +1721,25 @@ def miniMax(state: Tablerowumpus, currentLevel: int, maxLevel: int, player: int,
             # Actualizar alfa y verificar poda
             alpha = max(alpha, maxValue)
             if beta <= alpha:
+                if estadisticas is not None:
+                    estadisticas.cortes_beta += 1
                 break  # Poda beta
 
         return (bestState, maxValue)
     else:  # Min (Hoyos)
         minValue = math.inf
-        moves = state.getAvailableMovesForMin()
+        if estadisticas is not None:
+            moves = estadisticas.generar_movimientos(state, player)
+        else:
+            moves = state.getAvailableMovesForMin()
 
         for move in moves:
             hoyo_index, new_row, new_col = move
-            new_state = deepcopy(state)
+            new_state = deepcopy(state) if estadisticas is None else estadisticas.copiar(state)
             new_state.mover_hoyo(hoyo_index, new_row, new_col)
 
             # Llamada recursiva al siguiente nivel
-            _, value = miniMax(new_state, currentLevel + 1, maxLevel, 1, alpha, beta)
+            _, value = miniMax(new_state, currentLevel + 1, maxLevel, 1, alpha, beta, estadisticas)
 
             # Actualizar el valor mínimo y el mejor estado
             if value < minValue:
@@ -606,15 +1749,871 @@ def miniMax(state: Tablerowumpus, currentLevel: int, maxLevel: int, player: int,
             # Actualizar beta y verificar poda
             beta = min(beta, minValue)
             if beta <= alpha:
+                if estadisticas is not None:
+                    estadisticas.cortes_alfa += 1
                 break  # Poda alfa
 
         # Si no hay movimientos posibles para los hoyos, retornar el estado actual
         if bestState is None:
+            if estadisticas is not None:
+                return (state, estadisticas.evaluar(state, currentLevel))
             return (state, state.utility(currentLevel))
 
         return (bestState, minValue)
 
 
+def miniMaxEnSitio(state: Tablerowumpus, currentLevel: int, maxLevel: int, player: int, alpha: float,
+                   beta: float, tabla: Optional[TablaTransposicion] = None,
+                   control: Optional[ControlBusqueda] = None,
+                   primerMovimiento: Optional[Movimiento] = None,
+                   ordenador: Optional[OrdenadorMovimientos] = None,
+                   estadisticas: Optional[EstadisticasBusqueda] = None,
+                   finales: Optional[TablasFinales] = None) -> Tuple[Optional[Movimiento], float]:
+    """
+    Variante de miniMax que recorre un único tablero mutable: cada movimiento se aplica
+    en sitio y se deshace al volver de la recursión, en lugar de copiar el estado en cada nodo.
+    Si se pasa una tabla de transposición, se consulta antes de expandir cada nodo.
+    Si se pasa un control, la búsqueda puede interrumpirse con BusquedaInterrumpida
+    (el tablero queda restaurado). primerMovimiento se prueba antes que el resto en este nodo.
+    Si se pasa un ordenador, los movimientos se ordenan con él y se le notifican los cortes.
+    Si se pasa un recolector de estadísticas, se registran en él los nodos, cortes y tiempos.
+    Si se pasan tablas finales, los nodos por debajo de la raíz con final forzado toman su valor
+    exacto sin expandirse.
+    Devuelve (mejor_movimiento, valor); el movimiento es None en los nodos hoja.
+    """
+    if control is not None:
+        control.verificar()
+    if ordenador is not None:
+        ordenador.nodos += 1
+    if estadisticas is not None:
+        estadisticas.registrar_nodo(currentLevel)
+
+    # Consultar las tablas finales (en la raíz hace falta un movimiento, así que se busca)
+    if finales is not None and currentLevel > 0:
+        valorFinal = finales.valorar(state, player, currentLevel)
+        if valorFinal is not None:
+            return (None, valorFinal)
+
+    # Verificar si el juego ha terminado o si se alcanzó la profundidad máxima
+    if currentLevel == maxLevel or state.isGameOver():
+        if estadisticas is not None:
+            return (None, estadisticas.evaluar(state, currentLevel))
+        return (None, state.utility(currentLevel))
+
+    if estadisticas is not None:
+        moves = estadisticas.generar_movimientos(state, player)
+    elif player == 1:  # Max (Agente)
+        moves = state.getAvailableMovesForMax(*state.pos_agente)
+    else:  # Min (Hoyos)
+        moves = state.getAvailableMovesForMin()
+    if not moves:
+        if estadisticas is not None:
+            return (None, estadisticas.evaluar(state, currentLevel))
+        return (None, state.utility(currentLevel))
+
+    # Consultar la tabla de transposición
+    if tabla is not None:
+        clave = state.hash if player == 1 else state.hash ^ state.zobrist.turno_min
+        profundidad = maxLevel - currentLevel
+        entrada = tabla.consultar(clave)
+        if entrada is not None:
+            _, nivel, profundidad_entrada, valor, tipo, movimientoTabla = entrada
+            if nivel == currentLevel and profundidad_entrada >= profundidad:
+                if tipo == EXACTO:
+                    if estadisticas is not None:
+                        estadisticas.cortes_tabla += 1
+                    return (movimientoTabla, valor)
+                if tipo == COTA_INFERIOR:
+                    alpha = max(alpha, valor)
+                else:
+                    beta = min(beta, valor)
+                if beta <= alpha:
+                    if estadisticas is not None:
+                        estadisticas.cortes_tabla += 1
+                    return (movimientoTabla, valor)
+            # Probar primero el mejor movimiento conocido para esta posición
+            if primerMovimiento is None:
+                primerMovimiento = movimientoTabla
+        alphaVentana, betaVentana = alpha, beta
+
+    if ordenador is not None:
+        moves = ordenador.ordenar(state, moves, player, currentLevel)
+    if primerMovimiento is not None and primerMovimiento in moves and moves[0] != primerMovimiento:
+        moves.remove(primerMovimiento)
+        moves.insert(0, primerMovimiento)
+
+    bestMove = None
+
+    if player == 1:  # Max (Agente)
+        bestValue = -math.inf
+        for indice, move in enumerate(moves):
+            if estadisticas is None:
+                registro = state.aplicar_movimiento_agente(move)
+            else:
+                registro = estadisticas.aplicar(state, move)
+            try:
+                _, value = miniMaxEnSitio(state, currentLevel + 1, maxLevel, 0, alpha, beta, tabla, control,
+                                          None, ordenador, estadisticas, finales)
+            finally:
+                if estadisticas is None:
+                    state.deshacer_movimiento(registro)
+                else:
+                    estadisticas.deshacer(state, registro)
+
+            if value > bestValue:
+                bestValue = value
+                bestMove = move
+
+            alpha = max(alpha, bestValue)
+            if beta <= alpha:
+                if ordenador is not None:
+                    ordenador.registrar_corte(state, move, currentLevel, maxLevel - currentLevel, indice)
+                if estadisticas is not None:
+                    estadisticas.cortes_beta += 1
+                break  # Poda beta
+    else:  # Min (Hoyos)
+        bestValue = math.inf
+        for indice, move in enumerate(moves):
+            if estadisticas is None:
+                registro = state.aplicar_movimiento_hoyo(*move)
+            else:
+                registro = estadisticas.aplicar(state, move)
+            try:
+                _, value = miniMaxEnSitio(state, currentLevel + 1, maxLevel, 1, alpha, beta, tabla, control,
+                                          None, ordenador, estadisticas, finales)
+            finally:
+                if estadisticas is None:
+                    state.deshacer_movimiento(registro)
+                else:
+                    estadisticas.deshacer(state, registro)
+
+            if value < bestValue:
+                bestValue = value
+                bestMove = move
+
+            beta = min(beta, bestValue)
+            if beta <= alpha:
+                if ordenador is not None:
+                    ordenador.registrar_corte(state, move, currentLevel, maxLevel - currentLevel, indice)
+                if estadisticas is not None:
+                    estadisticas.cortes_alfa += 1
+                break  # Poda alfa
+
+    # Guardar el resultado con su tipo de cota respecto a la ventana de búsqueda
+    if tabla is not None:
+        if bestValue <= alphaVentana:
+            tipo = COTA_SUPERIOR
+        elif bestValue >= betaVentana:
+            tipo = COTA_INFERIOR
+        else:
+            tipo = EXACTO
+        tabla.guardar(clave, currentLevel, profundidad, bestValue, tipo, bestMove)
+
+    return (bestMove, bestValue)
+
+
+# ================================
+# Expectimax con poda Star1/Star2 (hoyos aleatorios)
+# ================================
+
+MODELOS_HOYOS = ('adversario', 'aleatorio')
+
+
+def cotasUtilidad(state: Tablerowumpus, currentLevel: int, maxLevel: int) -> Tuple[float, float]:
+    """
+    Cotas (inferior, superior) de utility() en las hojas bajo un nodo de los hoyos, necesarias para
+    podar los nodos de azar. Dependen de las jugadas que le quedan al agente hasta maxLevel:
+    - La inversa de la distancia solo llega a la del oro recogido si el agente puede alcanzarlo; si no,
+      está acotada por la distancia euclídea mínima a la que puede quedar (al menos Manhattan / sqrt(2)).
+    - Las casillas con oro solo aparecen junto a otras con oro (restore_tile deja marcas al lado), así
+      que si el agente no puede acercarse a menos de 2 de ninguna no le penalizan.
+    """
+    evaluacion = state.evaluacion
+    tamano = state.tamano
+    jugadas = (maxLevel - currentLevel) // 2  # Jugadas del agente que quedan hasta maxLevel
+    fila, col = state.pos_agente
+
+    celdas = state.celdas
+    distanciaOro = math.inf  # Distancia Manhattan del agente a la casilla con oro más cercana
+    for indice in range(len(celdas)):
+        if celdas[indice] in CASILLAS_ORO:
+            distanciaOro = min(distanciaOro, abs(indice // tamano - fila) + abs(indice % tamano - col))
+    if distanciaOro - jugadas >= 2:
+        inferior = -evaluacion.penalizacion_maxima_sin_oro - 0.1 * maxLevel
+    else:
+        inferior = -evaluacion.penalizacion_maxima - 0.1 * maxLevel
+
+    superior = evaluacion.inversa_sin_oro - 0.1 * (currentLevel + 1)
+    if state.pos_oro is not None:
+        distancia = abs(fila - state.pos_oro[0]) + abs(col - state.pos_oro[1])
+        if distancia > jugadas:
+            superior = 1 / (max(1.0, (distancia - jugadas) / math.sqrt(2)) + 1e-2) - 0.1 * (currentLevel + 1)
+    return (inferior, superior)
+
+
+def expectimaxEnSitio(state: Tablerowumpus, currentLevel: int, maxLevel: int, player: int, alpha: float,
+                      beta: float, control: Optional[ControlBusqueda] = None,
+                      primerMovimiento: Optional[Movimiento] = None,
+                      estadisticas: Optional[EstadisticasBusqueda] = None,
+                      sondeo: bool = False) -> Tuple[Optional[Movimiento], float]:
+    """
+    Variante de miniMaxEnSitio en la que los hoyos no son un adversario sino nodos de azar: el valor
+    de su turno es la media de sus movimientos, que en la partida se eligen con rng.choice.
+    Los nodos de azar se podan con Star1 (la media ya no puede salir de la ventana aunque los hijos
+    restantes valgan lo mínimo o lo máximo de cotasUtilidad) y, con sondeo, con Star2: antes se busca
+    solo el primer movimiento del agente en cada hijo, lo que da una cota inferior de cada uno
+    (con las cotas de la utilidad, amplias frente a los valores habituales, rara vez compensa).
+    Los valores fuera de la ventana (alpha, beta) son cotas, como en miniMaxEnSitio.
+    Devuelve (mejor_movimiento, valor); el movimiento es None en los nodos hoja y de azar.
+    """
+    if control is not None:
+        control.verificar()
+    if estadisticas is not None:
+        estadisticas.registrar_nodo(currentLevel)
+
+    if currentLevel == maxLevel or state.isGameOver():
+        if estadisticas is not None:
+            return (None, estadisticas.evaluar(state, currentLevel))
+        return (None, state.utility(currentLevel))
+
+    if estadisticas is not None:
+        moves = estadisticas.generar_movimientos(state, player)
+    elif player == 1:
+        moves = state.getAvailableMovesForMax(*state.pos_agente)
+    else:
+        moves = state.getAvailableMovesForMin()
+    if not moves:
+        if estadisticas is not None:
+            return (None, estadisticas.evaluar(state, currentLevel))
+        return (None, state.utility(currentLevel))
+
+    if player == 1:  # Max (Agente)
+        if primerMovimiento is not None and primerMovimiento in moves and moves[0] != primerMovimiento:
+            moves.remove(primerMovimiento)
+            moves.insert(0, primerMovimiento)
+        bestMove, bestValue = None, -math.inf
+        for move in moves:
+            registro = state.aplicar_movimiento_agente(move)
+            try:
+                _, value = expectimaxEnSitio(state, currentLevel + 1, maxLevel, 0, alpha, beta, control, None,
+                                             estadisticas, sondeo)
+            finally:
+                state.deshacer_movimiento(registro)
+            if value > bestValue:
+                bestValue, bestMove = value, move
+            alpha = max(alpha, bestValue)
+            if beta <= alpha:
+                if estadisticas is not None:
+                    estadisticas.cortes_beta += 1
+                break  # Poda beta
+        return (bestMove, bestValue)
+
+    # Nodo de azar (Hoyos): todos sus movimientos son equiprobables
+    inferior, superior = cotasUtilidad(state, currentLevel, maxLevel)
+    n = len(moves)
+    inferiores = [inferior] * n  # Cota inferior conocida de cada hijo aún sin buscar
+
+    if sondeo and currentLevel + 1 < maxLevel:
+        # Star2: el valor de cada hijo (turno del agente) es al menos el de su primer movimiento
+        sumaSondeos = 0.0
+        for i, move in enumerate(moves):
+            registro = state.aplicar_movimiento_hoyo(*move)
+            try:
+                movimientosAgente = [] if state.isGameOver() else state.getAvailableMovesForMax(*state.pos_agente)
+                if not movimientosAgente:
+                    value = state.utility(currentLevel + 1)
+                else:
+                    limite = n * beta - sumaSondeos - (n - i - 1) * inferior
+                    registroAgente = state.aplicar_movimiento_agente(movimientosAgente[0])
+                    try:
+                        _, value = expectimaxEnSitio(state, currentLevel + 2, maxLevel, 0, inferior,
+                                                     min(limite, superior), control, None, estadisticas,
+                                                     sondeo)
+                    finally:
+                        state.deshacer_movimiento(registroAgente)
+            finally:
+                state.deshacer_movimiento(registro)
+            inferiores[i] = value
+            sumaSondeos += value
+            if sumaSondeos + (n - i - 1) * inferior >= n * beta:
+                if estadisticas is not None:
+                    estadisticas.cortes_azar += 1
+                return (None, (sumaSondeos + (n - i - 1) * inferior) / n)
+
+    # Star1: buscar cada hijo con la ventana que aún puede mover la media dentro de (alpha, beta)
+    suma = 0.0
+    restoInferior = sum(inferiores)
+    for i, move in enumerate(moves):
+        restoInferior -= inferiores[i]
+        restantes = n - i - 1
+        limiteInferior = n * alpha - suma - restantes * superior
+        limiteSuperior = n * beta - suma - restoInferior
+        registro = state.aplicar_movimiento_hoyo(*move)
+        try:
+            _, value = expectimaxEnSitio(state, currentLevel + 1, maxLevel, 1, max(limiteInferior, inferior),
+                                         min(limiteSuperior, superior), control, None, estadisticas, sondeo)
+        finally:
+            state.deshacer_movimiento(registro)
+        suma += value
+        if value <= limiteInferior:
+            if estadisticas is not None:
+                estadisticas.cortes_azar += 1
+            return (None, (suma + restantes * superior) / n)  # Cota superior, como mucho alpha
+        if value >= limiteSuperior:
+            if estadisticas is not None:
+                estadisticas.cortes_azar += 1
+            return (None, (suma + restoInferior) / n)  # Cota inferior, al menos beta
+    return (None, suma / n)
+
+
+def busquedaIterativa(state: Tablerowumpus, presupuesto_ms: float, profundidadMaxima: int = 64,
+                      tabla: Optional[TablaTransposicion] = None,
+                      ordenador: Optional[OrdenadorMovimientos] = None,
+                      control: Optional[ControlBusqueda] = None,
+                      estadisticas: Optional[EstadisticasBusqueda] = None,
+                      finales: Optional[TablasFinales] = None,
+                      modelo_hoyos: str = 'adversario') -> Tuple[Optional[Movimiento], float, int]:
+    """
+    Profundización iterativa con límite de tiempo: ejecuta miniMaxEnSitio a profundidad 1, 2, 3...
+    probando primero el mejor movimiento de la iteración anterior, y devuelve el resultado de la
+    última iteración completa cuando se agota el presupuesto (o se cancela el control recibido).
+    Con modelo_hoyos='aleatorio' cada iteración es un expectimaxEnSitio (sin tabla ni tablas finales).
+    Devuelve (mejor_movimiento, valor, profundidad_completada).
+    """
+    if control is None:
+        control = ControlBusqueda(presupuesto_ms)
+    bestMove, bestValue, profundidadCompletada = None, state.utility(0), 0
+
+    for profundidad in range(1, profundidadMaxima + 1):
+        inicioIteracion = time.perf_counter()
+        try:
+            # La primera iteración siempre se completa para tener al menos un movimiento
+            if modelo_hoyos == 'aleatorio':
+                move, value = expectimaxEnSitio(state, 0, profundidad, 1, -math.inf, math.inf,
+                                                control if profundidad > 1 else None, bestMove, estadisticas)
+            else:
+                move, value = miniMaxEnSitio(state, 0, profundidad, 1, -math.inf, math.inf, tabla,
+                                             control if profundidad > 1 else None, bestMove, ordenador, estadisticas,
+                                             finales)
+        except BusquedaInterrumpida:
+            break
+        bestMove, bestValue, profundidadCompletada = move, value, profundidad
+        control.profundidad_completada = profundidad
+
+        if move is None:
+            break  # El juego ha terminado o el agente no tiene movimientos
+        # La siguiente iteración tardará al menos lo mismo que esta: no empezarla si no cabe
+        if control.restante() < time.perf_counter() - inicioIteracion:
+            break
+
+    return (bestMove, bestValue, profundidadCompletada)
+
+
+# ================================
+# Búsqueda Monte Carlo en árbol (MCTS)
+# ================================
+
+ROLLOUTS_MCTS = ('aleatorio', 'heuristico')
+EPSILON_ROLLOUT = 0.1  # Probabilidad de que el agente juegue al azar en los rollouts heurísticos
+
+
+class NodoMCTS:
+    """
+    Nodo del árbol de MCTS. No guarda el tablero, solo el movimiento que lleva a él y la clave
+    Zobrist del estado (con la de turno de los hoyos si les toca), para reconocerlo al reutilizar
+    el árbol en el turno siguiente. 'recompensa' acumula las recompensas del agente (de 0 a 1).
+    Un movimiento None es un turno pasado por los hoyos cuando ninguno puede moverse.
+    """
+
+    __slots__ = ('movimiento', 'padre', 'jugador', 'clave', 'hijos', 'sin_probar', 'visitas', 'recompensa')
+
+    def __init__(self, movimiento: Optional[Movimiento], padre: Optional['NodoMCTS'], jugador: int, clave: int,
+                 sin_probar: list):
+        self.movimiento = movimiento
+        self.padre = padre
+        self.jugador = jugador        # Jugador al que le toca en este nodo (1: Agente, 0: Hoyos)
+        self.clave = clave
+        self.hijos = {}               # movimiento -> NodoMCTS
+        self.sin_probar = sin_probar  # Movimientos aún sin expandir, en orden aleatorio
+        self.visitas = 0
+        self.recompensa = 0.0
+
+
+class BusquedaMCTS:
+    """
+    Alternativa a miniMax para decidir el movimiento del agente: búsqueda Monte Carlo en árbol
+    con selección UCT (constante de exploración configurable) y rollouts aleatorios o heurísticos
+    (el agente elige casi siempre el movimiento de mayor utilidad y los hoyos mueven al azar, como
+    en la partida). Es un algoritmo de cualquier momento: con presupuesto_ms itera hasta agotar
+    el tiempo y sin él hace 'iteraciones' iteraciones.
+    - Los hoyos eligen en el árbol como un adversario (minimizan la recompensa del agente).
+    - Una simulación vale 1 si el agente gana, 0 si pierde y, si se corta tras profundidad_simulacion
+      jugadas, 0.5 + 0.5 * tanh(utilidad).
+    - El árbol se conserva entre turnos: la siguiente búsqueda parte del nodo de la posición a la que
+      han llevado el movimiento elegido y el de los hoyos, si se llegó a expandir.
+    """
+
+    def __init__(self, iteraciones: int = 2000, exploracion: float = math.sqrt(2), rollout: str = 'heuristico',
+                 profundidad_simulacion: int = 40, reutilizar: bool = True, semilla: Optional[int] = None):
+        if rollout not in ROLLOUTS_MCTS:
+            raise ValueError(f"Rollout desconocido: {rollout} (opciones: {', '.join(ROLLOUTS_MCTS)}).")
+        self.iteraciones = iteraciones
+        self.exploracion = exploracion
+        self.rollout = rollout
+        self.profundidad_simulacion = profundidad_simulacion
+        self.reutilizar = reutilizar
+        self.rng = random.Random(semilla)
+        self.raiz = None
+        self.iteraciones_realizadas = 0  # De la última búsqueda
+        self.visitas_reutilizadas = 0    # Visitas heredadas del turno anterior en la última búsqueda
+        self.profundidad_maxima = 0      # Del árbol en la última búsqueda
+
+    def reiniciar(self):
+        """
+        Descarta el árbol (al empezar una partida nueva).
+        """
+        self.raiz = None
+
+    def _movimientos(self, state: Tablerowumpus, jugador: int) -> list:
+        if state.isGameOver():
+            return []
+        if jugador == 1:
+            moves = state.getAvailableMovesForMax(*state.pos_agente)
+        else:
+            moves = state.getAvailableMovesForMin() or [None]
+        self.rng.shuffle(moves)
+        return moves
+
+    def _nodo(self, state: Tablerowumpus, movimiento: Optional[Movimiento], padre: Optional[NodoMCTS],
+              jugador: int) -> NodoMCTS:
+        clave = state.hash if jugador == 1 else state.hash ^ state.zobrist.turno_min
+        return NodoMCTS(movimiento, padre, jugador, clave, self._movimientos(state, jugador))
+
+    def _raiz_para(self, state: Tablerowumpus) -> NodoMCTS:
+        """
+        Nodo raíz para el tablero: el del árbol anterior que le corresponde, o uno nuevo.
+        """
+        if self.reutilizar and self.raiz is not None:
+            if self.raiz.clave == state.hash:
+                return self.raiz  # Misma posición (por ejemplo, tras cancelar una búsqueda)
+            for hijo in self.raiz.hijos.values():      # Movimientos del agente
+                for nieto in hijo.hijos.values():      # Movimientos de los hoyos
+                    if nieto.clave == state.hash:
+                        nieto.padre = None
+                        nieto.movimiento = None
+                        return nieto
+        return self._nodo(state, None, None, 1)
+
+    def _seleccionar(self, nodo: NodoMCTS) -> NodoMCTS:
+        """
+        Hijo con mayor cota UCT, desde el punto de vista del jugador del nodo.
+        """
+        logaritmo = math.log(nodo.visitas)
+        exploracion = self.exploracion
+        mejor, mejorValor = None, -math.inf
+        for hijo in nodo.hijos.values():
+            media = hijo.recompensa / hijo.visitas
+            if nodo.jugador == 0:
+                media = 1 - media
+            valor = media + exploracion * math.sqrt(logaritmo / hijo.visitas)
+            if valor > mejorValor:
+                mejor, mejorValor = hijo, valor
+        return mejor
+
+    def _movimiento_rollout(self, state: Tablerowumpus, moves: List[str]) -> str:
+        """
+        Movimiento del agente en un rollout heurístico: el que gana la partida o el de mayor utilidad,
+        y al azar con probabilidad EPSILON_ROLLOUT.
+        """
+        if self.rng.random() < EPSILON_ROLLOUT:
+            return self.rng.choice(moves)
+        mejor, mejorValor = moves[0], -math.inf
+        for move in moves:
+            registro = state.aplicar_movimiento_agente(move)
+            if state.isGameOver():
+                valor = math.inf if state.game_result == 'win' else -math.inf
+            else:
+                valor = state.utility(0)
+            state.deshacer_movimiento(registro)
+            if valor == math.inf:
+                return move
+            if valor > mejorValor:
+                mejor, mejorValor = move, valor
+        return mejor
+
+    def _simular(self, state: Tablerowumpus, jugador: int, registros: list) -> float:
+        """
+        Juega desde el tablero hasta el final o profundidad_simulacion jugadas (añadiendo los registros
+        de deshacer a 'registros') y devuelve la recompensa del agente.
+        """
+        for _ in range(self.profundidad_simulacion):
+            if state.isGameOver():
+                break
+            if jugador == 1:
+                moves = state.getAvailableMovesForMax(*state.pos_agente)
+                if not moves:
+                    break
+                if self.rollout == 'heuristico':
+                    move = self._movimiento_rollout(state, moves)
+                else:
+                    move = self.rng.choice(moves)
+                registros.append(state.aplicar_movimiento_agente(move))
+            else:
+                moves = state.getAvailableMovesForMin()
+                if moves:
+                    registros.append(state.aplicar_movimiento_hoyo(*self.rng.choice(moves)))
+            jugador = 1 - jugador
+        if state.isGameOver():
+            return 1.0 if state.game_result == 'win' else 0.0
+        return 0.5 + 0.5 * math.tanh(state.utility(0))
+
+    def _iterar(self, state: Tablerowumpus) -> int:
+        """
+        Una iteración (selección, expansión, simulación y retropropagación) sobre el propio tablero,
+        que queda restaurado. Devuelve la profundidad alcanzada en el árbol.
+        """
+        nodo = self.raiz
+        registros = []
+        profundidad = 0
+        try:
+            while not nodo.sin_probar and nodo.hijos:
+                nodo = self._seleccionar(nodo)
+                if nodo.movimiento is not None:
+                    registros.append(state.aplicar_movimiento(nodo.movimiento))
+                profundidad += 1
+            if nodo.sin_probar:
+                move = nodo.sin_probar.pop()
+                if move is not None:
+                    registros.append(state.aplicar_movimiento(move))
+                hijo = self._nodo(state, move, nodo, 1 - nodo.jugador)
+                nodo.hijos[move] = hijo
+                nodo = hijo
+                profundidad += 1
+            recompensa = self._simular(state, nodo.jugador, registros)
+        finally:
+            for registro in reversed(registros):
+                state.deshacer_movimiento(registro)
+        while nodo is not None:
+            nodo.visitas += 1
+            nodo.recompensa += recompensa
+            nodo = nodo.padre
+        return profundidad
+
+    def buscar(self, state: Tablerowumpus, presupuesto_ms: Optional[float] = None,
+               control: Optional[ControlBusqueda] = None) -> Tuple[Optional[Movimiento], float]:
+        """
+        Devuelve (movimiento_más_visitado, recompensa_media) para el agente; el valor está entre 0 y 1,
+        no en la escala de utility(). Con un control, su cancelación lanza BusquedaInterrumpida y
+        su progreso muestra la profundidad del árbol y las iteraciones.
+        """
+        self.raiz = self._raiz_para(state)
+        self.visitas_reutilizadas = self.raiz.visitas
+        self.profundidad_maxima = 0
+        if not self.raiz.sin_probar and not self.raiz.hijos:
+            return (None, self._simular(state, 1, []))
+
+        limite = time.perf_counter() + presupuesto_ms / 1000 if presupuesto_ms is not None else None
+        iteraciones = 0
+        while True:
+            if control is not None:
+                if control.cancelar is not None and control.cancelar.is_set():
+                    raise BusquedaInterrumpida()
+                control.nodos = iteraciones
+                control.profundidad_completada = self.profundidad_maxima
+            self.profundidad_maxima = max(self.profundidad_maxima, self._iterar(state))
+            iteraciones += 1
+            if limite is not None:
+                if time.perf_counter() >= limite:
+                    break
+            elif iteraciones >= self.iteraciones:
+                break
+        self.iteraciones_realizadas = iteraciones
+
+        mejor = max(self.raiz.hijos.values(), key=lambda hijo: hijo.visitas)
+        return (mejor.movimiento, mejor.recompensa / mejor.visitas)
+
+    def estadisticas(self) -> dict:
+        return {
+            'iteraciones': self.iteraciones_realizadas,
+            'visitas_raiz': self.raiz.visitas if self.raiz is not None else 0,
+            'visitas_reutilizadas': self.visitas_reutilizadas,
+            'profundidad_maxima': self.profundidad_maxima,
+        }
+
+
+def decidirMovimientoAgente(state: Tablerowumpus, maxLevel: int = 3, presupuesto_ms: Optional[float] = None,
+                            tabla: Optional[TablaTransposicion] = None,
+                            ordenador: Optional[OrdenadorMovimientos] = None,
+                            control: Optional[ControlBusqueda] = None,
+                            paralelo: Optional['BusquedaRaizParalela'] = None,
+                            estadisticas: Optional[EstadisticasBusqueda] = None,
+                            libro: Optional[LibroAperturas] = None,
+                            finales: Optional[TablasFinales] = None,
+                            mcts: Optional[BusquedaMCTS] = None,
+                            modelo_hoyos: str = 'adversario',
+                            informe: Optional[dict] = None) -> Tuple[Optional[Movimiento], float]:
+    """
+    Decide el movimiento del agente con profundidad fija (maxLevel) o, si se indica un
+    presupuesto en milisegundos, con profundización iterativa dentro de ese tiempo.
+    Con un control externo la búsqueda puede cancelarse y su progreso consultarse desde otro hilo;
+    si se cancela una búsqueda de profundidad fija se propaga BusquedaInterrumpida.
+    Si se pasa una búsqueda paralela, la profundidad fija reparte los movimientos raíz entre procesos.
+    Si se pasa un libro de aperturas y el tablero está en él (calculado al menos a maxLevel con
+    profundidad fija, y con el mismo motor y modelo de los hoyos), se juega su movimiento sin buscar.
+    Si se pasan tablas finales, la búsqueda las consulta en cada nodo.
+    Si se pasa una búsqueda MCTS, decide ella en lugar de miniMax (con el presupuesto de tiempo si
+    se indica, o con sus iteraciones); el valor devuelto es entonces su recompensa media.
+    Con modelo_hoyos='aleatorio' los hoyos se planifican como azar (expectimaxEnSitio), como mueven en
+    la partida, en lugar de como adversario; esa búsqueda no usa la tabla, la ordenación, los procesos
+    ni las tablas finales, cuyos valores son de miniMax, ni un libro calculado con otro modelo.
+    Si se pasa un diccionario 'informe', se rellena con los datos de la decisión (movimiento del libro,
+    profundidad alcanzada y estadísticas de MCTS, la tabla, la ordenación y las tablas finales) para que
+    el llamante los muestre con mostrar_informe_busqueda; la función no imprime nada.
+    """
+    if libro is not None:
+        apertura = libro.consultar(state, maxLevel if presupuesto_ms is None else 0,
+                                   'mcts' if mcts is not None else 'minimax', modelo_hoyos)
+        if apertura is not None:
+            if informe is not None:
+                informe['libro'] = apertura[0]
+            if control is not None:
+                control.profundidad_completada = libro.profundidad
+            return apertura
+    if mcts is not None:
+        bestMove, utilityValue = mcts.buscar(state, presupuesto_ms, control)
+        if informe is not None:
+            informe['mcts'] = mcts.estadisticas()
+        return (bestMove, utilityValue)
+    if ordenador is not None:
+        ordenador.nueva_busqueda()
+    if presupuesto_ms is not None:
+        if control is not None:
+            control.limite = control.inicio + presupuesto_ms / 1000
+        bestMove, utilityValue, profundidad = busquedaIterativa(state, presupuesto_ms, tabla=tabla,
+                                                                ordenador=ordenador, control=control,
+                                                                estadisticas=estadisticas, finales=finales,
+                                                                modelo_hoyos=modelo_hoyos)
+        if informe is not None:
+            informe['presupuesto_ms'] = presupuesto_ms
+            informe['profundidad'] = profundidad
+    else:
+        if modelo_hoyos == 'aleatorio':
+            bestMove, utilityValue = expectimaxEnSitio(state, 0, maxLevel, 1, -math.inf, math.inf, control,
+                                                       estadisticas=estadisticas)
+        elif paralelo is not None:
+            bestMove, utilityValue = paralelo.buscar(state, maxLevel, tabla, control, ordenador, estadisticas,
+                                                     finales)
+        else:
+            bestMove, utilityValue = miniMaxEnSitio(state, 0, maxLevel, 1, -math.inf, math.inf, tabla, control,
+                                                    ordenador=ordenador, estadisticas=estadisticas, finales=finales)
+        if control is not None:
+            control.profundidad_completada = maxLevel
+    if informe is not None:
+        if tabla is not None:
+            informe['tabla'] = tabla.estadisticas()
+        if ordenador is not None:
+            informe['ordenacion'] = ordenador.estadisticas()
+        if finales is not None:
+            informe['finales'] = finales.estadisticas()
+    return (bestMove, utilityValue)
+
+
+def mostrar_informe_busqueda(informe: dict):
+    """
+    Imprime el informe que rellena decidirMovimientoAgente.
+    """
+    if 'libro' in informe:
+        print("Movimiento del libro de aperturas:", informe['libro'])
+    if 'mcts' in informe:
+        print("MCTS:", informe['mcts'])
+    if 'profundidad' in informe:
+        print(f"Profundidad alcanzada en {informe['presupuesto_ms']} ms: {informe['profundidad']}")
+    if 'tabla' in informe:
+        print("Tabla de transposición:", informe['tabla'])
+    if 'ordenacion' in informe:
+        print("Ordenación de movimientos:", informe['ordenacion'])
+    if 'finales' in informe:
+        print("Tablas finales:", informe['finales'])
+
+
+# ================================
+# Búsqueda paralela en la raíz
+# ================================
+
+_ORDENADOR_PROCESO = None  # Ordenador propio de cada proceso de la búsqueda paralela
+
+
+def _iniciarProcesoRaiz(ordenar_movimientos: bool):
+    global _ORDENADOR_PROCESO
+    _ORDENADOR_PROCESO = OrdenadorMovimientos() if ordenar_movimientos else None
+
+
+def _evaluarMovimientoRaiz(state: Tablerowumpus, move: str, maxLevel: int, alpha: float,
+                           finales: Optional[TablasFinales] = None) -> float:
+    """
+    Trabajo de un proceso: valor del movimiento raíz 'move' buscado con la ventana (alpha, +inf).
+    El tablero es una copia recibida por el proceso, así que no hace falta deshacer el movimiento.
+    Las tablas finales llegan como su ruta y cada proceso abre las suyas una sola vez.
+    """
+    state.aplicar_movimiento_agente(move)
+    _, value = miniMaxEnSitio(state, 1, maxLevel, 0, alpha, math.inf, ordenador=_ORDENADOR_PROCESO,
+                              finales=finales)
+    return value
+
+
+class BusquedaRaizParalela:
+    """
+    Búsqueda de profundidad fija que reparte los movimientos raíz del agente entre procesos,
+    al estilo Young Brothers Wait: el primer movimiento se busca en este proceso con la ventana
+    completa y su valor se usa como cota alfa para buscar el resto en paralelo.
+    Devuelve el mismo movimiento que miniMaxEnSitio con el mismo orden de movimientos: los valores
+    que superan alfa son exactos y el desempate se hace en el orden original.
+    El pool de procesos se crea en la primera búsqueda y se reutiliza hasta cerrar().
+    """
+
+    def __init__(self, procesos: Optional[int] = None, ordenar_movimientos: bool = True):
+        self.procesos = procesos
+        self.ordenar_movimientos = ordenar_movimientos
+        self.ejecutor = None
+        self.intervalo_cancelacion = 0.05  # s entre comprobaciones de cancelación mientras se espera
+
+    def _obtener_ejecutor(self) -> ProcessPoolExecutor:
+        if self.ejecutor is None:
+            # 'spawn' evita duplicar con fork el estado de Tk y de los hilos de la GUI
+            self.ejecutor = ProcessPoolExecutor(max_workers=self.procesos,
+                                                mp_context=multiprocessing.get_context('spawn'),
+                                                initializer=_iniciarProcesoRaiz,
+                                                initargs=(self.ordenar_movimientos,))
+        return self.ejecutor
+
+    def buscar(self, state: Tablerowumpus, maxLevel: int, tabla: Optional[TablaTransposicion] = None,
+               control: Optional[ControlBusqueda] = None,
+               ordenador: Optional[OrdenadorMovimientos] = None,
+               estadisticas: Optional[EstadisticasBusqueda] = None,
+               finales: Optional[TablasFinales] = None) -> Tuple[Optional[Movimiento], float]:
+        """
+        Devuelve (mejor_movimiento, valor) para el agente. La tabla, el ordenador y las estadísticas
+        solo se usan en la búsqueda del primer movimiento, que se hace en este proceso; las tablas
+        finales se consultan en todos.
+        Si el control se cancela mientras se espera a los procesos se lanza BusquedaInterrumpida.
+        """
+        if estadisticas is not None:
+            estadisticas.registrar_nodo(0)
+        if maxLevel <= 0 or state.isGameOver():
+            return (None, state.utility(0))
+        moves = state.getAvailableMovesForMax(*state.pos_agente)
+        if not moves:
+            return (None, state.utility(0))
+        if ordenador is not None:
+            moves = ordenador.ordenar(state, moves, 1, 0)
+
+        # Hermano mayor: se busca primero y con la ventana completa para obtener alfa
+        registro = state.aplicar_movimiento_agente(moves[0])
+        try:
+            _, alpha = miniMaxEnSitio(state, 1, maxLevel, 0, -math.inf, math.inf, tabla, control, None, ordenador,
+                                      estadisticas, finales)
+        finally:
+            state.deshacer_movimiento(registro)
+        bestMove, bestValue = moves[0], alpha
+
+        ejecutor = self._obtener_ejecutor()
+        futuros = [ejecutor.submit(_evaluarMovimientoRaiz, state, move, maxLevel, alpha, finales)
+                   for move in moves[1:]]
+        pendientes = set(futuros)
+        while pendientes:
+            _, pendientes = wait(pendientes, timeout=self.intervalo_cancelacion)
+            if control is not None and control.cancelar is not None and control.cancelar.is_set():
+                for futuro in futuros:
+                    futuro.cancel()
+                raise BusquedaInterrumpida()
+
+        # Mismo desempate que la búsqueda secuencial: gana el primero con un valor estrictamente mayor
+        for move, futuro in zip(moves[1:], futuros):
+            value = futuro.result()
+            if value > bestValue:
+                bestValue = value
+                bestMove = move
+        return (bestMove, bestValue)
+
+    def cerrar(self):
+        """
+        Detiene el pool de procesos (sin esperar a búsquedas canceladas que sigan en curso).
+        """
+        if self.ejecutor is not None:
+            self.ejecutor.shutdown(wait=False, cancel_futures=True)
+            self.ejecutor = None
+
+
+# ================================
+# Búsqueda en segundo plano para la GUI
+# ================================
+
+class TrabajadorBusqueda:
+    """
+    Ejecuta la decisión del agente en un hilo aparte para que el bucle de Tk no se bloquee.
+    La búsqueda trabaja sobre una copia del tablero; la GUI consulta 'terminado' con root.after,
+    lee el progreso (profundidad y nodos) y puede cancelarla con cancelar(). La tabla de transposición,
+    el ordenador y el árbol MCTS son los de la GUI, así que antes de limpiarlos hay que esperar() al hilo.
+    """
+
+    def __init__(self, tablero: Tablerowumpus, maxLevel: int, presupuesto_ms: Optional[float] = None,
+                 tabla: Optional[TablaTransposicion] = None, ordenador: Optional[OrdenadorMovimientos] = None,
+                 paralelo: Optional[BusquedaRaizParalela] = None, registrar_estadisticas: bool = False,
+                 libro: Optional[LibroAperturas] = None, finales: Optional[TablasFinales] = None,
+                 mcts: Optional[BusquedaMCTS] = None, modelo_hoyos: str = 'adversario'):
+        self.tablero = deepcopy(tablero)
+        self.maxLevel = maxLevel
+        self.presupuesto_ms = presupuesto_ms
+        self.tabla = tabla
+        self.ordenador = ordenador
+        self.paralelo = paralelo
+        self.libro = libro
+        self.finales = finales
+        self.mcts = mcts
+        self.modelo_hoyos = modelo_hoyos
+        self.estadisticas = EstadisticasBusqueda() if registrar_estadisticas else None
+        self.informe = {}  # Datos de la decisión para mostrar_informe_busqueda
+        self.evento_cancelar = threading.Event()
+        self.control = ControlBusqueda(cancelar=self.evento_cancelar)
+        self.resultado = None  # (mejor_movimiento, utilidad) cuando la búsqueda termina
+        self.terminado = False
+        self.hilo = threading.Thread(target=self._ejecutar, daemon=True)
+
+    def iniciar(self):
+        self.hilo.start()
+
+    def cancelar(self):
+        """
+        Pide a la búsqueda que se detenga; su resultado se descarta.
+        """
+        self.evento_cancelar.set()
+
+    def esperar(self):
+        """
+        Espera a que termine el hilo; tras cancelar() la búsqueda se detiene en pocos nodos.
+        """
+        if self.hilo.is_alive():
+            self.hilo.join()
+
+    @property
+    def cancelado(self) -> bool:
+        return self.evento_cancelar.is_set()
+
+    def progreso(self) -> str:
+        return f"profundidad {self.control.profundidad_completada}, {self.control.nodos} nodos"
+
+    def _ejecutar(self):
+        try:
+            self.resultado = decidirMovimientoAgente(self.tablero, self.maxLevel, self.presupuesto_ms,
+                                                     self.tabla, self.ordenador, self.control, self.paralelo,
+                                                     self.estadisticas, self.libro, self.finales, self.mcts,
+                                                     self.modelo_hoyos, self.informe)
+        except BusquedaInterrumpida:
+            self.resultado = None
+        finally:
+            self.terminado = True
+
+
 # ================================
 # Clase de la Interfaz Gráfica del Usuario (GUI) mejorada sin imágenes y con modo secuencial
 # ================================
@@ -624,11 +2623,39 @@ class WumpusGUI:
     Clase que representa la interfaz gráfica del juego del Wumpus.
     """
 
-    def __init__(self, root):
+    def __init__(self, root, entradas_tabla: int = 1 << 16, maxLevel: int = 3,
+                 presupuesto_ms: Optional[float] = None, ordenar_movimientos: bool = True, procesos: int = 0,
+                 registrar_estadisticas: bool = False, tamano: int = 6, num_hoyos: int = 2, num_wumpus: int = 1,
+                 semilla: Optional[int] = None, libro: Optional[str] = None, finales: Optional[str] = None,
+                 motor: str = 'minimax', iteraciones_mcts: int = 2000, exploracion_mcts: float = math.sqrt(2),
+                 rollout_mcts: str = 'heuristico', modelo_hoyos: str = 'adversario'):
         self.root = root
-        self.tamano = 6
-        self.cell_size = 80  # Tamaño de cada celda en píxeles
-        self.maxLevel = 3  # Profundidad máxima del árbol de búsqueda
+        self.tamano = tamano
+        self.num_hoyos = num_hoyos
+        self.num_wumpus = num_wumpus
+        self.semilla = semilla  # Con semilla, cada nueva partida repite el mismo tablero y los mismos movimientos
+        # Tamaño de cada celda en píxeles: 80 en el tablero de 6x6, más pequeño en tableros grandes
+        self.cell_size = max(24, min(80, 480 // self.tamano))
+        self.maxLevel = maxLevel  # Profundidad máxima del árbol de búsqueda
+        self.presupuesto_ms = presupuesto_ms  # Si no es None, se busca por tiempo en lugar de por profundidad
+        # Tabla de transposición compartida entre turnos (None si está desactivada)
+        self.tabla = TablaTransposicion(entradas_tabla) if entradas_tabla > 0 else None
+        # Ordenación de movimientos (jugadas asesinas, historia y ordenación estática)
+        self.ordenador = OrdenadorMovimientos() if ordenar_movimientos else None
+        # Búsqueda paralela en la raíz con varios procesos (None para buscar en un solo hilo)
+        self.paralelo = BusquedaRaizParalela(procesos, ordenar_movimientos) if procesos > 1 else None
+        self.registrar_estadisticas = registrar_estadisticas  # Mostrar las estadísticas de búsqueda por turno
+        # Libro de aperturas consultado antes de buscar (se lee del disco en la primera consulta)
+        self.libro = obtener_libro_aperturas(libro) if libro is not None else None
+        # Tablas finales consultadas en cada nodo de la búsqueda (el fichero se abre en la primera consulta)
+        self.finales = obtener_tablas_finales(finales) if finales is not None else None
+        # Búsqueda MCTS que sustituye a miniMax con motor='mcts' (su árbol se conserva entre turnos)
+        self.mcts = BusquedaMCTS(iteraciones_mcts, exploracion_mcts, rollout_mcts, semilla=semilla) \
+            if motor == 'mcts' else None
+        # Cómo planifica el agente el turno de los hoyos: adversario (miniMax) o azar (expectimax)
+        self.modelo_hoyos = modelo_hoyos
+        self.trabajador = None  # Búsqueda del agente en curso (TrabajadorBusqueda)
+        self.intervalo_sondeo = 50  # ms entre comprobaciones del resultado de la búsqueda
         self.game_running = False  # Indica si el juego está en ejecución
         self.mode = "automatic"  # Modo de juego: automático o secuencial
 
@@ -716,11 +2743,11 @@ class WumpusGUI:
         """
         Inicializa un nuevo juego creando una matriz inicial y un nuevo tablero.
         """
-        # Crear una matriz de 6x6 llena de BLANCO (0)
+        # Crear una matriz de tamano x tamano llena de BLANCO (0)
         matriz_inicial = [[BLANCO for _ in range(self.tamano)] for _ in range(self.tamano)]
 
         # Crear una instancia de Tablerowumpus pasando la matriz inicial
-        self.tablero = Tablerowumpus(matriz_inicial)
+        self.tablero = Tablerowumpus(matriz_inicial, self.num_hoyos, self.num_wumpus, self.semilla)
 
     def draw_board(self):
         """
@@ -736,7 +2763,8 @@ class WumpusGUI:
                 y1 = y0 + self.cell_size
 
                 # Dibujar el fondo de la celda con bordes redondeados
-                self.draw_rounded_rectangle(x0, y0, x1, y1, radius=10, fill=self.get_tile_color(matrix[i][j]),
+                self.draw_rounded_rectangle(x0, y0, x1, y1, radius=min(10, self.cell_size // 8),
+                                            fill=self.get_tile_color(matrix[i][j]),
                                             outline="#BDC3C7", width=2)
 
                 # Añadir textos según el tipo de casilla
@@ -766,7 +2794,7 @@ class WumpusGUI:
         Añade texto a la casilla según el tipo de elemento.
         """
         text = ""
-        font_style = ("Arial", 12, "bold")
+        font_style = ("Arial", max(6, self.cell_size * 12 // 80), "bold")  # 12 puntos en celdas de 80 px
         text_color = "black"  # Contraste adecuado con fondo claro
 
         # Determinar el texto y color según el tipo de casilla
@@ -860,19 +2888,80 @@ class WumpusGUI:
         """
         Ejecuta el siguiente movimiento en modo secuencial.
         """
-        if not self.game_running or self.mode != "sequential":
+        if not self.game_running or self.mode != "sequential" or self.trabajador is not None:
             return
 
         if self.tablero.isGameOver():
             self.show_game_over()
             return
 
-        # Turno del Agente (Max)
+        # Turno del Agente (Max): la búsqueda se ejecuta en segundo plano
+        self.next_move_button.config(state=tk.DISABLED)
+        self.iniciar_busqueda_agente()
+
+    def game_step(self):
+        """
+        Ejecuta un paso del juego en modo automático.
+        """
+        if not self.game_running:
+            return
+
+        if self.tablero.isGameOver():
+            self.show_game_over()
+            return
+
+        # Turno del Agente (Max): la búsqueda se ejecuta en segundo plano
+        self.iniciar_busqueda_agente()
+
+    def iniciar_busqueda_agente(self):
+        """
+        Lanza la búsqueda del movimiento del agente en un hilo y empieza a sondear su resultado.
+        """
         print("Turno del Agente:")
-        bestState, utilityValue = miniMax(self.tablero, 0, self.maxLevel, 1, -math.inf, math.inf)
+        self.trabajador = TrabajadorBusqueda(self.tablero, self.maxLevel, self.presupuesto_ms, self.tabla,
+                                             self.ordenador, self.paralelo, self.registrar_estadisticas,
+                                             self.libro, self.finales, self.mcts, self.modelo_hoyos)
+        self.trabajador.iniciar()
+        self.status_label.config(text="El agente está pensando...", fg="yellow")
+        self.root.after(self.intervalo_sondeo, self.comprobar_busqueda)
+
+    def comprobar_busqueda(self):
+        """
+        Consulta el estado de la búsqueda en curso: muestra el progreso mientras sigue
+        ejecutándose y completa el turno del agente cuando termina.
+        """
+        trabajador = self.trabajador
+        if trabajador is None or trabajador.cancelado:
+            return
+        if not trabajador.terminado:
+            self.status_label.config(text=f"El agente está pensando... ({trabajador.progreso()})", fg="yellow")
+            self.root.after(self.intervalo_sondeo, self.comprobar_busqueda)
+            return
+
+        self.trabajador = None
+        if not self.game_running or trabajador.resultado is None:
+            return
+        mostrar_informe_busqueda(trabajador.informe)
+        if trabajador.estadisticas is not None:
+            print("Estadísticas de búsqueda:", json.dumps(trabajador.estadisticas.como_dict()))
+        self.completar_turno_agente(*trabajador.resultado)
+
+    def cancelar_busqueda(self):
+        """
+        Cancela la búsqueda del agente en curso, si la hay, y espera a que su hilo termine para que
+        no siga escribiendo en la tabla de transposición, el ordenador o el árbol MCTS compartidos.
+        """
+        if self.trabajador is not None:
+            self.trabajador.cancelar()
+            self.trabajador.esperar()
+            self.trabajador = None
 
-        if bestState is not None:
-            self.tablero = bestState
+    def completar_turno_agente(self, bestMove: Optional[Movimiento], utilityValue: float):
+        """
+        Aplica el movimiento decidido por la búsqueda y continúa con el turno de los hoyos.
+        """
+        if bestMove is not None:
+            self.tablero.aplicar_movimiento_agente(bestMove)
             self.draw_board()
             print("Utilidad del estado actual:", utilityValue)
             self.status_label.config(text=f"Utilidad actual: {utilityValue:.2f}", fg="black")
@@ -883,11 +2972,20 @@ class WumpusGUI:
             self.show_game_over()
             return
 
-        # Turno de los Hoyos (Min)
+        if self.mode == "sequential":
+            self.mover_hoyos_secuencial()
+        else:
+            # Retraso antes del movimiento de los hoyos
+            self.root.after(500, self.hoyos_move_step)  # 500 ms de retraso
+
+    def mover_hoyos_secuencial(self):
+        """
+        Turno de los hoyos en modo secuencial, justo después del movimiento del agente.
+        """
         print("Turno de los Hoyos:")
         moves = self.tablero.getAvailableMovesForMin()
         if moves:
-            move = random.choice(moves)
+            move = self.tablero.rng.choice(moves)
             hoyo_index, new_row, new_col = move
             self.tablero.mover_hoyo(hoyo_index, new_row, new_col)
             self.draw_board()
@@ -899,35 +2997,7 @@ class WumpusGUI:
             self.show_game_over()
             return
 
-    def game_step(self):
-        """
-        Ejecuta un paso del juego en modo automático.
-        """
-        if not self.game_running:
-            return
-
-        if self.tablero.isGameOver():
-            self.show_game_over()
-            return
-
-        # Turno del Agente (Max)
-        print("Turno del Agente:")
-        bestState, utilityValue = miniMax(self.tablero, 0, self.maxLevel, 1, -math.inf, math.inf)
-
-        if bestState is not None:
-            self.tablero = bestState
-            self.draw_board()
-            print("Utilidad del estado actual:", utilityValue)
-            self.status_label.config(text=f"Utilidad actual: {utilityValue:.2f}", fg="black")
-        else:
-            print("No se encontraron movimientos para el agente.")
-
-        if self.tablero.isGameOver():
-            self.show_game_over()
-            return
-
-        # Retraso antes del movimiento de los hoyos
-        self.root.after(500, self.hoyos_move_step)  # 500 ms de retraso
+        self.next_move_button.config(state=tk.NORMAL)
 
     def hoyos_move_step(self):
         """
@@ -944,7 +3014,7 @@ class WumpusGUI:
         print("Turno de los Hoyos:")
         moves = self.tablero.getAvailableMovesForMin()
         if moves:
-            move = random.choice(moves)
+            move = self.tablero.rng.choice(moves)
             hoyo_index, new_row, new_col = move
             self.tablero.mover_hoyo(hoyo_index, new_row, new_col)
             self.draw_board()
@@ -988,8 +3058,14 @@ class WumpusGUI:
         """
         Reinicia el juego a un nuevo estado aleatorio.
         """
-        # Reiniciar el tablero a un nuevo estado aleatorio
+        # Cancelar la búsqueda en curso (esperando a su hilo) y reiniciar el tablero a un nuevo estado aleatorio
+        self.cancelar_busqueda()
+        self.game_running = False
         self.iniciar_nuevo_juego()
+        if self.tabla is not None:
+            self.tabla.limpiar()
+        if self.mcts is not None:
+            self.mcts.reiniciar()
         self.draw_board()
         print("Juego reiniciado.")
         # Deshabilitar botones de modo
@@ -1005,13 +3081,137 @@ class WumpusGUI:
         """
         Cierra la aplicación de manera limpia.
         """
+        self.cancelar_busqueda()
+        if self.paralelo is not None:
+            self.paralelo.cerrar()
         self.root.destroy()
 
 
+# ================================
+# Función para Ejecutar en Modo Texto
+# ================================
+
+def run_text_game(maxLevel: int = 3, presupuesto_ms: Optional[float] = None, entradas_tabla: int = 1 << 16,
+                  ordenar_movimientos: bool = True, procesos: int = 0, registrar_estadisticas: bool = False,
+                  tamano: int = 6, num_hoyos: int = 2, num_wumpus: int = 1, semilla: Optional[int] = None,
+                  libro: Optional[str] = None, finales: Optional[str] = None, motor: str = 'minimax',
+                  iteraciones_mcts: int = 2000, exploracion_mcts: float = math.sqrt(2),
+                  rollout_mcts: str = 'heuristico', modelo_hoyos: str = 'adversario'):
+    """
+    Ejecuta el juego en la consola, esperando a que el usuario pulse Enter entre turnos.
+    Con semilla, la partida (tablero y movimientos de los hoyos) se repite exactamente.
+    Con motor='mcts' el agente decide con BusquedaMCTS en lugar de miniMax, y con
+    modelo_hoyos='aleatorio' planifica los hoyos como azar (expectimax).
+    """
+    matriz_inicial = [[BLANCO for _ in range(tamano)] for _ in range(tamano)]
+    tablero = Tablerowumpus(matriz_inicial, num_hoyos, num_wumpus, semilla)
+    tabla = TablaTransposicion(entradas_tabla) if entradas_tabla > 0 else None
+    ordenador = OrdenadorMovimientos() if ordenar_movimientos else None
+    paralelo = BusquedaRaizParalela(procesos, ordenar_movimientos) if procesos > 1 else None
+    libro_aperturas = obtener_libro_aperturas(libro) if libro is not None else None
+    tablas_finales = obtener_tablas_finales(finales) if finales is not None else None
+    mcts = BusquedaMCTS(iteraciones_mcts, exploracion_mcts, rollout_mcts, semilla=semilla) if motor == 'mcts' else None
+
+    while True:
+        if tablero.isGameOver():
+            show_game_over_text(tablero)
+            break
+
+        # Turno del Agente (Max)
+        print("Turno del Agente:")
+        tablero.imprimir_tablero()
+        estadisticas = EstadisticasBusqueda() if registrar_estadisticas else None
+        informe = {}
+        bestMove, utilityValue = decidirMovimientoAgente(tablero, maxLevel, presupuesto_ms, tabla, ordenador,
+                                                         paralelo=paralelo, estadisticas=estadisticas,
+                                                         libro=libro_aperturas, finales=tablas_finales, mcts=mcts,
+                                                         modelo_hoyos=modelo_hoyos, informe=informe)
+        mostrar_informe_busqueda(informe)
+        if estadisticas is not None:
+            print("Estadísticas de búsqueda:", json.dumps(estadisticas.como_dict()))
+
+        if bestMove is not None:
+            tablero.aplicar_movimiento_agente(bestMove)
+            print("Estado después del movimiento del Agente:")
+            tablero.imprimir_tablero()
+            print("Utilidad del estado actual:", utilityValue)
+        else:
+            print("No se encontraron movimientos para el agente.")
+
+        if tablero.isGameOver():
+            show_game_over_text(tablero)
+            break
+
+        # Turno de los Hoyos (Min)
+        print("Turno de los Hoyos:")
+        moves = tablero.getAvailableMovesForMin()
+        if moves:
+            hoyo_index, new_row, new_col = tablero.rng.choice(moves)
+            tablero.mover_hoyo(hoyo_index, new_row, new_col)
+            print(f"Hoyo {hoyo_index} movido a ({new_row}, {new_col})")
+            print("Estado después del movimiento de los Hoyos:")
+            tablero.imprimir_tablero()
+        else:
+            print("Los hoyos no pueden moverse.")
+
+        if tablero.isGameOver():
+            show_game_over_text(tablero)
+            break
+
+        # Pausar hasta que el usuario presione Enter
+        input("Presione Enter para continuar...")
+
+    if paralelo is not None:
+        paralelo.cerrar()
+
+
+def show_game_over_text(tablero: Tablerowumpus):
+    """
+    Muestra el resultado final de la partida en la consola.
+    """
+    if tablero.game_result == 'win':
+        print("¡Ganaste! El agente ha encontrado el oro.")
+    elif tablero.game_result == 'lose_wumpus':
+        print("¡Perdiste! El agente ha sido devorado por el Wumpus.")
+    elif tablero.game_result == 'lose_hoyo':
+        print("¡Perdiste! El agente ha caído en un hoyo.")
+    else:
+        print("Juego Terminado")
+
+
 if __name__ == "__main__":
     # Analizar argumentos de línea de comandos
     parser = argparse.ArgumentParser(description="Juego del Wumpus")
     parser.add_argument('--mode', choices=['gui', 'text'], default='gui', help='Modo de juego: gui o text')
+    parser.add_argument('--tabla', type=int, default=1 << 16,
+                        help='Entradas de la tabla de transposición (0 para desactivarla)')
+    parser.add_argument('--profundidad', type=int, default=3, help='Profundidad máxima de búsqueda del agente')
+    parser.add_argument('--presupuesto-ms', type=float, default=None,
+                        help='Tiempo por turno del agente en ms (profundización iterativa en lugar de profundidad fija)')
+    parser.add_argument('--sin-ordenacion', action='store_true',
+                        help='Desactiva la ordenación de movimientos (jugadas asesinas e historia)')
+    parser.add_argument('--procesos', type=int, default=0,
+                        help='Procesos para buscar en paralelo los movimientos raíz del agente (0 o 1 = secuencial)')
+    parser.add_argument('--estadisticas', action='store_true',
+                        help='Muestra por turno las estadísticas de la búsqueda del agente (nodos, cortes, tiempos)')
+    parser.add_argument('--tamano', type=int, default=6, help='Lado del tablero (tamano x tamano)')
+    parser.add_argument('--num-hoyos', type=int, default=2, help='Número de hoyos móviles')
+    parser.add_argument('--num-wumpus', type=int, default=1, help='Número de Wumpus')
+    parser.add_argument('--semilla', '--seed', type=int, default=None,
+                        help='Semilla de la partida (tablero y movimientos de los hoyos) para repetirla exactamente')
+    parser.add_argument('--libro', metavar='FICHERO', default=None,
+                        help='Libro de aperturas (generado con libro_aperturas.py) consultado antes de buscar')
+    parser.add_argument('--finales', metavar='FICHERO', default=None,
+                        help='Tablas finales (generadas con tablas_finales.py) consultadas durante la búsqueda')
+    parser.add_argument('--motor', choices=['minimax', 'mcts'], default='minimax',
+                        help='Motor de decisión del agente: miniMax o búsqueda Monte Carlo en árbol')
+    parser.add_argument('--iteraciones', type=int, default=2000,
+                        help='Iteraciones por turno de MCTS (sin --presupuesto-ms)')
+    parser.add_argument('--exploracion', type=float, default=math.sqrt(2), help='Constante de exploración UCT de MCTS')
+    parser.add_argument('--rollout', choices=ROLLOUTS_MCTS, default='heuristico',
+                        help='Rollouts de MCTS: movimientos al azar o agente guiado por la utilidad')
+    parser.add_argument('--modelo-hoyos', choices=MODELOS_HOYOS, default='adversario',
+                        help='Cómo planifica el agente a los hoyos: adversario (miniMax) o azar (expectimax)')
     args = parser.parse_args()
 
     if args.mode == 'gui':
@@ -1019,9 +3219,17 @@ if __name__ == "__main__":
         root = tk.Tk()
         root.title("Juego del Wumpus")
         root.configure(bg="#2E4053")
-        gui = WumpusGUI(root)
+        gui = WumpusGUI(root, entradas_tabla=args.tabla, maxLevel=args.profundidad,
+                        presupuesto_ms=args.presupuesto_ms, ordenar_movimientos=not args.sin_ordenacion,
+                        procesos=args.procesos, registrar_estadisticas=args.estadisticas, tamano=args.tamano,
+                        num_hoyos=args.num_hoyos, num_wumpus=args.num_wumpus, semilla=args.semilla,
+                        libro=args.libro, finales=args.finales, motor=args.motor, iteraciones_mcts=args.iteraciones,
+                        exploracion_mcts=args.exploracion, rollout_mcts=args.rollout,
+                        modelo_hoyos=args.modelo_hoyos)
         root.mainloop()
     else:
-        # Implementación del modo de texto (si es necesario)
-        # Aquí puedes añadir la función run_text_game() si tienes una implementación en modo texto
-        print("Modo de juego en texto no está implementado.")
+        # Ejecutar en modo texto
+        run_text_game(args.profundidad, args.presupuesto_ms, args.tabla, not args.sin_ordenacion, args.procesos,
+                      args.estadisticas, args.tamano, args.num_hoyos, args.num_wumpus, args.semilla, args.libro,
+                      args.finales, args.motor, args.iteraciones, args.exploracion, args.rollout,
+                      args.modelo_hoyos)
@@ -0,0 +1,16 @@
+"""
+Benchmarks de los caminos críticos del juego del Wumpus.
+
+Miden la construcción del tablero (colocar_elementos), la generación de movimientos de los
+hoyos, mover_hoyo con la actualización de brisas, la utilidad y la búsqueda minimax completa
+sobre un corpus fijo de tableros con semilla, comparando las distintas implementaciones del
+tablero que hay en el repositorio.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks
+    python -m benchmarks --profundidades 2-6 --tableros 5 --json resultados.json
+"""
+from benchmarks.suite import ejecutar_suite, CASOS
+from benchmarks.implementaciones import IMPLEMENTACIONES
+
+__all__ = ['ejecutar_suite', 'CASOS', 'IMPLEMENTACIONES']
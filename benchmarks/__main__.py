@@ -0,0 +1,82 @@
+"""
+Punto de entrada: python -m benchmarks [opciones]
+"""
+import argparse
+import json
+import sys
+
+from benchmarks.implementaciones import IMPLEMENTACIONES
+from benchmarks.suite import CASOS, ejecutar_suite
+
+
+def leer_profundidades(texto: str) -> list:
+    """
+    Acepta un rango '2-8' o una lista '2,4,6'.
+    """
+    if '-' in texto:
+        inicio, fin = texto.split('-', 1)
+        return list(range(int(inicio), int(fin) + 1))
+    return [int(valor) for valor in texto.split(',')]
+
+
+def imprimir_tabla(datos: dict):
+    for nombre, resultado in datos['resultados'].items():
+        print(f"== {nombre}")
+        if resultado.get('omitido'):
+            print("  omitido (no admite este tamaño o número de hoyos/Wumpus)")
+            continue
+        for caso in CASOS:
+            if caso == 'minimax' or caso not in resultado:
+                continue
+            medida = resultado[caso]
+            print(f"  {caso:<16} {medida['ns_op']:12.0f} ns/op  {medida['memoria_pico_bytes']:>10} B pico")
+        # Los nodos de una implementación con otro árbol de búsqueda no se comparan con los demás
+        nota = '' if resultado.get('comparable', True) else '  (no comparable: otras reglas y tableros)'
+        for profundidad, medida in resultado.get('minimax', {}).items():
+            if medida.get('omitido'):
+                print(f"  minimax p{profundidad:<7} omitido")
+                continue
+            print(f"  minimax p{profundidad:<7} {medida['nodos_por_segundo']:12.0f} nodos/s  "
+                  f"{medida['nodos']:>10} nodos  {medida['segundos']:8.3f} s  "
+                  f"{medida['memoria_pico_bytes']:>10} B pico{nota}")
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description="Benchmarks del tablero y la búsqueda del Wumpus")
+    parser.add_argument('--implementaciones', nargs='+', choices=list(IMPLEMENTACIONES), default=None,
+                        help='Implementaciones del tablero a comparar (todas por defecto)')
+    parser.add_argument('--casos', nargs='+', choices=CASOS, default=list(CASOS), help='Casos a medir')
+    parser.add_argument('--profundidades', type=leer_profundidades, default=list(range(2, 9)),
+                        help="Profundidades de minimax: rango '2-8' o lista '2,4,6'")
+    parser.add_argument('--tableros', type=int, default=10, help='Tableros del corpus')
+    parser.add_argument('--tamano', type=int, default=6, help='Lado de los tableros del corpus')
+    parser.add_argument('--num-hoyos', type=int, default=2, help='Hoyos de los tableros del corpus')
+    parser.add_argument('--num-wumpus', type=int, default=1, help='Wumpus de los tableros del corpus')
+    parser.add_argument('--semilla', type=int, default=0, help='Semilla del primer tablero del corpus')
+    parser.add_argument('--repeticiones', type=int, default=5,
+                        help='Repeticiones de las operaciones cortas (se toma la mejor)')
+    parser.add_argument('--tiempo-max', type=float, default=30.0,
+                        help='Segundos de minimax a partir de los cuales se omiten las profundidades mayores')
+    parser.add_argument('--json', metavar='FICHERO', default=None,
+                        help="Guarda los resultados en JSON ('-' para la salida estándar)")
+    return parser
+
+
+def main():
+    args = crear_parser().parse_args()
+    datos = ejecutar_suite(args.implementaciones, args.tableros, args.semilla, args.profundidades,
+                           args.repeticiones, args.tiempo_max, args.casos,
+                           progreso=lambda nombre: print(f"Midiendo {nombre}...", file=sys.stderr),
+                           tamano=args.tamano, num_hoyos=args.num_hoyos, num_wumpus=args.num_wumpus)
+    if args.json == '-':
+        print(json.dumps(datos, indent=2))
+        return
+    imprimir_tabla(datos)
+    if args.json is not None:
+        with open(args.json, 'w', encoding='utf-8') as fichero:
+            json.dump(datos, fichero, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Adaptadores con una interfaz común para cada implementación del tablero que se compara.
+"""
+import math
+import os
+import random
+import sys
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+from Wumpus_Urbaneja_Portal_Diego import Tablerowumpus, ControlBusqueda, miniMaxEnSitio
+import Wumpus_Urbaneja_Portal_Diego
+from tablero_bits import TableroBits
+
+DIRECTORIO_MODULAR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'JUEGO_MODULAR')
+
+
+class Implementacion(ABC):
+    """
+    Operaciones que mide la suite. Cada subclase envuelve un tablero del repositorio.
+    buscar() devuelve el valor de la búsqueda y contar_nodos() el número de nodos visitados,
+    que se mide en una ejecución aparte para no cargar el tiempo con el conteo.
+    """
+
+    nombre = ''
+    # Si sus tableros y su árbol de búsqueda son los de las demás, de modo que los nodos y
+    # los nodos/s de minimax se pueden comparar entre implementaciones
+    comparable = True
+
+    def __init__(self, tamano: int = 6, num_hoyos: int = 2, num_wumpus: int = 1):
+        self.tamano = tamano
+        self.num_hoyos = num_hoyos
+        self.num_wumpus = num_wumpus
+
+    def soportada(self) -> bool:
+        """
+        Indica si la implementación admite el tamaño y el número de hoyos y Wumpus pedidos.
+        """
+        return True
+
+    @abstractmethod
+    def crear(self, semilla: int):
+        """
+        Crea el tablero de la semilla dada.
+        """
+
+    @abstractmethod
+    def movimientos_min(self, tablero) -> list:
+        """
+        Movimientos disponibles de los hoyos.
+        """
+
+    @abstractmethod
+    def mover_hoyo(self, tablero, move):
+        """
+        Aplica un movimiento de hoyo de movimientos_min().
+        """
+
+    @abstractmethod
+    def utilidad(self, tablero) -> float:
+        """
+        Utilidad del tablero en el nivel 0.
+        """
+
+    @abstractmethod
+    def buscar(self, tablero, profundidad: int) -> float:
+        """
+        Valor de la búsqueda miniMax del agente a la profundidad dada.
+        """
+
+    @abstractmethod
+    def contar_nodos(self, tablero, profundidad: int) -> int:
+        """
+        Nodos que visita buscar() a la profundidad dada.
+        """
+
+
+def _contar_llamadas(modulo, nombre_funcion: str, llamada) -> int:
+    """
+    Ejecuta llamada() sustituyendo temporalmente modulo.nombre_funcion por una versión que
+    cuenta las llamadas recursivas (cada llamada es un nodo del árbol de búsqueda).
+    """
+    original = getattr(modulo, nombre_funcion)
+    contador = [0]
+
+    def contada(*args, **kwargs):
+        contador[0] += 1
+        return original(*args, **kwargs)
+
+    setattr(modulo, nombre_funcion, contada)
+    try:
+        llamada()
+    finally:
+        setattr(modulo, nombre_funcion, original)
+    return contador[0]
+
+
+@contextmanager
+def _semilla_global(semilla: int):
+    """
+    Fija la semilla del módulo random durante el bloque y después restaura su estado anterior,
+    para que medir JUEGO_MODULAR (que solo usa el generador global) no altere el del proceso.
+    """
+    estado = random.getstate()
+    random.seed(semilla)
+    try:
+        yield
+    finally:
+        random.setstate(estado)
+
+
+class TablerowumpusCopia(Implementacion):
+    """
+    Tablerowumpus con el miniMax original, que copia el tablero en cada nodo.
+    """
+
+    nombre = 'tablerowumpus_copia'
+
+    def crear(self, semilla: int):
+        return Tablerowumpus.crear(self.tamano, self.num_hoyos, self.num_wumpus, semilla)
+
+    def movimientos_min(self, tablero) -> list:
+        return tablero.getAvailableMovesForMin()
+
+    def mover_hoyo(self, tablero, move):
+        tablero.mover_hoyo(*move)
+
+    def utilidad(self, tablero) -> float:
+        return tablero.utility(0)
+
+    def buscar(self, tablero, profundidad: int) -> float:
+        # Se llama a través del módulo para que contar_nodos cuente también la raíz
+        return Wumpus_Urbaneja_Portal_Diego.miniMax(tablero, 0, profundidad, 1, -math.inf, math.inf)[1]
+
+    def contar_nodos(self, tablero, profundidad: int) -> int:
+        return _contar_llamadas(Wumpus_Urbaneja_Portal_Diego, 'miniMax',
+                                lambda: self.buscar(tablero, profundidad))
+
+
+class TablerowumpusEnSitio(TablerowumpusCopia):
+    """
+    Tablerowumpus con miniMaxEnSitio (hacer/deshacer movimientos sobre un único tablero).
+    """
+
+    nombre = 'tablerowumpus_en_sitio'
+
+    def buscar(self, tablero, profundidad: int) -> float:
+        return miniMaxEnSitio(tablero, 0, profundidad, 1, -math.inf, math.inf)[1]
+
+    def contar_nodos(self, tablero, profundidad: int) -> int:
+        control = ControlBusqueda()
+        miniMaxEnSitio(tablero, 0, profundidad, 1, -math.inf, math.inf, control=control)
+        return control.nodos
+
+
+class Bits(TablerowumpusEnSitio):
+    """
+    TableroBits (tablero_bits.py) construido directamente con la misma disposición que Tablerowumpus.
+    """
+
+    nombre = 'tablero_bits'
+
+    def crear(self, semilla: int):
+        return TableroBits.crear(self.tamano, self.num_hoyos, self.num_wumpus, semilla)
+
+
+class Modular(Implementacion):
+    """
+    TableroWumpus de JUEGO_MODULAR/game_logic.py con su miniMax (JUEGO_MODULAR/minimax.py).
+    Genera sus propios tableros, así que la disposición no coincide con la de las demás, y su
+    miniMax juega otras reglas con otra utilidad: el árbol que recorre no es el mismo y sus
+    nodos no se pueden comparar con los de las demás implementaciones.
+    """
+
+    nombre = 'juego_modular'
+    comparable = False
+
+    def __init__(self, tamano: int = 6, num_hoyos: int = 2, num_wumpus: int = 1):
+        super().__init__(tamano, num_hoyos, num_wumpus)
+        # Los módulos de JUEGO_MODULAR se importan entre sí por nombre (from constants import ...)
+        if DIRECTORIO_MODULAR not in sys.path:
+            sys.path.append(DIRECTORIO_MODULAR)
+        import game_logic
+        import minimax
+        self.game_logic = game_logic
+        self.minimax = minimax
+
+    def soportada(self) -> bool:
+        # Siempre coloca un Wumpus y dos hoyos, y simulate_move crea tableros de 6x6
+        return (self.tamano, self.num_hoyos, self.num_wumpus) == (6, 2, 1)
+
+    def crear(self, semilla: int):
+        with _semilla_global(semilla):
+            return self.game_logic.TableroWumpus()
+
+    def movimientos_min(self, tablero) -> list:
+        return tablero.get_available_moves_min()
+
+    def mover_hoyo(self, tablero, move):
+        tablero.move_hoyo(*move)
+
+    def utilidad(self, tablero) -> float:
+        return tablero.utility()
+
+    def buscar(self, tablero, profundidad: int) -> float:
+        # simulate_move crea un TableroWumpus nuevo y consume el generador global: se fija la semilla
+        with _semilla_global(0):
+            return self.minimax.miniMax(tablero, profundidad, True, -math.inf, math.inf)[0]
+
+    def contar_nodos(self, tablero, profundidad: int) -> int:
+        return _contar_llamadas(self.minimax, 'miniMax', lambda: self.buscar(tablero, profundidad))
+
+
+# Nombre -> clase del adaptador, en el orden en que se muestran
+IMPLEMENTACIONES = {clase.nombre: clase for clase in (TablerowumpusCopia, TablerowumpusEnSitio, Bits, Modular)}
@@ -0,0 +1,166 @@
+"""
+Medición de cada caso de la suite sobre un corpus de tableros con semilla.
+
+Las operaciones cortas se miden en ns por operación (mejor de varias repeticiones) y la
+búsqueda en nodos por segundo. La memoria pico se mide con tracemalloc en una pasada aparte,
+para que el trazado no afecte a los tiempos.
+"""
+import datetime
+import math
+import platform
+import time
+import tracemalloc
+from copy import deepcopy
+from typing import Callable, List, Optional
+
+from benchmarks.implementaciones import IMPLEMENTACIONES, Implementacion
+
+CASOS = ('construccion', 'movimientos_min', 'mover_hoyo', 'utilidad', 'minimax')
+
+
+def _memoria_pico(funcion: Callable, argumentos: List[tuple]) -> int:
+    """
+    Bytes asignados como máximo mientras se ejecuta funcion sobre los argumentos.
+    """
+    tracemalloc.start()
+    try:
+        for args in argumentos:
+            funcion(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def medir_operacion(funcion: Callable, preparar: Callable[[], List[tuple]], repeticiones: int) -> dict:
+    """
+    Mide funcion(*args) para cada tupla que devuelve preparar(). preparar se llama fuera del
+    tiempo medido en cada repetición, así que puede devolver tableros nuevos si la operación
+    los modifica.
+    """
+    mejor = math.inf
+    operaciones = 0
+    for _ in range(repeticiones):
+        argumentos = preparar()
+        operaciones = len(argumentos)
+        inicio = time.perf_counter_ns()
+        for args in argumentos:
+            funcion(*args)
+        mejor = min(mejor, time.perf_counter_ns() - inicio)
+    return {
+        'operaciones': operaciones,
+        'ns_op': mejor / operaciones if operaciones else 0.0,
+        'memoria_pico_bytes': _memoria_pico(funcion, preparar()),
+    }
+
+
+def medir_minimax(implementacion: Implementacion, tableros: list, profundidad: int) -> dict:
+    """
+    Búsqueda completa desde cada tablero del corpus a la profundidad indicada.
+    """
+    segundos = 0.0
+    for tablero in tableros:
+        copia = deepcopy(tablero)
+        inicio = time.perf_counter()
+        implementacion.buscar(copia, profundidad)
+        segundos += time.perf_counter() - inicio
+
+    nodos = 0
+    tracemalloc.start()
+    try:
+        for tablero in tableros:
+            nodos += implementacion.contar_nodos(deepcopy(tablero), profundidad)
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'nodos': nodos,
+        'segundos': segundos,
+        'nodos_por_segundo': nodos / segundos if segundos else 0.0,
+        'ns_nodo': segundos * 1e9 / nodos if nodos else 0.0,
+        'memoria_pico_bytes': pico,
+    }
+
+
+def medir_implementacion(implementacion: Implementacion, semillas: List[int], profundidades: List[int],
+                         repeticiones: int, tiempo_max_s: float, casos=CASOS) -> dict:
+    """
+    Ejecuta los casos pedidos para una implementación. Si una profundidad de minimax tarda
+    más de tiempo_max_s, las siguientes se marcan como omitidas.
+    """
+    tableros = [implementacion.crear(semilla) for semilla in semillas]
+    resultado = {}
+
+    if 'construccion' in casos:
+        resultado['construccion'] = medir_operacion(implementacion.crear, lambda: [(s,) for s in semillas],
+                                                    repeticiones)
+    if 'movimientos_min' in casos:
+        resultado['movimientos_min'] = medir_operacion(implementacion.movimientos_min,
+                                                       lambda: [(t,) for t in tableros], repeticiones)
+    if 'mover_hoyo' in casos:
+        # Cada movimiento se aplica sobre su propia copia del tablero de partida
+        def preparar_movimientos():
+            return [(deepcopy(t), move) for t in tableros for move in implementacion.movimientos_min(t)]
+        resultado['mover_hoyo'] = medir_operacion(implementacion.mover_hoyo, preparar_movimientos, repeticiones)
+    if 'utilidad' in casos:
+        resultado['utilidad'] = medir_operacion(implementacion.utilidad, lambda: [(t,) for t in tableros],
+                                                repeticiones)
+    if 'minimax' in casos:
+        resultado['minimax'] = {}
+        omitir = False
+        for profundidad in profundidades:
+            if omitir:
+                resultado['minimax'][str(profundidad)] = {'omitido': True}
+                continue
+            medida = medir_minimax(implementacion, tableros, profundidad)
+            resultado['minimax'][str(profundidad)] = medida
+            omitir = medida['segundos'] > tiempo_max_s
+    return resultado
+
+
+def ejecutar_suite(implementaciones: Optional[List[str]] = None, tableros: int = 10, semilla: int = 0,
+                   profundidades: Optional[List[int]] = None, repeticiones: int = 5, tiempo_max_s: float = 30.0,
+                   casos=CASOS, progreso: Optional[Callable[[str], None]] = None, tamano: int = 6,
+                   num_hoyos: int = 2, num_wumpus: int = 1) -> dict:
+    """
+    Ejecuta la suite y devuelve un diccionario serializable a JSON con el entorno,
+    los parámetros y los resultados por implementación. Las implementaciones que no
+    admiten el tamaño o el número de hoyos y Wumpus pedidos se marcan como omitidas, y
+    'comparable' indica si los nodos de minimax se pueden comparar con los de las demás.
+    """
+    implementaciones = implementaciones or list(IMPLEMENTACIONES)
+    profundidades = profundidades or list(range(2, 9))
+    semillas = [semilla + i for i in range(tableros)]
+
+    resultados = {}
+    for nombre in implementaciones:
+        if progreso is not None:
+            progreso(nombre)
+        implementacion = IMPLEMENTACIONES[nombre](tamano, num_hoyos, num_wumpus)
+        if not implementacion.soportada():
+            resultados[nombre] = {'omitido': True}
+            continue
+        resultados[nombre] = medir_implementacion(implementacion, semillas, profundidades,
+                                                  repeticiones, tiempo_max_s, casos)
+        resultados[nombre]['comparable'] = implementacion.comparable
+
+    return {
+        'entorno': {
+            'python': platform.python_version(),
+            'implementacion': platform.python_implementation(),
+            'plataforma': platform.platform(),
+            'fecha': datetime.datetime.now().isoformat(timespec='seconds'),
+        },
+        'parametros': {
+            'tableros': tableros,
+            'semilla': semilla,
+            'profundidades': profundidades,
+            'repeticiones': repeticiones,
+            'tiempo_max_s': tiempo_max_s,
+            'casos': list(casos),
+            'tamano': tamano,
+            'num_hoyos': num_hoyos,
+            'num_wumpus': num_wumpus,
+        },
+        'resultados': resultados,
+    }
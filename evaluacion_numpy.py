@@ -0,0 +1,112 @@
+"""
+Evaluación vectorizada con NumPy de la utilidad de muchos tableros a la vez.
+
+Los tableros se apilan en un array (B, N, N) de uint8 con los mismos códigos de casilla que
+Wumpus_Urbaneja_Portal_Diego.py, junto con la posición del agente y del oro de cada uno.
+El código de conteos de vecinos penalizados es la suma de los dígitos en base 5 de
+TablasEvaluacion de los vecinos ortogonales (una convolución con la cruz de vecinos).
+utilidades() solo lo necesita en la casilla del agente y lo obtiene leyendo sus cuatro vecinos
+en todos los tableros a la vez; mapa_conteos() calcula el mapa completo con cuatro sumas
+desplazadas, para evaluar cualquier posición del agente. La penalización y la inversa de la
+distancia salen de las mismas tablas que usa Tablerowumpus.utility, así que el resultado
+coincide bit a bit con el de utility().
+
+Necesita NumPy, que el juego no requiere; solo se usa en las ejecuciones de ajuste.
+
+Uso:
+    tableros, agentes, oros = apilar_tableros(lista_de_tableros)
+    valores = utilidades(tableros, agentes, oros, niveles=0)
+"""
+from typing import Iterable, Tuple, Union
+
+import numpy as np
+
+from Wumpus_Urbaneja_Portal_Diego import NUM_TIPOS_CASILLA, Tablerowumpus, obtener_tablas_evaluacion
+
+# Tablas de evaluación convertidas a arrays, por tamaño de tablero
+_TABLAS = {}
+
+
+def _tablas(tamano: int) -> tuple:
+    """
+    Devuelve (digito, penalizacion, inversa_distancia, inversa_sin_oro, vecinos, validos) como arrays
+    para un tamaño. vecinos[indice] son los índices de los cuatro vecinos ortogonales de la casilla
+    (0 donde falta el vecino) y validos[indice] vale 1 en los vecinos que existen y 0 en el resto.
+    """
+    if tamano not in _TABLAS:
+        evaluacion = obtener_tablas_evaluacion(tamano)
+        vecinos = np.zeros((tamano * tamano, 4), dtype=np.intp)
+        validos = np.zeros((tamano * tamano, 4), dtype=np.int16)
+        for indice, vecinos_casilla in enumerate(evaluacion.vecinos):
+            vecinos[indice, :len(vecinos_casilla)] = vecinos_casilla
+            validos[indice, :len(vecinos_casilla)] = 1
+        _TABLAS[tamano] = (np.array(evaluacion.digito, dtype=np.int16),
+                           np.array(evaluacion.penalizacion, dtype=np.float64),
+                           np.array(evaluacion.inversa_distancia, dtype=np.float64),
+                           evaluacion.inversa_sin_oro, vecinos, validos)
+    return _TABLAS[tamano]
+
+
+def mapa_conteos(tableros: np.ndarray) -> np.ndarray:
+    """
+    Para cada casilla de cada tablero, código de conteos de sus vecinos penalizados (el mismo
+    que Tablerowumpus.conteos). Devuelve un array (B, N, N) de int16.
+    """
+    digito = _tablas(tableros.shape[-1])[0][tableros]
+    mapa = np.zeros_like(digito)
+    mapa[:, 1:, :] += digito[:, :-1, :]  # Vecino de arriba
+    mapa[:, :-1, :] += digito[:, 1:, :]  # Vecino de abajo
+    mapa[:, :, 1:] += digito[:, :, :-1]  # Vecino de la izquierda
+    mapa[:, :, :-1] += digito[:, :, 1:]  # Vecino de la derecha
+    return mapa
+
+
+def utilidades(tableros: np.ndarray, agentes: np.ndarray, oros: np.ndarray,
+               niveles: Union[int, np.ndarray] = 0) -> np.ndarray:
+    """
+    Utilidad de cada tablero, igual a Tablerowumpus.utility(nivel).
+    - tableros: (B, N, N) uint8 con los códigos de casilla.
+    - agentes: (B, 2) con (fila, columna) del agente.
+    - oros: (B, 2) con (fila, columna) del oro, o (-1, -1) si ya se recogió (pos_oro None).
+    - niveles: currentLevel, uno común o uno por tablero.
+    Devuelve un array (B,) de float64.
+    """
+    tableros = np.asarray(tableros)
+    agentes = np.asarray(agentes, dtype=np.intp)
+    oros = np.asarray(oros, dtype=np.intp)
+    if tableros.ndim != 3 or tableros.shape[1] != tableros.shape[2] or tableros.dtype != np.uint8:
+        raise ValueError(f"Los tableros deben ser un array (B, N, N) de uint8 (recibido {tableros.shape} "
+                         f"de {tableros.dtype}).")
+    total, tamano = tableros.shape[0], tableros.shape[1]
+    if agentes.shape != (total, 2) or oros.shape != (total, 2):
+        raise ValueError(f"Las posiciones del agente y del oro deben ser arrays ({total}, 2).")
+    if total and tableros.max() >= NUM_TIPOS_CASILLA:
+        raise ValueError(f"Código de casilla desconocido: {tableros.max()}.")
+
+    digito, penalizacion, inversa_distancia, inversa_sin_oro, vecinos, validos = _tablas(tamano)
+    agente = agentes[:, 0] * tamano + agentes[:, 1]
+    con_oro = oros[:, 0] >= 0
+    oro = np.where(con_oro, oros[:, 0] * tamano + oros[:, 1], 0)
+    inversa = np.where(con_oro, inversa_distancia[agente, oro], inversa_sin_oro)
+
+    # Código de conteos en la casilla del agente: suma de los dígitos de sus vecinos
+    celdas = tableros.reshape(total, tamano * tamano)
+    filas = np.arange(total)
+    codigos = np.zeros(total, dtype=np.int16)
+    for lado in range(4):
+        codigos += digito[celdas[filas, vecinos[agente, lado]]] * validos[agente, lado]
+
+    return inversa - penalizacion[codigos] - 0.1 * np.asarray(niveles)
+
+
+def apilar_tableros(tableros: Iterable[Tablerowumpus]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Convierte tableros del mismo tamaño en los arrays (tableros, agentes, oros) que recibe utilidades().
+    """
+    tableros = list(tableros)
+    tamano = tableros[0].tamano if tableros else 0
+    celdas = np.frombuffer(b''.join(tablero.celdas for tablero in tableros), dtype=np.uint8)
+    agentes = np.array([tablero.pos_agente for tablero in tableros], dtype=np.intp).reshape(-1, 2)
+    oros = np.array([tablero.pos_oro if tablero.pos_oro else (-1, -1) for tablero in tableros],
+                    dtype=np.intp).reshape(-1, 2)
+    return celdas.reshape(len(tableros), tamano, tamano), agentes, oros
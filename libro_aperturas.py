@@ -0,0 +1,88 @@
+"""
+Construcción del libro de aperturas del agente con el simulador de partidas.
+
+Juega partidas con el simulador (en varios procesos si se pide), cortándolas tras las primeras
+'plies' jugadas del agente, y guarda el movimiento elegido por la búsqueda en cada una de esas
+posiciones, indexado por el hash Zobrist del tablero. El juego y el simulador consultan el libro
+con --libro antes de buscar (ver LibroAperturas en Wumpus_Urbaneja_Portal_Diego.py).
+
+Conviene construirlo con más profundidad que la usada al jugar: el libro solo se consulta si
+se calculó al menos con la profundidad de la búsqueda que sustituye. Las entradas son de miniMax
+contra hoyos adversarios, y la cabecera lo indica: MCTS y expectimax (--modelo-hoyos aleatorio)
+no lo consultan.
+
+Con una salida .json el libro se guarda en JSON; con cualquier otra extensión, en el formato
+binario de TablaMapeada, que se consulta con mmap sin cargarlo y que los procesos del simulador
+comparten en la caché de páginas del sistema.
+
+Uso:
+    python libro_aperturas.py --salida aperturas.json --partidas 20000 --profundidad 6 --plies 3 --procesos 8
+    python libro_aperturas.py --salida aperturas.wlb --partidas 20000 --profundidad 6 --plies 3 --procesos 8
+    python Wumpus_Urbaneja_Portal_Diego.py --mode text --libro aperturas.wlb
+"""
+import argparse
+import os
+import sys
+from typing import Optional, Callable
+
+from Wumpus_Urbaneja_Portal_Diego import LibroAperturas
+from simulacion_wumpus import ResumenSimulacion, simular, simular_en_paralelo
+
+
+def construir_libro(partidas: int, semilla: int = 0, profundidad: int = 6, plies: int = 3,
+                    procesos: Optional[int] = 1, tamano: int = 6, num_hoyos: int = 2, num_wumpus: int = 1,
+                    entradas_tabla: int = 1 << 16, tamano_lote: int = 250,
+                    progreso: Optional[Callable[[ResumenSimulacion], None]] = None) -> LibroAperturas:
+    """
+    Simula 'partidas' partidas (las mismas que simular() con la misma semilla) y devuelve un libro
+    con las decisiones de búsqueda de las primeras 'plies' jugadas del agente.
+    procesos=1 juega en este proceso; None o más de uno reparte los lotes con el simulador en paralelo.
+    """
+    opciones = {
+        'profundidad': profundidad,
+        'max_turnos': plies,
+        'entradas_tabla': entradas_tabla,
+        'ordenar_movimientos': True,
+        'tamano': tamano,
+        'num_hoyos': num_hoyos,
+        'num_wumpus': num_wumpus,
+        'plies_libro': plies,
+    }
+    if procesos == 1:
+        resumen = simular(partidas, semilla, **opciones)
+    else:
+        resumen = simular_en_paralelo(partidas, semilla, procesos, tamano_lote, progreso, **opciones)
+
+    libro = LibroAperturas(None, tamano, num_hoyos, num_wumpus, profundidad, plies, 'minimax', 'adversario')
+    for clave, movimiento, valor in resumen.aperturas:
+        libro.agregar(clave, movimiento, valor)
+    return libro
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Construcción del libro de aperturas del Wumpus")
+    parser.add_argument('--salida', metavar='FICHERO', required=True,
+                        help='Fichero del libro (.json en JSON; binario con cualquier otra extensión)')
+    parser.add_argument('--partidas', type=int, default=10000, help='Partidas simuladas')
+    parser.add_argument('--semilla', '--seed', type=int, default=0, help='Semilla maestra del simulador')
+    parser.add_argument('--profundidad', type=int, default=6, help='Profundidad de búsqueda de cada entrada')
+    parser.add_argument('--plies', type=int, default=3, help='Jugadas del agente cubiertas desde el inicio')
+    parser.add_argument('--tamano', type=int, default=6, help='Lado del tablero (tamano x tamano)')
+    parser.add_argument('--num-hoyos', type=int, default=2, help='Número de hoyos móviles')
+    parser.add_argument('--num-wumpus', type=int, default=1, help='Número de Wumpus')
+    parser.add_argument('--tabla', type=int, default=1 << 16,
+                        help='Entradas de la tabla de transposición por partida (0 para desactivarla)')
+    parser.add_argument('--procesos', type=int, default=1,
+                        help='Procesos de simulación (1 = en este proceso, 0 = uno por núcleo)')
+    parser.add_argument('--lote', type=int, default=250, help='Partidas por lote enviado a cada proceso')
+    args = parser.parse_args()
+
+    def mostrar_progreso(parcial: ResumenSimulacion):
+        print(f"{parcial.partidas}/{args.partidas} partidas, {len(parcial.aperturas)} posiciones", file=sys.stderr)
+
+    libro = construir_libro(args.partidas, args.semilla, args.profundidad, args.plies,
+                            args.procesos or os.cpu_count(), args.tamano, args.num_hoyos, args.num_wumpus,
+                            args.tabla, args.lote, mostrar_progreso)
+    libro.guardar(args.salida)
+    print(f"Libro de aperturas: {len(libro)} posiciones (profundidad {args.profundidad}, "
+          f"{args.plies} jugadas) en {args.salida}")
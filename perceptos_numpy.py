@@ -0,0 +1,93 @@
+"""
+Recalculo vectorizado con NumPy de la capa de casillas a partir de las capas de objetos.
+
+Los tableros se describen con cuatro máscaras booleanas (B, N, N): hoyos, Wumpus, oro y agente.
+Las brisas y los hedores se obtienen en una sola pasada desplazando las máscaras de hoyos y
+Wumpus hacia sus cuatro vecinos ortogonales, y cada casilla recibe el código compuesto de
+Wumpus_Urbaneja_Portal_Diego.py con la misma prioridad que TableroBits.getMatrix():
+agente, hoyo, Wumpus y, si no hay ninguno, la combinación de brisa, hedor y oro.
+
+Sirve para tableros grandes y como oráculo para validar a escala las actualizaciones
+incrementales de brisas y hedores (actualizar_brisa_al_agregar_hoyo, actualizar_brisa_al_eliminar_hoyo,
+restore_tile). Los perceptos recalculados son siempre exactos; la matriz de Tablerowumpus puede
+perder brisas o hedores al mover hoyos, así que discrepancias() marca justamente esas casillas.
+
+Necesita NumPy, que el juego no requiere.
+"""
+from typing import Iterable, Tuple
+
+import numpy as np
+
+from Wumpus_Urbaneja_Portal_Diego import (BLANCO, AGENTE, HOYO, WUMPUS, ORO, HEDOR, BRISA, HEDOR_ORO,
+                                          BRISA_ORO, BRISA_HEDOR, BRISA_HEDOR_ORO, Tablerowumpus)
+
+# Código de casilla según brisa * 4 + hedor * 2 + oro cuando no hay agente, hoyo ni Wumpus
+CODIGO_PERCEPTOS = np.array([BLANCO, ORO, HEDOR, HEDOR_ORO, BRISA, BRISA_ORO, BRISA_HEDOR, BRISA_HEDOR_ORO],
+                            dtype=np.uint8)
+
+
+def vecinos(mascara: np.ndarray) -> np.ndarray:
+    """
+    Casillas con algún vecino ortogonal marcado en la máscara (B, N, N).
+    """
+    resultado = np.zeros_like(mascara)
+    resultado[:, 1:, :] |= mascara[:, :-1, :]  # Marcada la casilla de arriba
+    resultado[:, :-1, :] |= mascara[:, 1:, :]  # Marcada la casilla de abajo
+    resultado[:, :, 1:] |= mascara[:, :, :-1]  # Marcada la casilla de la izquierda
+    resultado[:, :, :-1] |= mascara[:, :, 1:]  # Marcada la casilla de la derecha
+    return resultado
+
+
+def recalcular_casillas(hoyos: np.ndarray, wumpus: np.ndarray, oro: np.ndarray,
+                        agente: np.ndarray) -> np.ndarray:
+    """
+    Capa de casillas (B, N, N) de uint8 con los códigos compuestos, a partir de las máscaras
+    booleanas (B, N, N) de hoyos, Wumpus, oro y agente.
+    """
+    hoyos = np.asarray(hoyos, dtype=bool)
+    wumpus = np.asarray(wumpus, dtype=bool)
+    oro = np.asarray(oro, dtype=bool)
+    agente = np.asarray(agente, dtype=bool)
+    if hoyos.ndim != 3 or hoyos.shape[1] != hoyos.shape[2]:
+        raise ValueError(f"Las máscaras deben ser arrays (B, N, N) (recibido {hoyos.shape}).")
+    if not hoyos.shape == wumpus.shape == oro.shape == agente.shape:
+        raise ValueError("Las máscaras de hoyos, Wumpus, oro y agente deben tener la misma forma.")
+
+    indice = (vecinos(hoyos).view(np.uint8) << 2) | (vecinos(wumpus).view(np.uint8) << 1) | oro.view(np.uint8)
+    casillas = CODIGO_PERCEPTOS[indice]
+    casillas[wumpus] = WUMPUS
+    casillas[hoyos] = HOYO
+    casillas[agente] = AGENTE
+    return casillas
+
+
+def capas_desde_tableros(tableros: Iterable[Tablerowumpus]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Máscaras (hoyos, wumpus, oro, agente) de tableros del mismo tamaño, a partir de las posiciones
+    que guarda cada Tablerowumpus (pos_hoyos, posiciones_wumpus, pos_oro y pos_agente).
+    """
+    tableros = list(tableros)
+    tamano = tableros[0].tamano if tableros else 0
+    forma = (len(tableros), tamano, tamano)
+    hoyos, wumpus, oro, agente = (np.zeros(forma, dtype=bool) for _ in range(4))
+    for b, tablero in enumerate(tableros):
+        for fila, col in tablero.pos_hoyos:
+            hoyos[b, fila, col] = True
+        for fila, col in tablero.posiciones_wumpus:
+            wumpus[b, fila, col] = True
+        if tablero.pos_oro is not None:
+            oro[b, tablero.pos_oro[0], tablero.pos_oro[1]] = True
+        agente[b, tablero.pos_agente[0], tablero.pos_agente[1]] = True
+    return hoyos, wumpus, oro, agente
+
+
+def discrepancias(tableros: Iterable[Tablerowumpus]) -> np.ndarray:
+    """
+    Máscara (B, N, N) de las casillas en las que la matriz mantenida de forma incremental por
+    cada Tablerowumpus no coincide con la recalculada desde sus capas de objetos.
+    """
+    tableros = list(tableros)
+    tamano = tableros[0].tamano if tableros else 0
+    incrementales = np.frombuffer(b''.join(tablero.celdas for tablero in tableros), dtype=np.uint8)
+    recalculadas = recalcular_casillas(*capas_desde_tableros(tableros))
+    return incrementales.reshape(len(tableros), tamano, tamano) != recalculadas
@@ -0,0 +1,389 @@
+"""
+Simulación sin interfaz de partidas del Wumpus (Tablerowumpus contra hoyos aleatorios o minimax).
+
+No imprime nada por turno ni espera entre movimientos: juega N partidas y resume las tasas
+de victoria/derrota, los turnos y la latencia de cada decisión del agente. Sirve para ajustar
+los pesos de la utilidad y la profundidad.
+
+La semilla de cada partida se deriva de la semilla maestra y del índice de la partida, así que
+los resultados son los mismos se jueguen en un solo proceso o repartidos en varios (--procesos).
+
+Uso:
+    python simulacion_wumpus.py --partidas 10000 --semilla 1 --profundidad 3
+    python simulacion_wumpus.py --partidas 100000 --procesos 8 --json
+    python simulacion_wumpus.py --partidas 500 --hoyos minimax --presupuesto-ms 20 --json
+    python simulacion_wumpus.py --partidas 100 --profundidad 5 --estadisticas busqueda.jsonl
+    python simulacion_wumpus.py --partidas 50 --tamano 12 --num-hoyos 8 --presupuesto-ms 50
+    python simulacion_wumpus.py --partidas 1000 --libro aperturas.json
+    python simulacion_wumpus.py --partidas 1000 --finales finales_6x6.wtb
+    python simulacion_wumpus.py --partidas 200 --motor mcts --iteraciones 1000 --rollout aleatorio
+    python simulacion_wumpus.py --partidas 1000 --modelo-hoyos aleatorio --profundidad 4
+    python simulacion_wumpus.py --partidas 1000 --tablero bits --tabla 65536 --ordenacion
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Optional, Callable, TextIO
+
+from Wumpus_Urbaneja_Portal_Diego import (BLANCO, Tablerowumpus, TablaTransposicion, OrdenadorMovimientos,
+                                          EstadisticasBusqueda, miniMaxEnSitio, expectimaxEnSitio, busquedaIterativa,
+                                          obtener_libro_aperturas, obtener_tablas_finales, BusquedaMCTS, ROLLOUTS_MCTS,
+                                          MODELOS_HOYOS)
+from tablero_bits import TableroBits
+
+# Resultados posibles de una partida simulada ('limite' = se alcanzó el máximo de turnos)
+RESULTADOS = ('win', 'lose_wumpus', 'lose_hoyo', 'limite')
+POLITICAS_HOYOS = ('aleatorio', 'minimax')
+MOTORES = ('minimax', 'mcts')
+TABLEROS = ('matriz', 'bits')  # Tablerowumpus o TableroBits (tablero_bits.py)
+
+MASCARA_64 = (1 << 64) - 1
+
+
+def semilla_partida(semilla_maestra: int, indice: int) -> int:
+    """
+    Deriva la semilla de la partida 'indice' a partir de la semilla maestra (mezcla splitmix64),
+    de modo que partidas vecinas no reciban semillas correlacionadas.
+    """
+    z = (semilla_maestra * 0x9E3779B97F4A7C15 + (indice + 1) * 0xBF58476D1CE4E5B9) & MASCARA_64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASCARA_64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASCARA_64
+    return z ^ (z >> 31)
+
+
+def jugar_partida(semilla: int, profundidad: int = 3, presupuesto_ms: Optional[float] = None,
+                  politica_hoyos: str = 'aleatorio', profundidad_hoyos: int = 2, max_turnos: int = 200,
+                  entradas_tabla: int = 0, ordenar_movimientos: bool = False, estadisticas: bool = False,
+                  tamano: int = 6, num_hoyos: int = 2, num_wumpus: int = 1, libro: Optional[str] = None,
+                  plies_libro: int = 0, finales: Optional[str] = None, motor: str = 'minimax',
+                  iteraciones_mcts: int = 2000, exploracion_mcts: float = math.sqrt(2),
+                  rollout_mcts: str = 'heuristico', modelo_hoyos: str = 'adversario',
+                  tipo_tablero: str = 'matriz') -> dict:
+    """
+    Juega una partida completa sin interfaz y devuelve su resultado, el número de turnos
+    del agente y la latencia de cada decisión del agente en microsegundos.
+    Con estadisticas=True incluye además las estadísticas de búsqueda de cada decisión.
+    Con libro (ruta de un libro de aperturas) el agente juega sus movimientos sin buscar cuando
+    el tablero está en él, y con plies_libro > 0 se devuelven en 'aperturas' las decisiones
+    buscadas de las primeras plies_libro jugadas del agente, como [hash, movimiento, utilidad].
+    Con finales (ruta de unas tablas finales) la búsqueda del agente las consulta en cada nodo.
+    Con motor='mcts' el agente decide con BusquedaMCTS (semilla propia de la partida) en lugar de miniMax.
+    Con modelo_hoyos='aleatorio' el agente planifica los hoyos como azar (expectimaxEnSitio). El libro
+    solo se consulta si lo generaron el mismo motor y modelo de los hoyos, y como libro_aperturas.py
+    lo construye con miniMax contra hoyos adversarios, plies_libro no admite el modelo aleatorio.
+    Con tipo_tablero='bits' la partida se juega sobre TableroBits, con la misma disposición inicial y
+    la misma secuencia aleatoria de los hoyos que Tablerowumpus (su hash no es el de los libros).
+    """
+    if plies_libro > 0 and modelo_hoyos == 'aleatorio':
+        raise ValueError("El libro de aperturas se construye con miniMax: plies_libro no admite "
+                         "modelo_hoyos='aleatorio'.")
+    if tipo_tablero == 'bits':
+        tablero = TableroBits.crear(tamano, num_hoyos, num_wumpus, semilla)
+    else:
+        tablero = Tablerowumpus([[BLANCO for _ in range(tamano)] for _ in range(tamano)], num_hoyos, num_wumpus,
+                                semilla)
+    tabla = TablaTransposicion(entradas_tabla) if entradas_tabla > 0 else None
+    ordenador = OrdenadorMovimientos() if ordenar_movimientos else None
+    libro_aperturas = obtener_libro_aperturas(libro) if libro is not None else None
+    tablas_finales = obtener_tablas_finales(finales) if finales is not None else None
+    mcts = BusquedaMCTS(iteraciones_mcts, exploracion_mcts, rollout_mcts, semilla=semilla) if motor == 'mcts' else None
+
+    latencias_us = []
+    registros = []
+    aperturas = []
+    turnos = 0
+    while not tablero.isGameOver() and turnos < max_turnos:
+        # Turno del Agente (Max)
+        recolector = EstadisticasBusqueda() if estadisticas else None
+        inicio = time.perf_counter_ns()
+        apertura = None
+        if libro_aperturas is not None:
+            apertura = libro_aperturas.consultar(tablero, profundidad if presupuesto_ms is None else 0,
+                                                 motor, modelo_hoyos)
+        if apertura is not None:
+            move, valor = apertura
+        elif mcts is not None:
+            move, valor = mcts.buscar(tablero, presupuesto_ms)
+        else:
+            if ordenador is not None:
+                ordenador.nueva_busqueda()
+            if presupuesto_ms is not None:
+                move, valor, _ = busquedaIterativa(tablero, presupuesto_ms, tabla=tabla, ordenador=ordenador,
+                                                   estadisticas=recolector, finales=tablas_finales,
+                                                   modelo_hoyos=modelo_hoyos)
+            elif modelo_hoyos == 'aleatorio':
+                move, valor = expectimaxEnSitio(tablero, 0, profundidad, 1, -math.inf, math.inf,
+                                                estadisticas=recolector)
+            else:
+                move, valor = miniMaxEnSitio(tablero, 0, profundidad, 1, -math.inf, math.inf, tabla,
+                                             ordenador=ordenador, estadisticas=recolector, finales=tablas_finales)
+            if turnos < plies_libro and move is not None:
+                aperturas.append([tablero.hash, move, valor])
+        latencias_us.append((time.perf_counter_ns() - inicio) // 1000)
+        if recolector is not None:
+            registros.append({'semilla': semilla, 'turno': turnos, **recolector.como_dict()})
+        turnos += 1
+        if move is None:
+            break
+        tablero.aplicar_movimiento_agente(move)
+        if tablero.isGameOver():
+            break
+
+        # Turno de los Hoyos (Min)
+        moves = tablero.getAvailableMovesForMin()
+        if moves:
+            if politica_hoyos == 'minimax':
+                move, _ = miniMaxEnSitio(tablero, 0, profundidad_hoyos, 0, -math.inf, math.inf)
+            else:
+                move = tablero.rng.choice(moves)
+            tablero.aplicar_movimiento_hoyo(*move)
+
+    return {
+        'semilla': semilla,
+        'resultado': tablero.game_result if tablero.isGameOver() else 'limite',
+        'turnos': turnos,
+        'latencias_us': latencias_us,
+        'estadisticas': registros,
+        'aperturas': aperturas,
+    }
+
+
+class ResumenSimulacion:
+    """
+    Acumula los resultados de las partidas de forma incremental. Las latencias se guardan
+    como histograma por microsegundo, así que dos resúmenes pueden combinarse sin perder
+    precisión en los percentiles.
+    """
+
+    def __init__(self):
+        self.partidas = 0
+        self.resultados = Counter()
+        self.turnos = Counter()      # turnos por partida -> número de partidas
+        self.latencias = Counter()   # microsegundos -> número de decisiones
+        self.segundos = 0.0          # tiempo de pared de la simulación
+        self.estadisticas = []       # estadísticas de búsqueda por decisión aún no escritas
+        self.aperturas = []          # decisiones de las primeras jugadas, para el libro de aperturas
+
+    def agregar(self, partida: dict):
+        self.partidas += 1
+        self.resultados[partida['resultado']] += 1
+        self.turnos[partida['turnos']] += 1
+        self.latencias.update(partida['latencias_us'])
+        self.estadisticas.extend(partida['estadisticas'])
+        self.aperturas.extend(partida['aperturas'])
+
+    def combinar(self, otro: 'ResumenSimulacion'):
+        self.partidas += otro.partidas
+        self.resultados.update(otro.resultados)
+        self.turnos.update(otro.turnos)
+        self.latencias.update(otro.latencias)
+        self.estadisticas.extend(otro.estadisticas)
+        self.aperturas.extend(otro.aperturas)
+
+    def volcar_estadisticas(self, salida: Optional[TextIO]):
+        """
+        Escribe las estadísticas de búsqueda pendientes como líneas JSON y las descarta.
+        """
+        if salida is not None:
+            for registro in self.estadisticas:
+                salida.write(json.dumps(registro) + '\n')
+        self.estadisticas = []
+
+    @staticmethod
+    def _percentil(histograma: Counter, p: float) -> float:
+        """
+        Percentil p (0-100) por el método del rango más cercano sobre un histograma.
+        """
+        total = sum(histograma.values())
+        if total == 0:
+            return 0.0
+        objetivo = max(1, math.ceil(p / 100 * total))
+        acumulado = 0
+        for valor in sorted(histograma):
+            acumulado += histograma[valor]
+            if acumulado >= objetivo:
+                return valor
+        return max(histograma)
+
+    def como_dict(self) -> dict:
+        partidas = self.partidas or 1
+        decisiones = sum(self.latencias.values())
+        return {
+            'partidas': self.partidas,
+            'tasas': {resultado: self.resultados[resultado] / partidas for resultado in RESULTADOS},
+            'turnos': {
+                'media': sum(t * n for t, n in self.turnos.items()) / partidas,
+                'p50': self._percentil(self.turnos, 50),
+                'p90': self._percentil(self.turnos, 90),
+                'max': max(self.turnos) if self.turnos else 0,
+            },
+            'latencia_us': {
+                'decisiones': decisiones,
+                'media': sum(v * n for v, n in self.latencias.items()) / decisiones if decisiones else 0.0,
+                'p50': self._percentil(self.latencias, 50),
+                'p90': self._percentil(self.latencias, 90),
+                'p99': self._percentil(self.latencias, 99),
+                'max': max(self.latencias) if self.latencias else 0,
+            },
+            'segundos': self.segundos,
+            'partidas_por_minuto': self.partidas / self.segundos * 60 if self.segundos else 0.0,
+        }
+
+
+def jugar_lote(semilla_maestra: int, primera: int, ultima: int, opciones: dict) -> ResumenSimulacion:
+    """
+    Juega las partidas de índices [primera, ultima) y devuelve su resumen parcial.
+    Es la unidad de trabajo que se envía a los procesos.
+    """
+    resumen = ResumenSimulacion()
+    for indice in range(primera, ultima):
+        resumen.agregar(jugar_partida(semilla_partida(semilla_maestra, indice), **opciones))
+    return resumen
+
+
+def simular(partidas: int, semilla: int = 0, salida_estadisticas: Optional[TextIO] = None,
+            **opciones) -> ResumenSimulacion:
+    """
+    Juega 'partidas' partidas en este proceso y devuelve el resumen.
+    Las estadísticas de búsqueda (opción estadisticas=True) se escriben en salida_estadisticas
+    como líneas JSON al terminar cada partida.
+    """
+    resumen = ResumenSimulacion()
+    inicio = time.perf_counter()
+    for indice in range(partidas):
+        resumen.agregar(jugar_partida(semilla_partida(semilla, indice), **opciones))
+        resumen.volcar_estadisticas(salida_estadisticas)
+    resumen.segundos = time.perf_counter() - inicio
+    return resumen
+
+
+def simular_en_paralelo(partidas: int, semilla: int = 0, procesos: Optional[int] = None, tamano_lote: int = 250,
+                        progreso: Optional[Callable[[ResumenSimulacion], None]] = None,
+                        salida_estadisticas: Optional[TextIO] = None, **opciones) -> ResumenSimulacion:
+    """
+    Reparte las partidas en lotes entre un ProcessPoolExecutor y va combinando los resúmenes
+    parciales a medida que llegan. Como cada partida tiene su propia semilla derivada de la
+    maestra, el resultado no depende del número de procesos ni del orden de llegada.
+    'progreso', si se indica, se llama con el resumen acumulado tras cada lote, y las
+    estadísticas de búsqueda de cada lote se escriben en salida_estadisticas al recibirlo.
+    """
+    resumen = ResumenSimulacion()
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        futuros = [ejecutor.submit(jugar_lote, semilla, primera, min(primera + tamano_lote, partidas), opciones)
+                   for primera in range(0, partidas, tamano_lote)]
+        for futuro in as_completed(futuros):
+            resumen.combinar(futuro.result())
+            resumen.volcar_estadisticas(salida_estadisticas)
+            resumen.segundos = time.perf_counter() - inicio
+            if progreso is not None:
+                progreso(resumen)
+    resumen.segundos = time.perf_counter() - inicio
+    return resumen
+
+
+def imprimir_resumen(datos: dict):
+    print(f"Partidas: {datos['partidas']} en {datos['segundos']:.1f} s "
+          f"({datos['partidas_por_minuto']:.0f} partidas/min)")
+    for resultado, tasa in datos['tasas'].items():
+        print(f"  {resultado:<12} {tasa:7.2%}")
+    turnos = datos['turnos']
+    print(f"Turnos: media {turnos['media']:.1f}, p50 {turnos['p50']}, p90 {turnos['p90']}, máx {turnos['max']}")
+    latencia = datos['latencia_us']
+    print(f"Latencia por decisión (µs): p50 {latencia['p50']}, p90 {latencia['p90']}, "
+          f"p99 {latencia['p99']}, máx {latencia['max']}")
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Simulación sin interfaz de partidas del Wumpus")
+    parser.add_argument('--partidas', type=int, default=1000, help='Número de partidas a jugar')
+    parser.add_argument('--semilla', '--seed', type=int, default=0, help='Semilla maestra de la que se derivan las de cada partida')
+    parser.add_argument('--profundidad', type=int, default=3, help='Profundidad de búsqueda del agente')
+    parser.add_argument('--presupuesto-ms', type=float, default=None,
+                        help='Tiempo por decisión del agente en ms (profundización iterativa)')
+    parser.add_argument('--hoyos', choices=POLITICAS_HOYOS, default='aleatorio',
+                        help='Política de los hoyos: movimiento aleatorio o minimax')
+    parser.add_argument('--profundidad-hoyos', type=int, default=2,
+                        help='Profundidad de búsqueda de los hoyos con --hoyos minimax')
+    parser.add_argument('--tamano', type=int, default=6, help='Lado del tablero (tamano x tamano)')
+    parser.add_argument('--num-hoyos', type=int, default=2, help='Número de hoyos móviles')
+    parser.add_argument('--num-wumpus', type=int, default=1, help='Número de Wumpus')
+    parser.add_argument('--max-turnos', type=int, default=200, help='Turnos del agente antes de cortar la partida')
+    parser.add_argument('--tabla', type=int, default=0,
+                        help='Entradas de la tabla de transposición por partida (0 para desactivarla)')
+    parser.add_argument('--ordenacion', action='store_true', help='Activa la ordenación de movimientos')
+    parser.add_argument('--procesos', type=int, default=1,
+                        help='Procesos de simulación (1 = en este proceso, 0 = uno por núcleo)')
+    parser.add_argument('--lote', type=int, default=250, help='Partidas por lote enviado a cada proceso')
+    parser.add_argument('--progreso', action='store_true', help='Muestra el avance por stderr tras cada lote')
+    parser.add_argument('--estadisticas', metavar='FICHERO', default=None,
+                        help='Escribe las estadísticas de búsqueda de cada decisión en FICHERO (líneas JSON)')
+    parser.add_argument('--libro', metavar='FICHERO', default=None,
+                        help='Libro de aperturas consultado antes de buscar (generado con libro_aperturas.py)')
+    parser.add_argument('--finales', metavar='FICHERO', default=None,
+                        help='Tablas finales consultadas durante la búsqueda (generadas con tablas_finales.py)')
+    parser.add_argument('--motor', choices=MOTORES, default='minimax',
+                        help='Motor de decisión del agente: miniMax o búsqueda Monte Carlo en árbol')
+    parser.add_argument('--iteraciones', type=int, default=2000,
+                        help='Iteraciones por decisión de MCTS (sin --presupuesto-ms)')
+    parser.add_argument('--exploracion', type=float, default=math.sqrt(2), help='Constante de exploración UCT de MCTS')
+    parser.add_argument('--rollout', choices=ROLLOUTS_MCTS, default='heuristico',
+                        help='Rollouts de MCTS: movimientos al azar o agente guiado por la utilidad')
+    parser.add_argument('--modelo-hoyos', choices=MODELOS_HOYOS, default='adversario',
+                        help='Cómo planifica el agente a los hoyos: adversario (miniMax) o azar (expectimax)')
+    parser.add_argument('--tablero', choices=TABLEROS, default='matriz',
+                        help='Representación del tablero: matriz de códigos (Tablerowumpus) o máscaras de bits')
+    parser.add_argument('--json', action='store_true', help='Imprime el resumen en JSON')
+    return parser
+
+
+def opciones_partida(args) -> dict:
+    return {
+        'profundidad': args.profundidad,
+        'presupuesto_ms': args.presupuesto_ms,
+        'politica_hoyos': args.hoyos,
+        'profundidad_hoyos': args.profundidad_hoyos,
+        'max_turnos': args.max_turnos,
+        'entradas_tabla': args.tabla,
+        'ordenar_movimientos': args.ordenacion,
+        'estadisticas': args.estadisticas is not None,
+        'tamano': args.tamano,
+        'num_hoyos': args.num_hoyos,
+        'num_wumpus': args.num_wumpus,
+        'libro': args.libro,
+        'finales': args.finales,
+        'motor': args.motor,
+        'iteraciones_mcts': args.iteraciones,
+        'exploracion_mcts': args.exploracion,
+        'rollout_mcts': args.rollout,
+        'modelo_hoyos': args.modelo_hoyos,
+        'tipo_tablero': args.tablero,
+    }
+
+
+if __name__ == "__main__":
+    args = crear_parser().parse_args()
+    salida = open(args.estadisticas, 'w', encoding='utf-8') if args.estadisticas is not None else None
+    try:
+        if args.procesos == 1:
+            resumen = simular(args.partidas, args.semilla, salida, **opciones_partida(args))
+        else:
+            def mostrar_progreso(parcial: ResumenSimulacion):
+                print(f"{parcial.partidas}/{args.partidas} partidas, "
+                      f"victorias {parcial.resultados['win'] / parcial.partidas:.2%}", file=sys.stderr)
+
+            resumen = simular_en_paralelo(args.partidas, args.semilla, args.procesos or os.cpu_count(), args.lote,
+                                          mostrar_progreso if args.progreso else None, salida,
+                                          **opciones_partida(args))
+    finally:
+        if salida is not None:
+            salida.close()
+    if args.json:
+        print(json.dumps(resumen.como_dict(), indent=2))
+    else:
+        imprimir_resumen(resumen.como_dict())
@@ -0,0 +1,348 @@
+"""
+Construcción por análisis retrógrado de las tablas finales de tableros pequeños con un Wumpus.
+
+Para cada par (Wumpus, oro) se enumeran todas las posiciones (turno, agente, posición anterior,
+combinación de hoyos) y se resuelven hacia atrás desde los finales: en el nivel d quedan
+resueltas las posiciones que se ganan o se pierden en exactamente d jugadas con juego perfecto
+de ambos bandos. Cada posición se guarda como un byte con signo (+d gana el agente, -d pierde,
+0 nadie puede forzar el final), en un fichero que TablasFinales (Wumpus_Urbaneja_Portal_Diego.py)
+abre con mmap y miniMax consulta con --finales.
+
+Las reglas son las de los perceptos exactos (TableroBits): el agente no puede volver a la casilla
+de la que viene y un hoyo no entra en el agente, el Wumpus, el oro ni otro hoyo. Si ningún hoyo
+puede moverse, la posición queda sin resolver (0): miniMaxEnSitio la trata como una hoja y la
+valora con utility(), así que no lleva a ningún final forzado. comprobar_tablas contrasta las
+tablas de un tablero pequeño con una búsqueda exhaustiva sobre TableroBits.
+
+Solo se incluyen los pares (Wumpus, oro) que puede generar colocar_elementos: el Wumpus fuera de
+la casilla inicial del agente y el oro fuera de ella, de sus vecinas y de la del Wumpus. Un tablero
+de 6x6 con dos hoyos tiene 1122 pares, ocupa unos 255 MB y tarda unos minutos por proceso.
+
+Necesita NumPy, que el juego no requiere.
+
+Uso:
+    python tablas_finales.py --salida finales_6x6.wtb --tamano 6 --num-hoyos 2 --procesos 4
+    python Wumpus_Urbaneja_Portal_Diego.py --mode text --finales finales_6x6.wtb
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Callable, Tuple
+
+import numpy as np
+
+from Wumpus_Urbaneja_Portal_Diego import (MAGIA_TABLAS_FINALES, VERSION_TABLAS_FINALES, TablasFinales,
+                                          cabecera_tabla_mapeada, obtener_geometria)
+from tablero_bits import TableroBits
+
+# Tablas de movimientos precalculadas, por (tamano, num_hoyos)
+_MOVIMIENTOS = {}
+
+
+def _movimientos(tamano: int, num_hoyos: int) -> tuple:
+    """
+    Devuelve (vecinos, hueco_vuelta, grado, incluidas, destinos, siguientes) para un tamaño y número de hoyos:
+    - vecinos[a, j]: j-ésimo vecino de la casilla a (-1 si no existe) y hueco_vuelta[a, j] el hueco de a
+      entre los vecinos de ese vecino (la posición anterior tras moverse).
+    - incluidas[c, x]: la combinación de hoyos c ocupa la casilla x.
+    - destinos[c, m] y siguientes[c, m]: casilla de destino y combinación resultante del m-ésimo
+      movimiento de hoyo de la combinación c, sin contar el agente, el Wumpus ni el oro (-1 si no existe).
+    Las combinaciones van en orden colexicográfico, el mismo que usa TablasFinales para indexarlas.
+    """
+    if (tamano, num_hoyos) not in _MOVIMIENTOS:
+        casillas = tamano * tamano
+        vecinos_casilla = obtener_geometria(tamano).vecinos
+        vecinos = np.full((casillas, 4), -1, dtype=np.int64)
+        hueco_vuelta = np.full((casillas, 4), 4, dtype=np.int64)
+        for a in range(casillas):
+            for j, b in enumerate(vecinos_casilla[a]):
+                vecinos[a, j] = b
+                hueco_vuelta[a, j] = vecinos_casilla[b].index(a)
+        grado = np.array([len(v) for v in vecinos_casilla], dtype=np.int64)
+
+        combinaciones = sorted(itertools.combinations(range(casillas), num_hoyos), key=lambda c: c[::-1])
+        indice = {combinacion: i for i, combinacion in enumerate(combinaciones)}
+        incluidas = np.zeros((len(combinaciones), casillas), dtype=bool)
+        destinos = np.full((len(combinaciones), 4 * num_hoyos), -1, dtype=np.int64)
+        siguientes = np.zeros((len(combinaciones), 4 * num_hoyos), dtype=np.int64)
+        for i, combinacion in enumerate(combinaciones):
+            incluidas[i, list(combinacion)] = True
+            m = 0
+            for hoyo in combinacion:
+                for destino in vecinos_casilla[hoyo]:
+                    if destino in combinacion:
+                        continue
+                    resto = [x for x in combinacion if x != hoyo] + [destino]
+                    destinos[i, m] = destino
+                    siguientes[i, m] = indice[tuple(sorted(resto))]
+                    m += 1
+        _MOVIMIENTOS[tamano, num_hoyos] = (vecinos, hueco_vuelta, grado, incluidas, destinos, siguientes)
+    return _MOVIMIENTOS[tamano, num_hoyos]
+
+
+def construir_bloque(tamano: int, num_hoyos: int, wumpus: int, oro: int) -> np.ndarray:
+    """
+    Valores de todas las posiciones con el Wumpus y el oro en las casillas dadas (índices fila * tamano + col),
+    como array int8 indexado por ((turno * casillas + agente) * 5 + hueco_previo) * combinaciones + combinacion.
+    Las posiciones imposibles (agente sobre un hoyo, hoyo sobre el Wumpus, etc.) valen 0.
+    """
+    vecinos, hueco_vuelta, grado, incluidas, destinos, siguientes = _movimientos(tamano, num_hoyos)
+    casillas = tamano * tamano
+    num_combinaciones = len(incluidas)
+    por_turno = casillas * 5 * num_combinaciones
+    # Nodos ficticios tras los de ambos turnos: el agente gana, el agente pierde y movimientos inexistentes
+    gana, pierde, sin_agente, sin_hoyo = 2 * por_turno, 2 * por_turno + 1, 2 * por_turno + 2, 2 * por_turno + 3
+
+    agente, previo, combinacion = np.unravel_index(np.arange(por_turno), (casillas, 5, num_combinaciones))
+    validas = ((agente != wumpus) & (agente != oro) & ~incluidas[combinacion, agente]
+               & ~incluidas[combinacion, wumpus] & ~incluidas[combinacion, oro]
+               & ((previo < grado[agente]) | (previo == 4)))
+
+    # Hijos de las posiciones con turno del agente: pasan al turno de los hoyos o terminan la partida
+    hijos_agente = np.empty((por_turno, 4), dtype=np.int64)
+    for j in range(4):
+        destino = vecinos[agente, j]
+        casilla = np.where(destino < 0, 0, destino)
+        hijo = por_turno + (casilla * 5 + hueco_vuelta[agente, j]) * num_combinaciones + combinacion
+        hijo = np.where(incluidas[combinacion, casilla] | (casilla == wumpus), pierde, hijo)
+        hijo = np.where(casilla == oro, gana, hijo)
+        hijos_agente[:, j] = np.where((destino < 0) | (previo == j), sin_agente, hijo)
+
+    # Hijos de las posiciones con turno de los hoyos; si ninguno puede moverse, la posición es una hoja
+    hijos_hoyos = np.empty((por_turno, destinos.shape[1]), dtype=np.int64)
+    for m in range(destinos.shape[1]):
+        destino = destinos[combinacion, m]
+        hijo = (agente * 5 + previo) * num_combinaciones + siguientes[combinacion, m]
+        hijos_hoyos[:, m] = np.where((destino < 0) | (destino == agente) | (destino == wumpus) | (destino == oro),
+                                     sin_hoyo, hijo)
+    bloqueados = (hijos_hoyos == sin_hoyo).all(axis=1)
+
+    # resultado: 1 gana el agente, -1 pierde, 0 sin resolver; distancia en jugadas hasta el final
+    resultado = np.zeros(2 * por_turno + 4, dtype=np.int8)
+    distancia = np.zeros(2 * por_turno + 4, dtype=np.int16)
+    resultado[[gana, sin_hoyo]] = 1
+    resultado[[pierde, sin_agente]] = -1
+
+    pendientes_agente = np.nonzero(validas)[0]
+    pendientes_hoyos = pendientes_agente[~bloqueados[pendientes_agente]]
+    nivel = 1
+    while True:
+        # El agente gana si algún hijo está ganado desde el nivel anterior y pierde si todos están perdidos
+        resultados, distancias = resultado[hijos_agente[pendientes_agente]], distancia[hijos_agente[pendientes_agente]]
+        gana_agente = ((resultados == 1) & (distancias == nivel - 1)).any(axis=1)
+        pierde_agente = (resultados == -1).all(axis=1) & (distancias.max(axis=1) == nivel - 1) & ~gana_agente
+        # Los hoyos ganan si algún hijo está perdido para el agente y pierden si todos están ganados
+        resultados, distancias = resultado[hijos_hoyos[pendientes_hoyos]], distancia[hijos_hoyos[pendientes_hoyos]]
+        ganan_hoyos = ((resultados == -1) & (distancias == nivel - 1)).any(axis=1)
+        pierden_hoyos = (resultados == 1).all(axis=1) & (distancias.max(axis=1) == nivel - 1) & ~ganan_hoyos
+        if not (gana_agente.any() or pierde_agente.any() or ganan_hoyos.any() or pierden_hoyos.any()):
+            break
+
+        resultado[pendientes_agente[gana_agente]] = 1
+        resultado[pendientes_agente[pierde_agente]] = -1
+        distancia[pendientes_agente[gana_agente | pierde_agente]] = nivel
+        resultado[por_turno + pendientes_hoyos[ganan_hoyos]] = -1
+        resultado[por_turno + pendientes_hoyos[pierden_hoyos]] = 1
+        distancia[por_turno + pendientes_hoyos[ganan_hoyos | pierden_hoyos]] = nivel
+        pendientes_agente = pendientes_agente[~(gana_agente | pierde_agente)]
+        pendientes_hoyos = pendientes_hoyos[~(ganan_hoyos | pierden_hoyos)]
+        nivel += 1
+
+    if nivel > 128:
+        raise ValueError(f"Hay finales a más de 127 jugadas ({nivel - 1}); no caben en un byte.")
+    return (resultado[:2 * por_turno] * distancia[:2 * por_turno]).astype(np.int8)
+
+
+def pares_colocables(tamano: int) -> List[Tuple[int, int]]:
+    """
+    Pares (wumpus, oro) de índices de casilla que puede generar colocar_elementos.
+    """
+    inicio = (tamano - 1) * tamano  # Casilla inicial del agente: esquina inferior izquierda
+    prohibidas_oro = {inicio, *obtener_geometria(tamano).vecinos[inicio]}
+    return [(wumpus, oro) for wumpus in range(tamano * tamano) if wumpus != inicio
+            for oro in range(tamano * tamano) if oro != wumpus and oro not in prohibidas_oro]
+
+
+def _construir_par(argumentos: tuple) -> bytes:
+    tamano, num_hoyos, wumpus, oro = argumentos
+    return construir_bloque(tamano, num_hoyos, wumpus, oro).tobytes()
+
+
+def construir_tablas(ruta: str, tamano: int = 6, num_hoyos: int = 2,
+                     pares: Optional[Iterable[Tuple[int, int]]] = None, procesos: Optional[int] = 1,
+                     progreso: Optional[Callable[[int, int], None]] = None) -> int:
+    """
+    Escribe en 'ruta' las tablas finales de los pares (wumpus, oro) indicados (por defecto, todos los
+    de pares_colocables) y devuelve el número de bloques. Los bloques se escriben según se calculan,
+    así que el fichero no necesita caber en memoria. procesos=1 calcula en este proceso; None o más
+    de uno reparte los pares entre procesos. progreso(hechos, total) se llama tras cada bloque.
+    """
+    pares = list(pares_colocables(tamano) if pares is None else pares)
+    casillas = tamano * tamano
+    indice = np.full(casillas * casillas, -1, dtype=np.int32)
+    for bloque, (wumpus, oro) in enumerate(pares):
+        if not (0 <= wumpus < casillas and 0 <= oro < casillas) or wumpus == oro:
+            raise ValueError(f"Par (Wumpus, oro) no válido en un tablero de {tamano}x{tamano}: {(wumpus, oro)}.")
+        indice[wumpus * casillas + oro] = bloque
+
+    tareas = [(tamano, num_hoyos, wumpus, oro) for wumpus, oro in pares]
+    with open(ruta, 'wb') as fichero:
+        fichero.write(cabecera_tabla_mapeada(MAGIA_TABLAS_FINALES, VERSION_TABLAS_FINALES, tamano, num_hoyos, 1))
+        fichero.write(indice.tobytes())
+        if procesos == 1:
+            bloques = map(_construir_par, tareas)
+            ejecutor = None
+        else:
+            ejecutor = ProcessPoolExecutor(max_workers=procesos)
+            bloques = ejecutor.map(_construir_par, tareas)
+        try:
+            for hechos, datos in enumerate(bloques, 1):
+                fichero.write(datos)
+                if progreso is not None:
+                    progreso(hechos, len(tareas))
+        finally:
+            if ejecutor is not None:
+                ejecutor.shutdown()
+    return len(tareas)
+
+
+# ================================
+# Comprobación por búsqueda exhaustiva
+# ================================
+
+def _forzado(tablero: TableroBits, player: int, jugadas: int, memo: dict) -> int:
+    """
+    1 si el agente puede forzar la victoria en como mucho 'jugadas' jugadas, -1 si los hoyos pueden
+    forzar su derrota y 0 si no. Un bando sin movimientos es una hoja, como en miniMaxEnSitio.
+    """
+    if tablero.isGameOver():
+        return 1 if tablero.game_result == 'win' else -1
+    if jugadas == 0:
+        return 0
+    clave = (tablero.agente, tablero.previo, tablero.hoyos, player, jugadas)
+    if clave in memo:
+        return memo[clave]
+    if player == 1:
+        moves = tablero.getAvailableMovesForMax(*tablero.pos_agente)
+    else:
+        moves = tablero.getAvailableMovesForMin()
+    valores = set()
+    for move in moves:
+        registro = tablero.aplicar_movimiento(move)
+        valores.add(_forzado(tablero, 1 - player, jugadas - 1, memo))
+        tablero.deshacer_movimiento(registro)
+    mejor = 1 if player == 1 else -1
+    if mejor in valores:
+        valor = mejor
+    elif valores == {-mejor}:
+        valor = -mejor
+    else:
+        valor = 0
+    memo[clave] = valor
+    return valor
+
+
+def comprobar_tablas(tamano: int = 4, num_hoyos: int = 2, pares: Optional[Iterable[Tuple[int, int]]] = None,
+                     posiciones: int = 200, profundidad: int = 24,
+                     semilla: Optional[int] = None) -> List[tuple]:
+    """
+    Construye las tablas de los pares dados (por defecto, tres al azar de pares_colocables) en un
+    fichero temporal y contrasta TablasFinales.sondear en 'posiciones' posiciones al azar por par con
+    una búsqueda exhaustiva de hasta 'profundidad' jugadas sobre TableroBits. Devuelve las
+    discrepancias como tuplas (wumpus, oro, agente, previo, hoyos, player, tablas, exhaustiva),
+    donde exhaustiva es la distancia con signo encontrada (0 si no hay final en 'profundidad').
+    """
+    rng = random.Random(semilla)
+    if pares is None:
+        pares = rng.sample(pares_colocables(tamano), 3)
+    pares = list(pares)
+    vecinos = obtener_geometria(tamano).vecinos
+    casillas = tamano * tamano
+    discrepancias = []
+    descriptor, ruta = tempfile.mkstemp(suffix='.wtb')
+    os.close(descriptor)
+    finales = TablasFinales(ruta)
+    try:
+        construir_tablas(ruta, tamano, num_hoyos, pares)
+        for wumpus, oro in pares:
+            memo = {}
+            for _ in range(posiciones):
+                agente = rng.choice([x for x in range(casillas) if x not in (wumpus, oro)])
+                hoyos = rng.sample([x for x in range(casillas) if x not in (wumpus, oro, agente)], num_hoyos)
+                previo = rng.choice([-1, *vecinos[agente]])
+                player = rng.randint(0, 1)
+
+                tablero = TableroBits(tamano)
+                tablero.agente, tablero.previo = agente, previo
+                tablero.wumpus, tablero.oro = 1 << wumpus, 1 << oro
+                tablero.hoyos_idx = hoyos
+                for hoyo in hoyos:
+                    tablero.hoyos |= 1 << hoyo
+
+                valor = finales.sondear(tablero, player)
+                exhaustiva = 0
+                for jugadas in range(1, profundidad + 1):
+                    resultado = _forzado(tablero, player, jugadas, memo)
+                    if resultado:
+                        exhaustiva = resultado * jugadas
+                        break
+                esperado = valor if abs(valor) <= profundidad else 0
+                if esperado != exhaustiva:
+                    discrepancias.append((wumpus, oro, agente, previo, tuple(sorted(hoyos)), player,
+                                          valor, exhaustiva))
+    finally:
+        finales.cerrar()
+        os.remove(ruta)
+    return discrepancias
+
+
+def _casilla(texto: str) -> Tuple[int, int]:
+    fila, col = texto.split(',')
+    return int(fila), int(col)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Construcción de las tablas finales del Wumpus")
+    parser.add_argument('--salida', metavar='FICHERO', help='Fichero de tablas finales')
+    parser.add_argument('--tamano', type=int, default=6, help='Lado del tablero (tamano x tamano)')
+    parser.add_argument('--num-hoyos', type=int, default=2, help='Número de hoyos móviles')
+    parser.add_argument('--wumpus', type=_casilla, metavar='FILA,COL',
+                        help='Solo los pares con el Wumpus en esta casilla')
+    parser.add_argument('--oro', type=_casilla, metavar='FILA,COL', help='Solo los pares con el oro en esta casilla')
+    parser.add_argument('--procesos', type=int, default=1,
+                        help='Procesos de cálculo (1 = en este proceso, 0 = uno por núcleo)')
+    parser.add_argument('--comprobar', type=int, metavar='POSICIONES',
+                        help='En lugar de escribir las tablas, contrasta este número de posiciones por par con '
+                             'una búsqueda exhaustiva (pensado para tableros de 3x3 o 4x4)')
+    parser.add_argument('--semilla', type=int, default=None, help='Semilla de la comprobación')
+    args = parser.parse_args()
+    if args.comprobar is None and args.salida is None:
+        parser.error('se necesita --salida o --comprobar')
+
+    pares = pares_colocables(args.tamano)
+    if args.wumpus is not None:
+        pares = [par for par in pares if par[0] == args.wumpus[0] * args.tamano + args.wumpus[1]]
+    if args.oro is not None:
+        pares = [par for par in pares if par[1] == args.oro[0] * args.tamano + args.oro[1]]
+
+    if args.comprobar is not None:
+        seleccion = pares if args.wumpus is not None or args.oro is not None else None
+        discrepancias = comprobar_tablas(args.tamano, args.num_hoyos, seleccion, args.comprobar,
+                                         semilla=args.semilla)
+        for discrepancia in discrepancias:
+            print(f"Discrepancia (wumpus, oro, agente, previo, hoyos, turno, tablas, exhaustiva): {discrepancia}")
+        print(f"Comprobación de {args.tamano}x{args.tamano} con {args.num_hoyos} hoyos: "
+              f"{len(discrepancias)} discrepancias")
+        sys.exit(1 if discrepancias else 0)
+
+    def mostrar_progreso(hechos: int, total: int):
+        print(f"{hechos}/{total} pares (Wumpus, oro)", file=sys.stderr)
+
+    bloques = construir_tablas(args.salida, args.tamano, args.num_hoyos, pares,
+                               args.procesos or os.cpu_count(), mostrar_progreso)
+    print(f"Tablas finales: {bloques} pares (Wumpus, oro) de {args.tamano}x{args.tamano} con "
+          f"{args.num_hoyos} hoyos en {args.salida}")
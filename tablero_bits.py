@@ -0,0 +1,429 @@
+"""
+Tablero alternativo del juego del Wumpus representado con máscaras de bits (bitboards).
+
+Cada casilla (fila, columna) ocupa el bit fila * tamano + columna de un entero. El agente,
+el Wumpus, el oro y los hoyos se guardan como máscaras y las brisas y hedores no se
+almacenan: se derivan en cada consulta desplazando las máscaras de hoyos y Wumpus.
+Copiar el tablero es copiar un puñado de enteros.
+
+La interfaz es la que usan decidirMovimientoAgente y todas sus búsquedas con Tablerowumpus
+(miniMax / miniMaxEnSitio con tabla de transposición y ordenación, la búsqueda paralela, MCTS y
+expectimax), y simulacion_wumpus.py juega con él con --tablero bits. El hash Zobrist se mantiene de
+forma incremental con las claves de ClavesZobrist, pero sobre las posiciones del agente, los hoyos,
+el Wumpus y el oro (los perceptos se derivan de ellas), así que no coincide con el de Tablerowumpus:
+un libro de aperturas construido con Tablerowumpus no acierta con este tablero. getMatrix() y celdas
+devuelven los códigos de Wumpus_Urbaneja_Portal_Diego.py para las GUIs y las cotas de expectimax.
+También es la referencia de reglas de las tablas finales (tablas_finales.comprobar_tablas).
+A diferencia de la matriz de Tablerowumpus, aquí los perceptos siempre son exactos (no se
+pierden brisas ni hedores al mover hoyos), por lo que la utilidad puede diferir de la de
+Tablerowumpus en las partidas donde la matriz original haya perdido algún percepto.
+"""
+import math
+import random
+from typing import List, Tuple, Optional
+
+from Wumpus_Urbaneja_Portal_Diego import (BLANCO, AGENTE, HOYO, WUMPUS, ORO, HEDOR, BRISA, HEDOR_ORO,
+                                          BRISA_ORO, BRISA_HEDOR, BRISA_HEDOR_ORO, MOVE_UP, MOVE_DOWN,
+                                          MOVE_LEFT, MOVE_RIGHT, DELTAS_MOVIMIENTO, Tablerowumpus,
+                                          obtener_generador_colocaciones, obtener_claves_zobrist,
+                                          obtener_tablas_evaluacion)
+
+# Código de casilla según (brisa, hedor, oro) cuando no hay agente, hoyo ni Wumpus
+CODIGO_PERCEPTOS = {
+    (False, False, False): BLANCO,
+    (False, False, True): ORO,
+    (False, True, False): HEDOR,
+    (False, True, True): HEDOR_ORO,
+    (True, False, False): BRISA,
+    (True, False, True): BRISA_ORO,
+    (True, True, False): BRISA_HEDOR,
+    (True, True, True): BRISA_HEDOR_ORO,
+}
+
+# Tablas precalculadas por tamaño de tablero (compartidas por todos los tableros)
+_TABLAS = {}
+
+
+def _tablas(tamano: int) -> tuple:
+    """
+    Devuelve (lleno, sin_col_izq, sin_col_der, movimientos_agente, vecinos_hoyo) para un tamaño.
+    movimientos_agente[idx] = ((move, destino), ...) en el orden up/down/left/right.
+    vecinos_hoyo[idx] = ((destino, fila, columna), ...) en el orden de obtener_vecinos().
+    """
+    if tamano not in _TABLAS:
+        total = tamano * tamano
+        lleno = (1 << total) - 1
+        col_izq = 0
+        col_der = 0
+        for fila in range(tamano):
+            col_izq |= 1 << (fila * tamano)
+            col_der |= 1 << (fila * tamano + tamano - 1)
+
+        movimientos_agente = []
+        vecinos_hoyo = []
+        for idx in range(total):
+            fila, col = divmod(idx, tamano)
+            movs = []
+            for move in (MOVE_UP, MOVE_DOWN, MOVE_LEFT, MOVE_RIGHT):
+                delta_fila, delta_col = DELTAS_MOVIMIENTO[move]
+                nf, nc = fila + delta_fila, col + delta_col
+                if 0 <= nf < tamano and 0 <= nc < tamano:
+                    movs.append((move, nf * tamano + nc))
+            movimientos_agente.append(tuple(movs))
+
+            vecinos = []
+            for nf, nc in ((fila - 1, col), (fila + 1, col), (fila, col - 1), (fila, col + 1)):
+                if 0 <= nf < tamano and 0 <= nc < tamano:
+                    vecinos.append((nf * tamano + nc, nf, nc))
+            vecinos_hoyo.append(tuple(vecinos))
+
+        _TABLAS[tamano] = (lleno, lleno & ~col_izq, lleno & ~col_der,
+                           tuple(movimientos_agente), tuple(vecinos_hoyo))
+    return _TABLAS[tamano]
+
+
+class TableroBits:
+    """
+    Tablero del Wumpus sobre máscaras de bits, intercambiable con Tablerowumpus en la búsqueda.
+    """
+
+    def __init__(self, tamano: int = 6, semilla: Optional[int] = None):
+        self.tamano = tamano
+        (self._lleno, self._sin_col_izq, self._sin_col_der,
+         self._movimientos_agente, self._vecinos_hoyo) = _tablas(tamano)
+
+        # Posiciones como índices de bit y objetos como máscaras
+        self.agente = (tamano - 1) * tamano  # Esquina inferior izquierda
+        self.previo = -1                     # -1 indica que no hay posición anterior
+        self.wumpus = 0
+        self.oro = 0
+        self.hoyos = 0
+        self.hoyos_idx = []                  # Índice de bit de cada hoyo (mantiene el hoyo_index)
+
+        self.game_over = False
+        self.game_result = None  # Puede ser 'win', 'lose_wumpus' o 'lose_hoyo'
+
+        # Generador de la partida (movimientos al azar de los hoyos), como el de Tablerowumpus
+        self.rng = random.Random(semilla)
+        # Claves Zobrist y tablas de evaluación compartidas con Tablerowumpus (cotas de expectimax)
+        self.zobrist = obtener_claves_zobrist(tamano)
+        self.evaluacion = obtener_tablas_evaluacion(tamano)
+        self.hash = self.calcular_hash()
+
+    @classmethod
+    def crear(cls, tamano: int = 6, num_hoyos: int = 2, num_wumpus: int = 1,
+              semilla: Optional[int] = None) -> 'TableroBits':
+        """
+        Coloca los elementos directamente en las máscaras, con el mismo generador de colocaciones y la
+        misma semilla que Tablerowumpus.crear, así que la disposición coincide con la de ese tablero.
+        """
+        nuevo = cls(tamano, semilla)
+        generador = obtener_generador_colocaciones(tamano, nuevo.pos_agente)
+        # Con el mismo generador que coloca, los movimientos al azar de los hoyos siguen la misma secuencia
+        wumpus, oro, hoyos = generador.colocar(num_hoyos, num_wumpus, nuevo.rng)
+        for idx in wumpus:
+            nuevo.wumpus |= 1 << idx
+        nuevo.oro = 1 << oro
+        nuevo.hoyos_idx = list(hoyos)
+        for idx in nuevo.hoyos_idx:
+            nuevo.hoyos |= 1 << idx
+        nuevo.hash = nuevo.calcular_hash()
+        return nuevo
+
+    @classmethod
+    def desde_tablero(cls, tablero: Tablerowumpus) -> 'TableroBits':
+        """
+        Construye un TableroBits con la misma disposición que un Tablerowumpus.
+        """
+        tamano = tablero.tamano
+        nuevo = cls(tamano)
+        nuevo.agente = tablero.pos_agente[0] * tamano + tablero.pos_agente[1]
+        if tablero.previous_pos is not None:
+            nuevo.previo = tablero.previous_pos[0] * tamano + tablero.previous_pos[1]
+        for row, col in tablero.posiciones_wumpus:
+            nuevo.wumpus |= 1 << (row * tamano + col)
+        if tablero.pos_oro is not None:
+            nuevo.oro = 1 << (tablero.pos_oro[0] * tamano + tablero.pos_oro[1])
+        nuevo.hoyos_idx = [row * tamano + col for row, col in tablero.pos_hoyos]
+        for idx in nuevo.hoyos_idx:
+            nuevo.hoyos |= 1 << idx
+        nuevo.game_over = tablero.game_over
+        nuevo.game_result = tablero.game_result
+        nuevo.rng = tablero.rng
+        nuevo.hash = nuevo.calcular_hash()
+        return nuevo
+
+    def __deepcopy__(self, memo) -> 'TableroBits':
+        """
+        Copia barata: las tablas precalculadas, las claves y el generador se comparten y el resto son enteros.
+        """
+        nuevo = TableroBits.__new__(TableroBits)
+        nuevo.__dict__.update(self.__dict__)
+        nuevo.hoyos_idx = self.hoyos_idx[:]
+        return nuevo
+
+    # ================================
+    # Posiciones en coordenadas (fila, columna)
+    # ================================
+
+    @property
+    def pos_agente(self) -> Tuple[int, int]:
+        return divmod(self.agente, self.tamano)
+
+    @property
+    def previous_pos(self) -> Optional[Tuple[int, int]]:
+        return divmod(self.previo, self.tamano) if self.previo >= 0 else None
+
+    @property
+    def pos_oro(self) -> Optional[Tuple[int, int]]:
+        return divmod(self.oro.bit_length() - 1, self.tamano) if self.oro else None
+
+    @property
+    def pos_wumpus(self) -> Optional[Tuple[int, int]]:
+        return divmod(self.wumpus.bit_length() - 1, self.tamano) if self.wumpus else None
+
+    @property
+    def posiciones_wumpus(self) -> List[Tuple[int, int]]:
+        return [divmod(idx, self.tamano) for idx in range(self.tamano * self.tamano) if self.wumpus >> idx & 1]
+
+    @property
+    def pos_hoyos(self) -> List[Tuple[int, int]]:
+        return [divmod(idx, self.tamano) for idx in self.hoyos_idx]
+
+    @property
+    def num_hoyos(self) -> int:
+        return len(self.hoyos_idx)
+
+    @property
+    def num_wumpus(self) -> int:
+        return self.wumpus.bit_count()
+
+    # ================================
+    # Hash Zobrist
+    # ================================
+
+    def calcular_hash(self) -> int:
+        """
+        Calcula desde cero el hash Zobrist: la clave de cada objeto (agente, hoyos, Wumpus y oro) en
+        su casilla y la de la posición anterior del agente. Los movimientos lo actualizan con XOR.
+        """
+        claves = self.zobrist.casillas_planas
+        valor = claves[self.agente][AGENTE]
+        for idx in range(self.tamano * self.tamano):
+            if self.hoyos >> idx & 1:
+                valor ^= claves[idx][HOYO]
+            if self.wumpus >> idx & 1:
+                valor ^= claves[idx][WUMPUS]
+            if self.oro >> idx & 1:
+                valor ^= claves[idx][ORO]
+        if self.previo >= 0:
+            fila, col = divmod(self.previo, self.tamano)
+            valor ^= self.zobrist.previa[fila][col]
+        return valor
+
+    # ================================
+    # Perceptos derivados
+    # ================================
+
+    def vecindad(self, mascara: int) -> int:
+        """
+        Devuelve la máscara de las casillas adyacentes (4-vecindad) a cualquier bit de la máscara.
+        """
+        tamano = self.tamano
+        return ((mascara >> tamano)
+                | ((mascara << tamano) & self._lleno)
+                | ((mascara & self._sin_col_izq) >> 1)
+                | ((mascara & self._sin_col_der) << 1))
+
+    def brisa(self) -> int:
+        """
+        Máscara de las casillas con brisa (adyacentes a algún hoyo).
+        """
+        return self.vecindad(self.hoyos)
+
+    def hedor(self) -> int:
+        """
+        Máscara de las casillas con hedor (adyacentes al Wumpus).
+        """
+        return self.vecindad(self.wumpus)
+
+    def getMatrix(self) -> List[List[int]]:
+        """
+        Retorna la matriz con los códigos de casilla de Tablerowumpus, para dibujar el tablero.
+        """
+        brisa = self.brisa()
+        hedor = self.hedor()
+        agente = 1 << self.agente
+        matrix = []
+        for fila in range(self.tamano):
+            fila_codigos = []
+            for col in range(self.tamano):
+                bit = 1 << (fila * self.tamano + col)
+                if bit & agente:
+                    fila_codigos.append(AGENTE)
+                elif bit & self.hoyos:
+                    fila_codigos.append(HOYO)
+                elif bit & self.wumpus:
+                    fila_codigos.append(WUMPUS)
+                else:
+                    fila_codigos.append(CODIGO_PERCEPTOS[(bool(bit & brisa), bool(bit & hedor), bool(bit & self.oro))])
+            matrix.append(fila_codigos)
+        return matrix
+
+    @property
+    def celdas(self) -> bytes:
+        """
+        Códigos de casilla en orden plano, como Tablerowumpus.celdas (se calcula en cada consulta).
+        """
+        return bytes(tile for fila in self.getMatrix() for tile in fila)
+
+    def utility(self, currentLevel: int) -> float:
+        """
+        Misma función de utilidad que Tablerowumpus.utility, contando las casillas de
+        penalización alrededor del agente con operaciones sobre máscaras.
+        """
+        fila, col = divmod(self.agente, self.tamano)
+        if self.oro:
+            fila_oro, col_oro = divmod(self.oro.bit_length() - 1, self.tamano)
+            distancia = math.sqrt((fila_oro - fila) ** 2 + (col_oro - col) ** 2)
+        else:
+            distancia = 0  # Cuando el oro ya ha sido recolectado
+
+        # Vecinos del agente que no contienen objetos (agente, hoyo o Wumpus)
+        vecinos = self.vecindad(1 << self.agente) & ~(self.hoyos | self.wumpus)
+        brisa = self.brisa() & vecinos
+        hedor = self.hedor() & vecinos
+        oro = self.oro
+
+        penalizacion_total = 0.0
+        penalizacion_total += 0.2 * (hedor & ~brisa & ~oro).bit_count()    # HEDOR
+        penalizacion_total += 0.2 * (brisa & ~hedor & ~oro).bit_count()    # BRISA
+        penalizacion_total += 0.5 * (brisa & hedor & ~oro).bit_count()     # BRISA_HEDOR
+        penalizacion_total += 2 * (brisa & ~hedor & oro).bit_count()       # BRISA_ORO
+        penalizacion_total += 2 * (hedor & ~brisa & oro).bit_count()       # HEDOR_ORO
+        penalizacion_total += 0.05 * (brisa & hedor & oro).bit_count()     # BRISA_HEDOR_ORO
+
+        costo_por_movimiento = 0.1 * currentLevel
+        return (1 / (distancia + 1e-2)) - penalizacion_total - costo_por_movimiento
+
+    # ================================
+    # Movimientos
+    # ================================
+
+    def getAvailableMovesForMax(self, row: int, col: int) -> List[str]:
+        """
+        Movimientos del agente desde (row, col), excluyendo volver a la posición anterior.
+        """
+        previo = self.previo
+        return [move for move, destino in self._movimientos_agente[row * self.tamano + col] if destino != previo]
+
+    def getAvailableMovesForMin(self) -> List[Tuple[int, int, int]]:
+        """
+        Movimientos de los hoyos como tuplas (hoyo_index, new_row, new_col). Un hoyo no puede
+        moverse sobre el agente, el Wumpus, el oro ni otro hoyo.
+        """
+        ocupadas = (1 << self.agente) | self.wumpus | self.oro | self.hoyos
+        moves = []
+        for hoyo_index, idx in enumerate(self.hoyos_idx):
+            for destino, fila, col in self._vecinos_hoyo[idx]:
+                if not (ocupadas >> destino) & 1:
+                    moves.append((hoyo_index, fila, col))
+        return moves
+
+    def moveCanBeMade(self, player: int) -> bool:
+        if player == 1:
+            return len(self.getAvailableMovesForMax(*self.pos_agente)) > 0
+        return len(self.getAvailableMovesForMin()) > 0
+
+    def isGameOver(self) -> bool:
+        return self.game_over
+
+    def mover_agente(self, old_row: int, old_col: int, new_row: int, new_col: int):
+        """
+        Mueve el agente; los perceptos de la casilla que deja no necesitan restaurarse y el hash se
+        actualiza con las claves del agente y de la posición anterior.
+        """
+        previa = self.zobrist.previa
+        if self.previo >= 0:
+            fila, col = divmod(self.previo, self.tamano)
+            self.hash ^= previa[fila][col]
+        self.hash ^= previa[old_row][old_col]
+        self.previo = old_row * self.tamano + old_col
+        claves = self.zobrist.casillas_planas
+        self.hash ^= claves[self.agente][AGENTE]
+        self.agente = new_row * self.tamano + new_col
+        self.hash ^= claves[self.agente][AGENTE]
+
+    def verificar_estado_juego(self, row: int, col: int):
+        """
+        Verifica si el agente ha ganado o perdido después de un movimiento.
+        """
+        bit = 1 << (row * self.tamano + col)
+        if bit & self.oro:
+            self.game_over = True
+            self.game_result = 'win'
+            self.oro = 0  # El oro ha sido recolectado
+            self.hash ^= self.zobrist.casillas_planas[row * self.tamano + col][ORO]
+        elif bit & self.wumpus:
+            self.game_over = True
+            self.game_result = 'lose_wumpus'
+        elif bit & self.hoyos:
+            self.game_over = True
+            self.game_result = 'lose_hoyo'
+
+    def _mover_en_direccion(self, move: str):
+        row, col = divmod(self.agente, self.tamano)
+        delta_row, delta_col = DELTAS_MOVIMIENTO[move]
+        new_row, new_col = row + delta_row, col + delta_col
+        if 0 <= new_row < self.tamano and 0 <= new_col < self.tamano:
+            self.mover_agente(row, col, new_row, new_col)
+            self.verificar_estado_juego(new_row, new_col)
+
+    def up(self, row: int, col: int):
+        self._mover_en_direccion(MOVE_UP)
+
+    def down(self, row: int, col: int):
+        self._mover_en_direccion(MOVE_DOWN)
+
+    def left(self, row: int, col: int):
+        self._mover_en_direccion(MOVE_LEFT)
+
+    def right(self, row: int, col: int):
+        self._mover_en_direccion(MOVE_RIGHT)
+
+    def mover_hoyo(self, hoyo_index: int, new_row: int, new_col: int):
+        """
+        Mueve un hoyo; las brisas se derivan de la máscara de hoyos, no hay que actualizarlas.
+        """
+        destino = new_row * self.tamano + new_col
+        claves = self.zobrist.casillas_planas
+        self.hash ^= claves[self.hoyos_idx[hoyo_index]][HOYO] ^ claves[destino][HOYO]
+        self.hoyos ^= (1 << self.hoyos_idx[hoyo_index]) | (1 << destino)
+        self.hoyos_idx[hoyo_index] = destino
+
+    # ================================
+    # Búsqueda en sitio (aplicar / deshacer)
+    # ================================
+
+    def aplicar_movimiento_agente(self, move: str) -> tuple:
+        registro = (self.agente, self.previo, self.oro, self.game_over, self.game_result, None, self.hash)
+        self._mover_en_direccion(move)
+        return registro
+
+    def aplicar_movimiento_hoyo(self, hoyo_index: int, new_row: int, new_col: int) -> tuple:
+        registro = (self.agente, self.previo, self.oro, self.game_over, self.game_result,
+                    (hoyo_index, self.hoyos_idx[hoyo_index]), self.hash)
+        self.mover_hoyo(hoyo_index, new_row, new_col)
+        return registro
+
+    def aplicar_movimiento(self, move) -> tuple:
+        if isinstance(move, str):
+            return self.aplicar_movimiento_agente(move)
+        return self.aplicar_movimiento_hoyo(*move)
+
+    def deshacer_movimiento(self, registro: tuple):
+        self.agente, self.previo, self.oro, self.game_over, self.game_result, hoyo, self.hash = registro
+        if hoyo is not None:
+            hoyo_index, idx = hoyo
+            self.hoyos ^= (1 << self.hoyos_idx[hoyo_index]) | (1 << idx)
+            self.hoyos_idx[hoyo_index] = idx
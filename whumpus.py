@@ -5,6 +5,32 @@ from tkinter import messagebox
 # Definir direcciones
 DIRECCIONES = ['N', 'W', 'S', 'E']  # Norte, Oeste, Sur, Este
 
+# Casillas libres y vecinas de cada casilla, precalculadas por (filas, columnas, posición del agente)
+# y compartidas por todas las partidas
+_TABLAS_COLOCACION = {}
+
+
+def obtener_tablas_colocacion(filas, columnas, agente_pos):
+    """
+    Devuelve (reserva, posicion, vecinos) con las casillas como índices fila * columnas + col:
+    reserva es la lista de casillas sin la del agente, posicion[casilla] el índice de la casilla
+    en reserva (-1 para la del agente) y vecinos[casilla] sus casillas contiguas.
+    """
+    clave = (filas, columnas, agente_pos)
+    if clave not in _TABLAS_COLOCACION:
+        agente = agente_pos[0] * columnas + agente_pos[1]
+        reserva = [casilla for casilla in range(filas * columnas) if casilla != agente]
+        posicion = [-1] * (filas * columnas)
+        for i, casilla in enumerate(reserva):
+            posicion[casilla] = i
+        vecinos = []
+        for casilla in range(filas * columnas):
+            fila, col = divmod(casilla, columnas)
+            contiguas = ((fila - 1, col), (fila + 1, col), (fila, col - 1), (fila, col + 1))
+            vecinos.append([nf * columnas + nc for nf, nc in contiguas if 0 <= nf < filas and 0 <= nc < columnas])
+        _TABLAS_COLOCACION[clave] = (reserva, posicion, vecinos)
+    return _TABLAS_COLOCACION[clave]
+
 
 class Celda:
     """Clase que representa cada celda del tablero."""
@@ -41,37 +67,45 @@ class JuegoWumpus:
         self.tablero[fila][col].agente = True
 
     def colocar_elementos(self):
-        # Colocar Wumpus
-        while True:
-            fila = random.randint(0, self.filas - 1)
-            col = random.randint(0, self.columnas - 1)
-            if (fila, col) != self.agente_pos:
-                self.tablero[fila][col].wumpus = True
-                self.wumpus_pos = (fila, col)
-                self.actualizar_percepciones(fila, col, tipo='wumpus')
-                break
-
-        # Colocar Hoyos
-        colocados = 0
-        while colocados < self.num_hoyos:
-            fila = random.randint(0, self.filas - 1)
-            col = random.randint(0, self.columnas - 1)
-            if (fila, col) != self.agente_pos and not self.tablero[fila][col].wumpus and not self.tablero[fila][
-                col].hoyo:
-                # Verificar que no esté contiguo al Wumpus
-                if not self.adyacente(fila, col, self.wumpus_pos[0], self.wumpus_pos[1]):
-                    self.tablero[fila][col].hoyo = True
-                    self.actualizar_percepciones(fila, col, tipo='hoyo')
-                    colocados += 1
-
-        # Colocar Oro
-        while True:
-            fila = random.randint(0, self.filas - 1)
-            col = random.randint(0, self.columnas - 1)
-            if (fila, col) != self.agente_pos and not self.tablero[fila][col].wumpus and not self.tablero[fila][
-                col].hoyo:
-                self.tablero[fila][col].oro = True
-                break
+        # Un único Fisher-Yates parcial sobre las casillas libres precalculadas: cada elemento se sortea
+        # en la zona de la reserva que cumple sus restricciones y se intercambia a la parte ya colocada,
+        # sin reintentos, sin sacar elementos de la lista y sin ordenarla
+        reserva, posicion, vecinos = obtener_tablas_colocacion(self.filas, self.columnas, self.agente_pos)
+        reserva = reserva[:]
+        posicion = posicion[:]
+
+        def intercambiar(i, j):
+            reserva[i], reserva[j] = reserva[j], reserva[i]
+            posicion[reserva[i]] = i
+            posicion[reserva[j]] = j
+
+        # Colocar Wumpus en cualquier casilla libre (queda en reserva[0])
+        intercambiar(0, random.randrange(len(reserva)))
+        fila, col = divmod(reserva[0], self.columnas)
+        self.tablero[fila][col].wumpus = True
+        self.wumpus_pos = (fila, col)
+        self.actualizar_percepciones(fila, col, tipo='wumpus')
+
+        # Colocar Hoyos en reserva[1:permitidas]: las casillas contiguas al Wumpus pasan al final de esa zona
+        permitidas = len(reserva)
+        for vecino in vecinos[reserva[0]]:
+            i = posicion[vecino]
+            if i > 0:
+                permitidas -= 1
+                intercambiar(i, permitidas)
+        if permitidas - 1 < self.num_hoyos:
+            raise ValueError("No hay suficientes casillas para colocar los hoyos sin que estén contiguos al Wumpus.")
+        for colocado in range(1, self.num_hoyos + 1):
+            intercambiar(colocado, random.randrange(colocado, permitidas))
+            fila, col = divmod(reserva[colocado], self.columnas)
+            self.tablero[fila][col].hoyo = True
+            self.actualizar_percepciones(fila, col, tipo='hoyo')
+
+        # Colocar Oro en cualquiera de las casillas restantes
+        if len(reserva) <= self.num_hoyos + 1:
+            raise ValueError("No quedan casillas libres para colocar el oro.")
+        fila, col = divmod(reserva[random.randrange(self.num_hoyos + 1, len(reserva))], self.columnas)
+        self.tablero[fila][col].oro = True
 
     def adyacente(self, fila1, col1, fila2, col2):
         """Verifica si dos posiciones están adyacentes (arriba, abajo, izquierda, derecha)."""
@@ -1,3 +1,4 @@
+import argparse
 import tkinter as tk
 import random
 from tkinter import messagebox
@@ -9,6 +10,33 @@ import math
 # Definir direcciones
 DIRECCIONES = ['N', 'W', 'S', 'E']  # Norte, Oeste, Sur, Este
 
+# Casillas libres y vecinas de cada casilla, precalculadas por (filas, columnas, posición del agente)
+# y compartidas por todas las partidas
+_TABLAS_COLOCACION = {}
+
+
+def obtener_tablas_colocacion(filas, columnas, agente_pos):
+    """
+    Devuelve (reserva, posicion, vecinos) con las casillas como índices fila * columnas + col:
+    reserva es la lista de casillas sin la del agente, posicion[casilla] el índice de la casilla
+    en reserva (-1 para la del agente) y vecinos[casilla] sus casillas contiguas.
+    """
+    clave = (filas, columnas, agente_pos)
+    if clave not in _TABLAS_COLOCACION:
+        agente = agente_pos[0] * columnas + agente_pos[1]
+        reserva = [casilla for casilla in range(filas * columnas) if casilla != agente]
+        posicion = [-1] * (filas * columnas)
+        for i, casilla in enumerate(reserva):
+            posicion[casilla] = i
+        vecinos = []
+        for casilla in range(filas * columnas):
+            fila, col = divmod(casilla, columnas)
+            contiguas = ((fila - 1, col), (fila + 1, col), (fila, col - 1), (fila, col + 1))
+            vecinos.append([nf * columnas + nc for nf, nc in contiguas if 0 <= nf < filas and 0 <= nc < columnas])
+        _TABLAS_COLOCACION[clave] = (reserva, posicion, vecinos)
+    return _TABLAS_COLOCACION[clave]
+
+
 class Celda:
     """Clase que representa cada celda del tablero. y nada mas"""
 
@@ -48,36 +76,46 @@ class JuegoWumpus:
         self.tablero[fila][col].agente = True
 
     def colocar_elementos(self):
-        # Colocar Wumpus
-        while True:
-            fila = random.randint(0, self.filas - 1)
-            col = random.randint(0, self.columnas - 1)
-            if (fila, col) != self.agente_pos:
-                self.tablero[fila][col].wumpus = True
-                self.wumpus_pos = (fila, col)
-                self.actualizar_percepciones(fila, col, tipo='wumpus')
-                break
-
-        # Colocar Hoyos
-        colocados = 0
-        while colocados < self.num_hoyos:
-            fila = random.randint(0, self.filas - 1)
-            col = random.randint(0, self.columnas - 1)
-            if (fila, col) != self.agente_pos and not self.tablero[fila][col].wumpus and not self.tablero[fila][col].hoyo:
-                # Verificar que no esté contiguo al Wumpus
-                if not self.adyacente(fila, col, self.wumpus_pos[0], self.wumpus_pos[1]):
-                    self.tablero[fila][col].hoyo = True
-                    self.actualizar_percepciones(fila, col, tipo='hoyo')
-                    colocados += 1
-
-        # Colocar Oro
-        while True:
-            fila = random.randint(0, self.filas - 1)
-            col = random.randint(0, self.columnas - 1)
-            if (fila, col) != self.agente_pos and not self.tablero[fila][col].wumpus and not self.tablero[fila][col].hoyo:
-                self.tablero[fila][col].oro = True
-                self.oro_pos = (fila, col)
-                break
+        # Un único Fisher-Yates parcial sobre las casillas libres precalculadas: cada elemento se sortea
+        # en la zona de la reserva que cumple sus restricciones y se intercambia a la parte ya colocada,
+        # sin reintentos, sin sacar elementos de la lista y sin ordenarla
+        reserva, posicion, vecinos = obtener_tablas_colocacion(self.filas, self.columnas, self.agente_pos)
+        reserva = reserva[:]
+        posicion = posicion[:]
+
+        def intercambiar(i, j):
+            reserva[i], reserva[j] = reserva[j], reserva[i]
+            posicion[reserva[i]] = i
+            posicion[reserva[j]] = j
+
+        # Colocar Wumpus en cualquier casilla libre (queda en reserva[0])
+        intercambiar(0, random.randrange(len(reserva)))
+        fila, col = divmod(reserva[0], self.columnas)
+        self.tablero[fila][col].wumpus = True
+        self.wumpus_pos = (fila, col)
+        self.actualizar_percepciones(fila, col, tipo='wumpus')
+
+        # Colocar Hoyos en reserva[1:permitidas]: las casillas contiguas al Wumpus pasan al final de esa zona
+        permitidas = len(reserva)
+        for vecino in vecinos[reserva[0]]:
+            i = posicion[vecino]
+            if i > 0:
+                permitidas -= 1
+                intercambiar(i, permitidas)
+        if permitidas - 1 < self.num_hoyos:
+            raise ValueError("No hay suficientes casillas para colocar los hoyos sin que estén contiguos al Wumpus.")
+        for colocado in range(1, self.num_hoyos + 1):
+            intercambiar(colocado, random.randrange(colocado, permitidas))
+            fila, col = divmod(reserva[colocado], self.columnas)
+            self.tablero[fila][col].hoyo = True
+            self.actualizar_percepciones(fila, col, tipo='hoyo')
+
+        # Colocar Oro en cualquiera de las casillas restantes
+        if len(reserva) <= self.num_hoyos + 1:
+            raise ValueError("No quedan casillas libres para colocar el oro.")
+        fila, col = divmod(reserva[random.randrange(self.num_hoyos + 1, len(reserva))], self.columnas)
+        self.tablero[fila][col].oro = True
+        self.oro_pos = (fila, col)
 
     def adyacente(self, fila1, col1, fila2, col2):
         """Verifica si dos posiciones están adyacentes (arriba, abajo, izquierda, derecha)."""
@@ -277,13 +315,120 @@ class JuegoWumpus:
             self.gui.actualizar_visual()
             self.gui.info_label.config(text="Juego reiniciado. Elige un modo para comenzar.")
 
+class BaseConocimiento:
+    """
+    Conocimiento del agente guardado como máscaras de bits sobre el tablero (bit fila * columnas + col):
+    casillas visitadas, seguras, posibles Wumpus y posibles hoyos. Las percepciones se infieren con
+    operaciones de bits sobre las máscaras de vecinos precalculadas:
+    - Sin hedor, los vecinos no tienen Wumpus; con hedor, el único Wumpus está en la intersección de
+      los vecinos de todas las casillas con hedor, lo que acaba localizándolo.
+    - Sin brisa, los vecinos no tienen hoyo; con brisa, un vecino aún no descartado es un posible hoyo.
+    La frontera segura (seguras y no visitadas) se mantiene al día, así que consultarla es O(1).
+    """
+
+    def __init__(self, filas, columnas):
+        self.filas = filas
+        self.columnas = columnas
+        self.todas = (1 << (filas * columnas)) - 1
+        # vecinos[indice]: máscara de las casillas adyacentes
+        self.vecinos = []
+        for fila in range(filas):
+            for col in range(columnas):
+                mascara = 0
+                for nf, nc in ((fila - 1, col), (fila + 1, col), (fila, col - 1), (fila, col + 1)):
+                    if 0 <= nf < filas and 0 <= nc < columnas:
+                        mascara |= 1 << (nf * columnas + nc)
+                self.vecinos.append(mascara)
+        self.visitadas = 0
+        self.sin_wumpus = 0                # Casillas donde se sabe que no está el Wumpus
+        self.candidatas_wumpus = self.todas  # Intersección de los vecinos de las casillas con hedor
+        self.sin_hoyo = 0                  # Casillas donde se sabe que no hay hoyo
+        self.con_brisa = 0                 # Casillas visitadas con brisa
+        self.seguras = 0
+        self.frontera = 0                  # Seguras aún no visitadas
+
+    def bit(self, fila, col):
+        return 1 << (fila * self.columnas + col)
+
+    def posicion(self, indice):
+        return divmod(indice, self.columnas)
+
+    def actualizar(self, fila, col, hedor, brisa):
+        """
+        Registra la visita a (fila, col) con sus percepciones y recalcula las máscaras derivadas.
+        """
+        bit = self.bit(fila, col)
+        vecinos = self.vecinos[fila * self.columnas + col]
+        self.visitadas |= bit
+        self.sin_wumpus |= bit
+        self.sin_hoyo |= bit
+
+        if hedor:
+            self.candidatas_wumpus &= vecinos
+        else:
+            self.sin_wumpus |= vecinos
+        if brisa:
+            self.con_brisa |= bit
+        else:
+            self.sin_hoyo |= vecinos
+
+        # Con algún hedor percibido, el Wumpus no puede estar fuera de las candidatas
+        descartadas_wumpus = self.sin_wumpus
+        if self.candidatas_wumpus != self.todas:
+            descartadas_wumpus |= self.todas & ~self.candidatas_wumpus
+        self.seguras = descartadas_wumpus & self.sin_hoyo
+        self.frontera = self.seguras & ~self.visitadas
+
+    @property
+    def posible_wumpus(self):
+        """Casillas donde aún puede estar el Wumpus según algún hedor percibido (0 si no hay ninguno)."""
+        if self.candidatas_wumpus == self.todas:
+            return 0
+        return self.candidatas_wumpus & ~self.sin_wumpus
+
+    @property
+    def posible_hoyo(self):
+        """Vecinos no descartados de las casillas con brisa."""
+        posibles = 0
+        brisas = self.con_brisa
+        while brisas:
+            bit = brisas & -brisas
+            posibles |= self.vecinos[bit.bit_length() - 1]
+            brisas ^= bit
+        return posibles & ~self.sin_hoyo
+
+    def wumpus_localizado(self):
+        """Posición del Wumpus si las percepciones solo dejan una casilla posible; None si no."""
+        posibles = self.posible_wumpus
+        if posibles and posibles & (posibles - 1) == 0:
+            return self.posicion(posibles.bit_length() - 1)
+        return None
+
+    def es_visitada(self, fila, col):
+        return bool(self.visitadas & self.bit(fila, col))
+
+    def celdas_frontera(self):
+        """Casillas seguras sin visitar, como lista de posiciones."""
+        celdas = []
+        frontera = self.frontera
+        while frontera:
+            bit = frontera & -frontera
+            celdas.append(self.posicion(bit.bit_length() - 1))
+            frontera ^= bit
+        return celdas
+
+
 class AgenteInteligente:
-    """Clase que representa al agente inteligente que juega automáticamente usando A*."""
+    """
+    Clase que representa al agente inteligente que juega automáticamente usando A*.
+    Con una BaseConocimiento el conocimiento se guarda en máscaras de bits en lugar del diccionario.
+    """
 
-    def __init__(self, juego):
+    def __init__(self, juego, conocimiento=None):
         self.juego = juego
         self.gui = juego.gui  # Referencia a la GUI
         self.conocido = {}  # Mapa de celdas conocidas: (fila, col) -> {'visited': bool, 'safe': bool, 'wumpus_possible': bool, 'hoyo_possible': bool}
+        self.conocimiento = conocimiento  # BaseConocimiento (si no es None, sustituye a self.conocido)
         self.queue = deque()  # Cola para BFS
         self.direccion = self.juego.agente_direccion
         self.running = True  # Control para detener el agente al reiniciar
@@ -320,7 +465,7 @@ class AgenteInteligente:
             siguientes = self.obtener_celdas_seguras()
 
             for s in siguientes:
-                if s not in self.conocido or not self.conocido[s].get('visited', False):
+                if not self.es_visitada(s):
                     self.queue.append(s)
                     self.celdas_visitadas.append(s)
 
@@ -355,8 +500,17 @@ class AgenteInteligente:
             percepciones.append('brisa')
         return percepciones
 
+    def es_visitada(self, celda):
+        if self.conocimiento is not None:
+            return self.conocimiento.es_visitada(*celda)
+        return celda in self.conocido and self.conocido[celda].get('visited', False)
+
     def actualizar_conocimiento(self, fila, col, percepciones):
         """Actualiza el conocimiento del agente basado en las percepciones."""
+        if self.conocimiento is not None:
+            self.conocimiento.actualizar(fila, col, 'hedor' in percepciones, 'brisa' in percepciones)
+            return
+
         # Marcar la celda como visitada y segura
         self.conocido[(fila, col)]['visited'] = True
         self.conocido[(fila, col)]['safe'] = True
@@ -401,6 +555,8 @@ class AgenteInteligente:
 
     def obtener_celdas_seguras(self):
         """Devuelve una lista de celdas que son seguras para explorar."""
+        if self.conocimiento is not None:
+            return self.conocimiento.celdas_frontera()
         seguras = []
         for (f, c), info in self.conocido.items():
             if info.get('safe', False) and not info.get('visited', False):
@@ -414,9 +570,10 @@ class AgenteInteligente:
 class GUIWumpus:
     """Clase que maneja la interfaz gráfica del juego Wumpus."""
 
-    def __init__(self, juego):
+    def __init__(self, juego, conocimiento_bits=False):
         self.juego = juego
         self.juego.gui = self  # Asignar referencia de la GUI al juego
+        self.conocimiento_bits = conocimiento_bits  # El agente automático usa BaseConocimiento
         self.root = tk.Tk()
         self.root.title("Juego Wumpus Mejorado")
         self.crear_tablero()
@@ -478,7 +635,8 @@ class GUIWumpus:
     def activar_modo_automatico(self):
         """Activa el modo de juego automático."""
         if not self.agente_inteligente:
-            self.agente_inteligente = AgenteInteligente(self.juego)
+            conocimiento = BaseConocimiento(self.juego.filas, self.juego.columnas) if self.conocimiento_bits else None
+            self.agente_inteligente = AgenteInteligente(self.juego, conocimiento)
             self.agente_inteligente.ejecutar()
         self.juego.modo_manual = False
         self.juego.modo_automatico = True
@@ -593,8 +751,12 @@ class GUIWumpus:
         self.root.mainloop()
 
 def main():
+    parser = argparse.ArgumentParser(description="Juego Wumpus con agente inteligente")
+    parser.add_argument('--conocimiento-bits', action='store_true',
+                        help='El agente automático guarda su conocimiento en máscaras de bits (BaseConocimiento)')
+    args = parser.parse_args()
     juego = JuegoWumpus(filas=6, columnas=6, num_hoyos=3, aleatorio=True)
-    gui = GUIWumpus(juego)
+    gui = GUIWumpus(juego, args.conocimiento_bits)
     juego.gui = gui  # Asignar la GUI al juego
     gui.iniciar()
 